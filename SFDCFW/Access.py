@@ -3,9 +3,7 @@ SFDCFW.Access
 ~~~~~~~~~~~~~
 """
 
-import requests
 # import xml.etree.ElementTree as ET
-from zeep import Client, Settings, exceptions
 
 # try:
 #     # Python 3+
@@ -15,6 +13,9 @@ from zeep import Client, Settings, exceptions
 #     from cgi import escape
 
 from SFDCFW.Constant import SFDC_API_V
+from SFDCFW.Instrument import SoapPlugin, instrument_call
+from SFDCFW.TokenStore import TOKEN_TTL, token_key
+from SFDCFW.Transport import Transport
 
 
 class Access:
@@ -29,7 +30,11 @@ class Access:
                  version=SFDC_API_V,
                  domain='login',
                  wsdl=None,
-                 metadata=False):
+                 metadata=False,
+                 transport=None,
+                 cache_dir=None,
+                 token_store=None,
+                 token_ttl=TOKEN_TTL):
         """Constructor
 
         Args:
@@ -42,6 +47,12 @@ class Access:
             domain (str): The common Salesforce domain for connection (login or test)
             wsdl (str): The path to the WSDL (Web Services Description Language) file
             metadata (bool): Whether or not this is for metadata
+            transport (Transport): The pooled HTTP transport used for login
+            cache_dir (str): The directory of the on-disk parsed WSDL cache
+            token_store (TokenStore): The store checked for a valid token
+                before login and updated after
+            token_ttl (int): The number of second a REST token is valid, a
+                SOAP session use its own `sessionSecondsValid`
         """
 
         self.username = username
@@ -54,6 +65,12 @@ class Access:
         self.rest_url = f'https://{domain}.salesforce.com/services/oauth2/token'
         self.wsdl = wsdl
         self.metadata = metadata
+        self.version = version
+        self.cache_dir = cache_dir
+        self.transport = transport if transport is not None else Transport()
+        self.token_store = token_store
+        self.token_ttl = token_ttl
+        self.token_key = token_key(username, domain, client_id, metadata)
 
 
     def login(self):
@@ -64,6 +81,56 @@ class Access:
             (metadata) server URL / instance URL based on credential
         """
 
+        # Reuse the token of a previous login if it is not expired
+        if self.token_store is not None:
+            access = self.token_store.get(self.token_key)
+            if access is not None:
+                self.access_token = access[0]
+                return access
+
+        # Login and keep the token for the next login
+        access = self._login()
+        if access is not None and self.token_store is not None:
+            self.token_store.set(self.token_key, access, ttl=self.token_ttl)
+
+        if access is not None:
+            self.access_token = access[0]
+
+        return access
+
+
+    def refresh(self):
+        """Refresh
+
+        Login again after the session expired, unless another process
+        already stored a new token.
+
+        Returns:
+            A tuple containing the session ID / access token and
+            (metadata) server URL / instance URL, None if the login failed
+        """
+
+        if self.token_store is not None:
+            # Use the token another process stored since the last login
+            access = self.token_store.get(self.token_key)
+            if access is not None and access[0] != self.access_token:
+                self.access_token = access[0]
+                return access
+
+            # Discard the expired token
+            self.token_store.delete(self.token_key)
+
+        return self.login()
+
+
+    def _login(self):
+        """Login with the credential provided
+
+        Returns:
+            A tuple containing the session ID / access token and
+            (metadata) server URL / instance URL based on credential
+        """
+
         # Check if username, password, security token, client ID, client secret is provided
         if all(credential is not None for credential in [self.username,
                                                          self.password,
@@ -131,7 +198,7 @@ class Access:
         }
 
         # Make the request and get the response
-        r = requests.post(url, headers=header, data=payload)
+        r = self.transport.post(url, headers=header, data=payload)
 
         if r.status_code == 200:
             # Parse the access token and instance URL
@@ -164,13 +231,36 @@ class Access:
             A tuple containing the session ID and (metadata) server URL
         """
 
-        # Create client with setting of disable strict mode, use recovery mode
-        setting = Settings(strict=False)
-        client = Client(wsdl, settings=setting)
+        # Import zeep on first SOAP login, REST only use never pay for it
+        from zeep import exceptions
+
+        from SFDCFW.Soap import Wsdl
+
+        # Measure the login envelope if the transport is instrumented
+        instrument = getattr(self.transport, 'instrument', None)
+        plugin = SoapPlugin() if instrument is not None else None
+
+        # Create client from the cached WSDL, parsed once per process
+        # Send through the pooled session of the transport
+        client = Wsdl.client(wsdl,
+                             version=self.version,
+                             cache_dir=self.cache_dir,
+                             transport=Wsdl.transport(self.transport.session),
+                             plugins=[plugin] if plugin else None)
 
         try:
             # Attempt to make the request for the response
-            r = client.service.login(username, password + security_token)
+            if instrument is None:
+                r = client.service.login(username, password + security_token)
+            else:
+                r = instrument_call(instrument,
+                                    plugin,
+                                    'login',
+                                    'login',
+                                    client.service.login,
+                                    None,
+                                    username=username,
+                                    password=password + security_token)
         except exceptions.Fault:
             # Return None for now if exception
             return None
@@ -180,6 +270,11 @@ class Access:
             # Get the sessionId
             session_id = r['sessionId']
 
+            # Keep the session lifetime for the token store
+            user_info = getattr(r, 'userInfo', None)
+            if getattr(user_info, 'sessionSecondsValid', None):
+                self.token_ttl = int(user_info.sessionSecondsValid)
+
             if metadata:
                 # Get the `metadataServerUrl` if requested
                 metadata_server_url = r['metadataServerUrl']
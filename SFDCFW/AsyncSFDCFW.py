@@ -0,0 +1,69 @@
+"""
+SFDCFW.AsyncSFDCFW
+~~~~~~~~~~~~~~~~~~
+"""
+
+from SFDCFW.Access import Access
+from SFDCFW.Rest.AsyncQuery import AsyncQuery
+from SFDCFW.Rest.AsyncSObject import AsyncSObject
+
+from SFDCFW.Constant import SFDC_API_V
+
+
+class AsyncSFDCFW(AsyncSObject, AsyncQuery):
+    """Asynchronous Salesforce.com FrameWork."""
+
+    def __init__(self,
+                 username=None,
+                 password=None,
+                 security_token=None,
+                 client_id=None,
+                 client_secret=None,
+                 version=SFDC_API_V,
+                 domain='login',
+                 wsdl=None,
+                 metadata=False,
+                 client=None,
+                 concurrency=100,
+                 timeout=None,
+                 token_store=None):
+        """Constructor
+
+        The login is made once (blocking) on construction, every
+        request afterward is a coroutine.
+
+        Args:
+            username (str): The Salesforce user Username
+            password (str): The Salesforce user Password
+            security_token (str): The Salesforce user Security Token
+            client_id (str): The Salesforce Connected App Consumer Key
+            client_secret (str): The Salesforce Connected App Consumer Secret
+            version (str): The Salesforce version of the Application Programming Interface
+            domain (str): The common Salesforce domain for connection (login or test)
+            wsdl (str): The path to the WSDL (Web Services Description Language) file
+            metadata (bool): Whether or not this is for metadata
+            client (httpx.AsyncClient): The asynchronous HTTP client to use,
+                closed by the caller
+            concurrency (int): The maximum number of request in flight
+            timeout (float): The request timeout in seconds
+            token_store (TokenStore): The store checked for a valid token
+                before login, to skip repeated login
+        """
+
+        # Create an instance of Access object and login
+        access = Access(username=username,
+                        password=password,
+                        security_token=security_token,
+                        client_id=client_id,
+                        client_secret=client_secret,
+                        version=version,
+                        domain=domain,
+                        wsdl=wsdl,
+                        metadata=metadata,
+                        token_store=token_store).login()
+
+        # Set up the REST base URL, header and asynchronous client
+        super().__init__(access,
+                         client=client,
+                         concurrency=concurrency,
+                         timeout=timeout)
@@ -0,0 +1,357 @@
+"""
+SFDCFW.Cassette
+~~~~~~~~~~~~~~~
+"""
+
+import base64
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from SFDCFW.Exception import CassetteError
+
+
+# The pattern and replacement removing the credential, session and
+# instance host from the URL and body of a cassette
+SCRUB = (
+    # The token of the OAuth response
+    (r'("(?:access_token|refresh_token|id_token|signature)"\s*:\s*")[^"]*', r'\1***'),
+    # The credential and session of the SOAP login and header
+    (r'(<(?:\w+:)?(?:username|userName|password|sessionId)>)[^<]*', r'\1***'),
+    # The credential of the OAuth form
+    (r'((?:^|&)(?:username|password|client_id|client_secret|refresh_token)=)[^&]*', r'\1***'),
+    # The instance host of the organization
+    (r'https://[\w.-]+\.(?:salesforce|force|visualforce)\.com', 'https://example.my.salesforce.com'),
+)
+
+# The header holding a credential, its value is never recorded
+SCRUB_HEADER = ('Authorization', 'Cookie', 'Set-Cookie')
+
+# The header describing the raw body, the body is recorded decoded
+SKIP_HEADER = ('Content-Encoding', 'Content-Length', 'Transfer-Encoding', 'Connection', 'Keep-Alive')
+
+
+class Cassette:
+    """Cassette class.
+
+    The recorded HTTP interaction of a session with an organization. In
+    `record` mode every request is sent and its response recorded, with
+    the credential scrubbed, then saved to a JSON file. In `replay` mode
+    the response are answered from the file without any network, after
+    the recorded time multiplied by `scale`.
+
+    A request is answered by the first unused interaction with the same
+    method, path, query and body, or failing that the same method, path
+    and query, so a request repeated with a different body is answered
+    in the recorded order.
+    """
+
+    def __init__(self, path, mode='replay', scale=None, scrub=()):
+        """Constructor
+
+        Args:
+            path (str): The path of the cassette JSON file
+            mode (str): `record`, `replay`, or `auto` to replay if the
+                file exists and record otherwise
+            scale (float): The factor applied to the recorded time of
+                each response on replay, 1 for the original timing, None
+                to answer at once
+            scrub (iterable): The extra (pattern, replacement) tuple to
+                scrub from the URL, header and body
+        """
+
+        if mode == 'auto':
+            mode = 'replay' if os.path.exists(path) else 'record'
+
+        if mode not in ('record', 'replay'):
+            raise ValueError(f'Unknown cassette mode: {mode}')
+
+        self.path = path
+        self.mode = mode
+        self.scale = scale
+        self.scrub_list = [(re.compile(pattern), replacement) for pattern, replacement in tuple(SCRUB) + tuple(scrub)]
+        self.interaction_list = []
+        self.used = set()
+        self.lock = threading.Lock()
+
+        if mode == 'replay':
+            self.load()
+
+
+    def adapter(self, adapter):
+        """Create The Adapter Of The Mode
+
+        Args:
+            adapter (requests.adapters.HTTPAdapter): The adapter sending
+                the request when recording
+
+        Returns:
+            A `RecordAdapter` or a `ReplayAdapter`
+        """
+
+        if self.mode == 'record':
+            return RecordAdapter(self, adapter)
+
+        return ReplayAdapter(self)
+
+
+    def record(self, request, response, body, elapsed):
+        """Record An Interaction
+
+        Args:
+            request (requests.PreparedRequest): The request sent
+            response (requests.Response): The response received
+            body (bytes): The decoded response body
+            elapsed (float): The time in second until the body was read
+        """
+
+        interaction = {
+            'request': {
+                'method': request.method,
+                'url': self.scrub(request.url),
+                'headers': self._header(request.headers),
+                'body': self._body(_request_body(request))
+            },
+            'response': {
+                'status': response.status_code,
+                'reason': response.reason,
+                'headers': self._header(response.headers),
+                'body': self._body(body)
+            },
+            'elapsed': elapsed
+        }
+
+        with self.lock:
+            self.interaction_list.append(interaction)
+
+
+    def find(self, request):
+        """Find The Interaction Answering A Request
+
+        Args:
+            request (requests.PreparedRequest): The request to answer
+
+        Returns:
+            A dictionary for the recorded interaction
+
+        Raises:
+            CassetteError: If no unused interaction match the request
+        """
+
+        key = _key(self.scrub(request.url))
+        body = self._body(_request_body(request))
+
+        with self.lock:
+            candidate_list = [i for i, interaction in enumerate(self.interaction_list)
+                              if i not in self.used
+                              and interaction['request']['method'] == request.method
+                              and _key(interaction['request']['url']) == key]
+
+            if not candidate_list:
+                raise CassetteError(request.method, request.url)
+
+            # Prefer the interaction with the same body
+            index = next((i for i in candidate_list if self.interaction_list[i]['request']['body'] == body),
+                         candidate_list[0])
+            self.used.add(index)
+
+            return self.interaction_list[index]
+
+
+    def scrub(self, text):
+        """Scrub The Credential From A Text
+
+        Args:
+            text (str): The URL, header value or body
+
+        Returns:
+            The text with every scrub pattern replaced
+        """
+
+        for pattern, replacement in self.scrub_list:
+            text = pattern.sub(replacement, text)
+
+        return text
+
+
+    def load(self):
+        """Load the interaction from the file"""
+
+        with open(self.path, 'r') as f:
+            self.interaction_list = json.load(f)['interactions']
+
+        self.used = set()
+
+
+    def save(self):
+        """Save the interaction to the file"""
+
+        with self.lock:
+            data = {'version': 1, 'interactions': list(self.interaction_list)}
+
+        # Write to a temporary file then rename, reader never see a partial file
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=1)
+        os.replace(temp_path, self.path)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        # Keep what was recorded, even if the session failed
+        if self.mode == 'record':
+            self.save()
+
+
+    def _header(self, headers):
+        return {name: '***' if name in SCRUB_HEADER else self.scrub(str(value))
+                for name, value in headers.items()
+                if name not in SKIP_HEADER}
+
+
+    def _body(self, body):
+        if body is None or body == b'':
+            return None
+
+        if isinstance(body, str):
+            return {'text': self.scrub(body)}
+
+        try:
+            return {'text': self.scrub(body.decode('utf-8'))}
+        except UnicodeDecodeError:
+            # Keep a binary body as it is
+            return {'base64': base64.b64encode(body).decode('ascii')}
+
+
+class RecordAdapter(BaseAdapter):
+    """Adapter sending each request and recording it to a cassette."""
+
+    def __init__(self, cassette, adapter):
+        """Constructor
+
+        Args:
+            cassette (Cassette): The cassette to record to
+            adapter (requests.adapters.HTTPAdapter): The adapter sending
+                the request
+        """
+
+        super().__init__()
+        self.cassette = cassette
+        self.adapter = adapter
+
+
+    def send(self, request, stream=False, **kwargs):
+        start = time.perf_counter()
+        r = self.adapter.send(request, stream=stream, **kwargs)
+
+        # Read the whole body to record it, and release the connection
+        body = r.content
+        elapsed = time.perf_counter() - start
+        r.close()
+
+        self.cassette.record(request, r, body, elapsed)
+
+        # Give the caller the decoded body as a fresh stream
+        for name in SKIP_HEADER:
+            r.headers.pop(name, None)
+        r.raw = io.BytesIO(body)
+        r._content = False
+        r._content_consumed = False
+
+        return r
+
+
+    def close(self):
+        self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Adapter answering each request from a cassette."""
+
+    def __init__(self, cassette):
+        """Constructor
+
+        Args:
+            cassette (Cassette): The cassette to replay
+        """
+
+        super().__init__()
+        self.cassette = cassette
+
+
+    def send(self, request, stream=False, **kwargs):
+        interaction = self.cassette.find(request)
+        recorded = interaction['response']
+
+        # Take as long as the organization did
+        if self.cassette.scale:
+            time.sleep(interaction['elapsed'] * self.cassette.scale)
+
+        r = requests.Response()
+        r.status_code = recorded['status']
+        r.reason = recorded['reason']
+        r.headers = CaseInsensitiveDict(recorded['headers'])
+        r.encoding = get_encoding_from_headers(r.headers)
+        r.raw = io.BytesIO(_decode(recorded['body']))
+        r.url = request.url
+        r.request = request
+        r.connection = self
+        r.elapsed = timedelta(seconds=interaction['elapsed'])
+
+        return r
+
+
+    def close(self):
+        pass
+
+
+def _request_body(request):
+    """Get the body of a prepared request"""
+
+    body = request.body
+
+    # A file body was read while sending, read it again from the start
+    if hasattr(body, 'seek') and hasattr(body, 'read'):
+        position = body.tell()
+        body.seek(0)
+        data = body.read()
+        body.seek(position)
+        return data
+
+    return body
+
+
+def _key(url):
+    """Get the path and query of a URL, the host differ between organization"""
+
+    u = urlparse(url)
+
+    return f'{u.path}?{u.query}'
+
+
+def _decode(body):
+    """Decode a recorded body"""
+
+    if body is None:
+        return b''
+
+    if 'base64' in body:
+        return base64.b64decode(body['base64'])
+
+    return body['text'].encode('utf-8')
@@ -4,4 +4,10 @@ Salesforce Constant
 
 SFDC_API_V = '54.0'
 
-TEST_DATA = 'TestData.json'
\ No newline at end of file
+HTTP_GET = 'GET'
+HTTP_POST = 'POST'
+HTTP_PUT = 'PUT'
+HTTP_PATCH = 'PATCH'
+HTTP_DELETE = 'DELETE'
+
+TEST_DATA = 'TestData.json'
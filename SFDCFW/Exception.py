@@ -0,0 +1,29 @@
+"""
+SFDCFW.Exception
+~~~~~~~~~~~~~~~~
+"""
+
+
+class BulkError(Exception):
+    """Bulk job error.
+
+    The first argument is the dictionary for the job status (or the
+    error response) reported by Salesforce.
+    """
+
+
+class MetadataError(Exception):
+    """Metadata API chunk error.
+
+    The first argument is the list of dictionary for every chunk
+    (`index`, `item`, `result`, `error`) of the call, in input order, so
+    the result of the chunk that succeeded is not lost.
+    """
+
+
+class CassetteError(Exception):
+    """Cassette error.
+
+    The request has no recorded interaction to replay. The arguments
+    are the method and URL of the request.
+    """
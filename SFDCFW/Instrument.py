@@ -0,0 +1,408 @@
+"""
+SFDCFW.Instrument
+~~~~~~~~~~~~~~~~~
+"""
+
+import bisect
+import logging
+import re
+import threading
+import time
+from urllib.parse import urlparse
+
+
+# The upper bound in second of each latency histogram bucket
+LATENCY_BUCKET = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# The versioned REST API path, for example `/services/data/v54.0/sobjects/Account`
+API_PATH_PATTERN = re.compile(r'/services/data/v[\d.]+(/.*)?$')
+
+
+class Instrument:
+    """Instrument class.
+
+    Emit an event for each outbound call to every sink. A sink is any
+    callable taking the event dictionary, such as a function, a
+    `LoggingSink` or a `Registry`. The event has the `operation`,
+    `label`, `method`, `status`, `bytes_sent`, `bytes_received`,
+    `retry_count`, `latency` (second) and `error` of the call.
+    """
+
+    def __init__(self, *sink):
+        """Constructor
+
+        Args:
+            *sink (callable): The sink to send each event to
+        """
+
+        self.sink_list = list(sink)
+
+
+    def add_sink(self, sink):
+        """Add Sink
+
+        Args:
+            sink (callable): The sink to send each event to
+        """
+
+        self.sink_list.append(sink)
+
+
+    def emit(self,
+             operation,
+             label=None,
+             method=None,
+             status=None,
+             bytes_sent=None,
+             bytes_received=None,
+             retry_count=0,
+             latency=None,
+             error=None,
+             **extra):
+        """Emit Event
+
+        Args:
+            operation (str): The operation, for example login, query,
+                sobject, describe, bulk_ingest, bulk_poll or metadata
+            label (str): The SObject label or the SOAP operation name
+            method (str): The HTTP method
+            status (int): The HTTP status code, None if there was no response
+            bytes_sent (int): The size of the request body
+            bytes_received (int): The size of the response body
+            retry_count (int): The number of retry
+            latency (float): The time spent in the call in second
+            error (str): The exception class name if the call raised
+            **extra: Any other measure, such as the SOAP `serialize` and
+                `parse` time in second
+        """
+
+        event = {
+            'operation': operation,
+            'label': label,
+            'method': method,
+            'status': status,
+            'bytes_sent': bytes_sent,
+            'bytes_received': bytes_received,
+            'retry_count': retry_count,
+            'latency': latency,
+            'error': error
+        }
+        event.update(extra)
+
+        for sink in self.sink_list:
+            # A failing sink must not fail the call
+            try:
+                sink(event)
+            except Exception:
+                logging.getLogger(__name__).exception('Instrument sink failed')
+
+
+class LoggingSink:
+    """Sink writing each event to a logger."""
+
+    def __init__(self, logger=None, level=logging.DEBUG):
+        """Constructor
+
+        Args:
+            logger (logging.Logger): The logger, the module logger if not provided
+            level (int): The logging level of the event
+        """
+
+        self.logger = logger if logger is not None else logging.getLogger(__name__)
+        self.level = level
+
+
+    def __call__(self, event):
+        self.logger.log(self.level,
+                        '%s %s %s %s %.3fs sent=%s received=%s retry=%s',
+                        event['operation'],
+                        event['label'] or '-',
+                        event['method'] or '-',
+                        event['status'] if event['error'] is None else event['error'],
+                        event['latency'] or 0,
+                        event['bytes_sent'],
+                        event['bytes_received'],
+                        event['retry_count'])
+
+
+class Registry:
+    """Registry class.
+
+    Sink keeping in-process counter and latency histogram, keyed by
+    operation, label, method and status, to be scraped with `snapshot`
+    or `render`.
+    """
+
+    def __init__(self, bucket=LATENCY_BUCKET):
+        """Constructor
+
+        Args:
+            bucket (tuple): The upper bound in second of each latency
+                histogram bucket, in ascending order
+        """
+
+        self.bucket = tuple(bucket)
+        self.metric = {}
+        self.lock = threading.Lock()
+
+
+    def __call__(self, event):
+        key = (event['operation'],
+               event['label'],
+               event['method'],
+               event['status'] if event['error'] is None else event['error'])
+
+        with self.lock:
+            metric = self.metric.get(key)
+            if metric is None:
+                metric = self.metric[key] = {
+                    'count': 0,
+                    'latency_sum': 0.0,
+                    'latency_bucket': [0] * (len(self.bucket) + 1),
+                    'bytes_sent': 0,
+                    'bytes_received': 0,
+                    'retry_count': 0
+                }
+
+            metric['count'] += 1
+            metric['retry_count'] += event['retry_count'] or 0
+            metric['bytes_sent'] += event['bytes_sent'] or 0
+            metric['bytes_received'] += event['bytes_received'] or 0
+
+            if event['latency'] is not None:
+                metric['latency_sum'] += event['latency']
+                metric['latency_bucket'][bisect.bisect_left(self.bucket, event['latency'])] += 1
+
+
+    def snapshot(self):
+        """Snapshot
+
+        Returns:
+            A list of dictionary with the key and a copy of the metric
+            of each operation, label, method and status
+        """
+
+        with self.lock:
+            return [dict(operation=operation,
+                         label=label,
+                         method=method,
+                         status=status,
+                         **dict(metric, latency_bucket=list(metric['latency_bucket'])))
+                    for (operation, label, method, status), metric in self.metric.items()]
+
+
+    def percentile(self, operation, q):
+        """Estimate a Latency Percentile
+
+        Args:
+            operation (str): The operation
+            q (float): The percentile between 0 and 1
+
+        Returns:
+            The upper bound in second of the bucket holding the
+            percentile, None if there is no call
+        """
+
+        with self.lock:
+            bucket = [0] * (len(self.bucket) + 1)
+            for key, metric in self.metric.items():
+                if key[0] == operation:
+                    bucket = [a + b for a, b in zip(bucket, metric['latency_bucket'])]
+
+        total = sum(bucket)
+        if total == 0:
+            return None
+
+        # Find the first bucket reaching the percentile
+        count = 0
+        for i, bucket_count in enumerate(bucket):
+            count += bucket_count
+            if count >= q * total:
+                return self.bucket[i] if i < len(self.bucket) else float('inf')
+
+
+    def render(self):
+        """Render in the Prometheus text exposition format
+
+        Returns:
+            A string with the counter and histogram of every call
+        """
+
+        line_list = [
+            '# TYPE sfdcfw_call_latency_seconds histogram',
+            '# TYPE sfdcfw_call_bytes_sent_total counter',
+            '# TYPE sfdcfw_call_bytes_received_total counter',
+            '# TYPE sfdcfw_call_retry_total counter'
+        ]
+
+        for metric in self.snapshot():
+            label = ','.join(f'{name}="{metric[name] if metric[name] is not None else ""}"'
+                             for name in ('operation', 'label', 'method', 'status'))
+
+            # The histogram bucket are cumulative
+            count = 0
+            for bound, bucket_count in zip(self.bucket + (float('inf'),), metric['latency_bucket']):
+                count += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                line_list.append(f'sfdcfw_call_latency_seconds_bucket{{{label},le="{le}"}} {count}')
+
+            line_list.append(f'sfdcfw_call_latency_seconds_sum{{{label}}} {metric["latency_sum"]}')
+            line_list.append(f'sfdcfw_call_latency_seconds_count{{{label}}} {metric["count"]}')
+            line_list.append(f'sfdcfw_call_bytes_sent_total{{{label}}} {metric["bytes_sent"]}')
+            line_list.append(f'sfdcfw_call_bytes_received_total{{{label}}} {metric["bytes_received"]}')
+            line_list.append(f'sfdcfw_call_retry_total{{{label}}} {metric["retry_count"]}')
+
+        return '\n'.join(line_list) + '\n'
+
+
+class SoapPlugin:
+    """zeep plugin measuring the SOAP envelope size and serialization time.
+
+    The time from the call to `egress` is the serialization, the time
+    from `ingress` to the end of the call is the parsing.
+    """
+
+    def __init__(self):
+        """Constructor"""
+
+        self.local = threading.local()
+
+
+    def start(self):
+        """Start measuring a call on this thread"""
+
+        self.local.start = time.perf_counter()
+        self.local.egress = None
+        self.local.ingress = None
+        self.local.sent = None
+        self.local.received = None
+
+
+    def egress(self, envelope, http_headers, operation, binding_options):
+        from lxml import etree
+
+        self.local.egress = time.perf_counter()
+        self.local.sent = len(etree.tostring(envelope))
+
+        return envelope, http_headers
+
+
+    def ingress(self, envelope, http_headers, operation):
+        from lxml import etree
+
+        self.local.ingress = time.perf_counter()
+        self.local.received = len(etree.tostring(envelope))
+
+        return envelope, http_headers
+
+
+    def measure(self):
+        """Get the Measure of the last call on this thread
+
+        Returns:
+            A dictionary with the `bytes_sent`, `bytes_received`,
+            `serialize` and `parse` time in second
+        """
+
+        local = self.local
+        end = time.perf_counter()
+
+        return {
+            'bytes_sent': local.sent,
+            'bytes_received': local.received,
+            'serialize': local.egress - local.start if local.egress is not None else None,
+            'parse': end - local.ingress if local.ingress is not None else None
+        }
+
+
+def operation(method, url):
+    """Get the Operation of a REST Call
+
+    Args:
+        method (str): The HTTP method
+        url (str): The request URL
+
+    Returns:
+        A tuple of the operation and the SObject label (or None)
+    """
+
+    path = urlparse(url).path
+
+    if path.endswith('/oauth2/token'):
+        return ('login', None)
+
+    match = API_PATH_PATTERN.search(path)
+    if match is None:
+        return ('rest', None)
+
+    segment = (match.group(1) or '/').strip('/').split('/')
+
+    if segment[0] == 'sobjects':
+        label = segment[1] if len(segment) > 1 else None
+        if segment[-1] == 'describe':
+            return ('describe', label)
+        return ('sobject', label)
+
+    if segment[:2] == ['composite', 'sobjects']:
+        return ('composite', segment[2] if len(segment) > 2 else None)
+
+    if segment[0] in ('query', 'queryAll'):
+        return ('query', None)
+
+    if segment[0] == 'jobs' and len(segment) > 1:
+        # Checking the state of a job
+        if method == 'GET' and len(segment) == 3:
+            return ('bulk_poll', None)
+        return (f'bulk_{segment[1]}', None)
+
+    return (segment[0] or 'rest', None)
+
+
+def instrument_call(instrument, plugin, operation, label, function, retry, **kwargs):
+    """Call a SOAP Operation With Retry and Report it
+
+    Args:
+        instrument (Instrument): The instrument receiving the event
+        plugin (SoapPlugin): The plugin of the zeep client
+        operation (str): The operation, for example login or metadata
+        label (str): The SOAP operation name
+        function (callable): The zeep service operation
+        retry (Retry): The retry policy, no retry if None
+        **kwargs: The keyword argument of the operation
+
+    Returns:
+        The result of the operation
+    """
+
+    attempt_list = []
+
+    def _attempt():
+        # Measure each attempt from the start
+        plugin.start()
+        attempt_list.append(function)
+        return function(**kwargs)
+
+    start = time.perf_counter()
+
+    try:
+        result = retry.call(_attempt) if retry is not None else _attempt()
+    except Exception as e:
+        instrument.emit(operation,
+                        label=label,
+                        method='POST',
+                        status=getattr(e, 'status_code', None),
+                        retry_count=len(attempt_list) - 1,
+                        latency=time.perf_counter() - start,
+                        error=type(e).__name__,
+                        **plugin.measure())
+        raise
+
+    instrument.emit(operation,
+                    label=label,
+                    method='POST',
+                    status=200,
+                    retry_count=len(attempt_list) - 1,
+                    latency=time.perf_counter() - start,
+                    **plugin.measure())
+
+    return result
@@ -0,0 +1,106 @@
+"""
+SFDCFW.Rest.AsyncRest
+~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import asyncio
+from urllib.parse import urlparse
+
+import httpx
+
+
+class AsyncRest(object):
+    """Asynchronous REST (REpresentational State Transfer) class."""
+
+    def __init__(self, access, client=None, concurrency=100, timeout=None):
+        """Constructor
+
+        Args:
+            access (tuple): The Salesforce session ID / access token and
+                server URL / instance URL tuple
+            client (httpx.AsyncClient): The asynchronous HTTP client to use,
+                one is created if not provided, the caller close the one
+                it provide
+            concurrency (int): The maximum number of request in flight
+            timeout (float): The request timeout in seconds
+        """
+
+        # Create the client with a connection pool sized to the concurrency,
+        # the client is closed with this instance only if it was created here
+        self.own_client = client is None
+        if client is None:
+            limits = httpx.Limits(max_connections=concurrency,
+                                  max_keepalive_connections=concurrency)
+            client = httpx.AsyncClient(limits=limits, timeout=timeout)
+        self.client = client
+
+        # Limit the number of request in flight
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+        # Unpack the tuple for session ID / access token and server URL / instance URL
+        id_token, base_url = access
+
+        # Parse the URL
+        u = urlparse(base_url)
+        self.base_url = f'{u.scheme}://{u.netloc}'
+
+        # Create REST header
+        self.header = {
+            'Authorization': f'Bearer {id_token}',
+            'Content-Type': 'application/json; charset=utf-8',
+            'Accept': 'application/json'
+        }
+
+    def __getattr__(self, label):
+        """Get Attribute Passed In.
+
+        Unlike the synchronous class, a new handle is returned for each
+        label, so coroutine created for different SObject can be in
+        flight at the same time.
+
+        Args:
+            label (str): The attribute passed in.
+
+        Returns:
+            A instance of the class sharing the client and semaphore.
+        """
+
+        # Do not treat special attribute as SObject
+        if label.startswith('__'):
+            raise AttributeError(label)
+
+        # Create the handle sharing the state of this instance
+        handle = object.__new__(type(self))
+        handle.__dict__.update(self.__dict__)
+        # Set the name / label
+        handle.label = label
+
+        # Return the handle
+        return handle
+
+    async def send(self, method, url, **kwargs):
+        """Send Request
+
+        Args:
+            method (str): The HTTP method
+            url (str): The request URL
+            **kwargs: Any keyword argument accepted by `httpx.AsyncClient.request`
+
+        Returns:
+            A `httpx.Response` object
+        """
+
+        # Limit the number of request in flight
+        async with self.semaphore:
+            return await self.client.request(method, url, headers=self.header, **kwargs)
+
+    async def close(self):
+        """Close the client and all pooled connection, if created here."""
+        if self.own_client:
+            await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
@@ -0,0 +1,120 @@
+"""
+SFDCFW.Rest.AsyncSObject
+~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import json
+
+from SFDCFW.Constant import SFDC_API_V
+from SFDCFW.Rest.AsyncRest import AsyncRest
+
+
+class AsyncSObject(AsyncRest):
+    """Asynchronous SObject class."""
+
+
+    async def create(self, payload):
+        """Create SObject.
+
+        Args:
+            payload (dict): The required data for the SObject.
+
+        Returns:
+            A string for the unique identifier (ID) of the SObject.
+        """
+
+        # Create the request URL
+        request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/sobjects/{self.label}'
+
+        # Send the request
+        r = await self.send('POST', request_url, content=payload)
+
+        # Check the status code
+        if r.status_code == 201:
+            # Parse the unique identifier (ID) of the SObject
+            sobject_id = json.loads(r.text)['id']
+            # Return the unique identifier (ID) of the SObject
+            return sobject_id
+
+        # There was an error
+        return None
+
+
+    async def read(self, id=None):
+        """Read SObject.
+
+        Args:
+            id (str): The unique identifier (ID) of the SObject.
+
+        Returns:
+            A string formatted JSON for the request.
+        """
+
+        if id is not None:
+            # Create the request URL with ID
+            request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/sobjects/{self.label}/{id}'
+        else:
+            # Create the request URL without ID
+            request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/sobjects/{self.label}'
+
+        # Send the request
+        r = await self.send('GET', request_url)
+
+        # Check the status code
+        if r.status_code == 200:
+            # Return the response text (message body)
+            return r.text
+
+        # There was an error
+        return None
+
+
+    async def update(self, id, payload):
+        """Update SObject.
+
+        Args:
+            id (str): The ID of the SObject.
+            payload (dict): The updated data for the SObject.
+
+        Returns:
+            A HTTP Status Code (or None) of the response.
+        """
+
+        # Create the request URL
+        request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/sobjects/{self.label}/{id}'
+
+        # Send the request
+        r = await self.send('PATCH', request_url, content=payload)
+
+        # Check the status code
+        if r.status_code == 204:
+            # Return the status code
+            return r.status_code
+
+        # There was an error
+        return None
+
+
+    async def delete(self, id):
+        """Delete SObject.
+
+        Args:
+            id (str): The ID of the SObject.
+
+        Returns:
+            A HTTP Status Code (or None) of the response.
+        """
+
+        # Create the request URL
+        request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/sobjects/{self.label}/{id}'
+
+        # Send the request
+        r = await self.send('DELETE', request_url)
+
+        # Check the status code
+        if r.status_code == 204:
+            # Return the status code
+            return r.status_code
+
+        # There was an error
+        return None
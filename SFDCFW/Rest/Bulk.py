@@ -1,10 +1,16 @@
+import csv
+import io
 import json
+import os
+import tempfile
+import threading
 import time
 import sys
 
 from SFDCFW.Rest.Rest import Rest
-
-import pandas as pd
+from SFDCFW.Rest.Scheduler import FINAL_STATE, Scheduler
+from SFDCFW.Retry import backoff
+from SFDCFW.Exception import BulkError
 
 from SFDCFW.Constant import SFDC_API_V
 from SFDCFW.Constant import HTTP_GET
@@ -12,6 +18,10 @@ from SFDCFW.Constant import HTTP_POST
 from SFDCFW.Constant import HTTP_PATCH
 from SFDCFW.Constant import HTTP_PUT
 
+# Maximum upload size in byte of a Bulk job, the API limit is 150 MB
+# after base64 encoding
+UPLOAD_LIMIT = 100 * 1024 * 1024
+
 class Bulk(Rest):
     """Bulk API.
     """
@@ -30,9 +40,6 @@ class Bulk(Rest):
         # Create the request relative URL
         relative_url = "/jobs/ingest"
 
-        # Update the header
-        self._header["Content-Type"] = "application/json"
-
         # Create payload
         payload = {
             "operation": operation,
@@ -41,7 +48,7 @@ class Bulk(Rest):
         }
 
         # Send the request
-        r = self.send(HTTP_POST, relative_url, json.dumps(payload))
+        r = self.send(HTTP_POST, relative_url, json.dumps(payload), headers={"Content-Type": "application/json"})
 
         return r.text
 
@@ -60,12 +67,8 @@ class Bulk(Rest):
         # Create the data request relative URL
         relative_url = "/jobs/ingest/" + id + "/batches"
 
-        # Update the header
-        self._header["Content-Type"] = "text/csv"
-        self._header["Accept"] = "application/json"
-
         # Send the data request
-        r = self.send(HTTP_PUT, relative_url, data)
+        r = self.send(HTTP_PUT, relative_url, data, headers={"Content-Type": "text/csv", "Accept": "application/json"})
 
         # Return the response status code
         return r.status_code
@@ -84,17 +87,13 @@ class Bulk(Rest):
         # Create the job request relative URL
         relative_url = "/jobs/ingest/" + id
 
-        # Update the header
-        self._header["Content-Type"] = "application/json"
-        self._header.pop("Accept", None)
-
         # Create payload
         job_payload = {
             "state": "UploadComplete"
         }
 
         # Send the job request
-        r = self.send(HTTP_PATCH, relative_url, json.dumps(job_payload))
+        r = self.send(HTTP_PATCH, relative_url, json.dumps(job_payload), headers={"Content-Type": "application/json", "Accept": None})
 
         return r.text
 
@@ -112,38 +111,119 @@ class Bulk(Rest):
         # Create the job request relative URL
         relative_url = "/jobs/ingest/" + id
 
-        # Update the header
-        self._header.pop("Content-Type", None)
-        self._header.pop("Accept", None)
+        # Send the job request
+        r = self.send(HTTP_GET, relative_url, None, headers={"Content-Type": None, "Accept": None})
+
+        return r.text
+
+
+    def abort_job(self, id):
+        """Abort the job
+
+        Args:
+            id (str): The ID of the Bulk job
+
+        Returns:
+            A string formatted JSON for the HTTP response object
+        """
+
+        # Create the job request relative URL
+        relative_url = "/jobs/ingest/" + id
+
+        # Create payload
+        job_payload = {
+            "state": "Aborted"
+        }
 
         # Send the job request
-        r = self.send(HTTP_GET, relative_url, None)
+        r = self.send(HTTP_PATCH, relative_url, json.dumps(job_payload), headers={"Content-Type": "application/json", "Accept": None})
 
         return r.text
 
 
-    def get_result(self, id):
+    def wait_job(self, id, poll=1, max_poll=30):
+        """Wait for the job to reach a final state
+
+        The status is checked with exponential backoff and jitter, from
+        `poll` up to `max_poll` second between check.
+
+        Args:
+            id (str): The ID of the Bulk job
+            poll (float): The first delay in second between status check
+            max_poll (float): The maximum delay in second between status check
+
+        Returns:
+            A string formatted JSON for the final status of the job
+        """
+
+        for delay in backoff(poll, max_poll):
+            # Check the state of the job
+            check_status_r = self.check_status(id)
+
+            # See if the job is done
+            if json.loads(check_status_r)["state"] in FINAL_STATE:
+                return check_status_r
+
+            # If job is not done, wait and check again
+            time.sleep(delay)
+
+
+    def get_result(self, id, result="successfulResults", path=None):
         """Get the job result
 
+        The result is streamed, memory use does not grow with the
+        size of the job.
+
         Args:
             id (str): The ID of the Bulk job
+            result (str): The result to get, `successfulResults`,
+                `failedResults` or `unprocessedrecords`
+            path (str): The path of the CSV file to write the result to,
+                the rows are returned as a generator if not provided
 
         Returns:
-            A string formatted JSON for the HTTP response object
+            The number of record written to `path`, or a generator of
+            dictionary for each row if no path is provided
         """
-        pass
+
+        # Check the result is known
+        if result not in ("successfulResults", "failedResults", "unprocessedrecords"):
+            raise ValueError("Unknown result: {}".format(result))
+
+        # Create the result request relative URL
+        relative_url = "/jobs/ingest/" + id + "/" + result + "/"
+
+        # Create the request for the single page
+        page_list = self._page(relative_url)
+
+        if path is None:
+            # Return the row as a generator
+            return _iter_csv(page_list)
+
+        # Write the row to the file
+        return _write_csv(page_list, path)
 
 
     def create(self, object_type, data):
         """Create
 
         Args:
-            data (str): The data to be created in CSV format (newline per entry)
+            object_type (str): The object type (API name) for the Bulk job
+            data (str or iterable): The data to be created in CSV format
+                (newline per entry) for a single Bulk job, or the path of
+                an existing CSV file (str or path-like) or an iterable of
+                dictionary to stream through `ingest`
 
         Returns:
-            A string formatted JSON for the HTTP response object
+            A string formatted JSON for the HTTP response object, or a
+            list of dictionary for the final status of each Bulk job
+            when the data is streamed
         """
 
+        # Stream a CSV file or an iterable of dictionary
+        if not isinstance(data, str) or os.path.isfile(data):
+            return self.ingest(object_type, "insert", data)
+
         # The specified operation for Bulk job
         operation = "insert"
 
@@ -154,85 +234,115 @@ class Bulk(Rest):
         bulk_job_id = json.loads(bulk_job)["id"]
         # Create the data request relative URL
         data_relative_url = "/jobs/ingest/" + bulk_job_id + "/batches"
-        # Addition to header
-        self._header["Content-Type"] = "text/csv"
-        self._header["Accept"] = "application/json"
         # Send the data request
-        _ = self.send(HTTP_PUT, data_relative_url, data)
+        _ = self.send(HTTP_PUT, data_relative_url, data, headers={"Content-Type": "text/csv", "Accept": "application/json"})
 
         # Create the job request relative URL
         job_relative_url = "/jobs/ingest/" + bulk_job_id
-        # Update the header
-        self._header["Content-Type"] = "application/json"
         # Create the job payload
         job_payload = {
             "state": "UploadComplete"
         }
         # Send the job request 
-        job_r = self.send(HTTP_PATCH, job_relative_url, json.dumps(job_payload))
+        job_r = self.send(HTTP_PATCH, job_relative_url, json.dumps(job_payload), headers={"Content-Type": "application/json"})
 
         return job_r.text
 
 
-    def update(self, object_type, data, batch_limit=1000):
+    def update(self, object_type, data, batch_limit=None, byte_limit=UPLOAD_LIMIT, concurrency=4, callback=None):
         """Update
 
         Args:
             object_type (str): The object type (API name) for the Bulk job
-            data (list): A list of dictionary with the data to update, each
-                dictionary should have the same "key"
+            data (iterable or str): An iterable of dictionary with the data
+                to update, each dictionary should have the same "key", or
+                the path of a CSV file (str or path-like)
                 [
                     { "email": "alice@company.com.invalid" },
                     { "email": "bob@company.com.invalid" }
                 ]
 
-            batch_limit (int): The record size (count) of the Bulk job
+            batch_limit (int): The maximum record size (count) of the Bulk job
+            byte_limit (int): The maximum upload size in byte of the Bulk job
+            concurrency (int): The maximum number of Bulk job uploading at once
+            callback (callable): The function called with the dictionary
+                for the final status of each Bulk job
 
         Returns:
-            A string formatted JSON for the HTTP response object
+            A list of dictionary for the final status of each Bulk job
         """
 
-        print("Object Type: {}".format(object_type))
-        print("Data: {}".format(data))
+        return self.ingest(object_type,
+                           "update",
+                           data,
+                           batch_limit=batch_limit,
+                           byte_limit=byte_limit,
+                           concurrency=concurrency,
+                           callback=callback)
 
-        # It is easier to extract data with pandas DataFrame
-        # Create the DataFrame from data
-        df = pd.DataFrame.from_dict(data)
 
-        # The specified operation for Bulk job
-        operation = "update"
+    def ingest(self, object_type, operation, data, batch_limit=None, byte_limit=UPLOAD_LIMIT, concurrency=4, callback=None, progress=None, poll=1):
+        """Ingest
+
+        Serialize the data row by row into CSV chunk no larger than the
+        upload limit, and stream each chunk to its own Bulk job. A chunk
+        is spooled to disk past a few megabyte, so memory use does not
+        grow with the size of the data.
+
+        Args:
+            object_type (str): The object type (API name) for the Bulk job
+            operation (str): The operation of the Bulk job (insert, update,
+                upsert, delete, hardDelete)
+            data (iterable or str): An iterable of dictionary with the same
+                "key", or the path of a CSV file (str or path-like)
+            batch_limit (int): The maximum record size (count) of the Bulk job
+            byte_limit (int): The maximum upload size in byte of the Bulk job
+            concurrency (int): The maximum number of Bulk job uploading at once
+            callback (callable): The function called with the dictionary
+                for the final status of each Bulk job
+            progress (callable): The function called with a dictionary of
+                the running count (`job`, `record`, `complete`,
+                `processed`, `failed`) each time a Bulk job is submitted
+                or reach a final state
+            poll (float): The first delay in second before checking a
+                Bulk job
+
+        Returns:
+            A list of dictionary for the final status of each Bulk job
+        """
 
-        # Get the size of the object data
-        object_data_size = len(data)
-        # Calculate the number of Bulk job needed
-        bulk_job_size = (object_data_size + (-object_data_size) % batch_limit) // batch_limit
+        # Running count reported to the progress function
+        count = {"job": 0, "record": 0, "complete": 0, "processed": 0, "failed": 0}
+        lock = threading.Lock()
 
-        # Create a list for the Bulk job ID
-        # This will be for each Bulk job
-        bulk_job_id_list = []
-        # Loop through and create the payload list for Bulk job
-        for i in range(0, bulk_job_size):
-            # Calculate the head (start) and tail (end) of each Bulk payload
-            payload_head = i * batch_limit
-            payload_tail = payload_head + batch_limit - 1
+        def _report(status=None):
+            with lock:
+                if status is not None:
+                    count["complete"] += 1
+                    count["processed"] += status.get("numberRecordsProcessed", 0)
+                    count["failed"] += status.get("numberRecordsFailed", 0)
+                report = dict(count)
+            if progress is not None:
+                progress(report)
 
-            # Create the Bulk job
-            bulk_job_r = self.create_job(operation, object_type)
+        def _callback(status):
+            if callback is not None:
+                callback(status)
+            _report(status)
 
-            # Parse the Bulk job ID
-            bulk_job_id = json.loads(bulk_job_r)["id"]
-            # Add the Bulk job ID to list
-            bulk_job_id_list.append(bulk_job_id)
+        # Upload the Bulk job concurrently and wait for all to complete
+        with Scheduler(self, concurrency=concurrency, poll=poll) as scheduler:
+            # Submit each chunk as a Bulk job
+            for chunk, record_count in _csv_chunk(data, byte_limit, batch_limit):
+                scheduler.submit(object_type, operation, chunk, callback=_callback)
 
-            # Add the data to the job and get the response
-            add_data_r = self.add_data(bulk_job_id, df[payload_head : payload_tail].to_csv(index=False))
+                with lock:
+                    count["job"] += 1
+                    count["record"] += record_count
+                _report()
 
-            if add_data_r == 201:
-                # Upload successful, close the job
-                _ = self.close_job(bulk_job_id)
-            else:
-                # Failure, something went wrong
-                print("Failure, Status Code: {}".format(add_data_r))
+            # Return the final status of each Bulk job
+            return scheduler.wait()
 
 
     def empty_batch(self, object_type, condition=None, batch_limit=1000):
@@ -242,77 +352,38 @@ class Bulk(Rest):
             object_type (str): The object type (API name) for the Bulk job
             condition (str): The WHERE clause
             batch_limit (int): The record size (count) of the Bulk job
+
+        Returns:
+            A list of dictionary for the final status of each Bulk job
         """
 
-        # Query all the data from the object
-        # Query
-        if condition:
-            query = "SELECT Id FROM " + object_type + " WHERE " + condition
-        else:
-            query = "SELECT Id FROM " + object_type
-        # Retrieve the object data
-        object_data = self.query(query)
-        # JSONify the object data
-        object_data = json.loads(object_data)
-
-        # Get the record count of the object data
-        object_data_size = object_data["totalSize"]
-        # Compare record count vs. batch limit, take the smaller of the two
-        object_data_count = object_data_size if object_data_size < batch_limit else batch_limit
-
-        # Create a list for the payload
-        # This will be for each Bulk job
-        payload_list = []
-        # Loop through and create the payload list batch
-        for i in range(0, object_data_size, batch_limit):
-            # Build a string with the object data for the delete request body
-            payload = "Id\n"
-            # Loop through and build the payload
-            for record in object_data["records"][i : i + object_data_count - 1]:
-                payload += record["Id"] + "\n"
-
-            # Add the payload batch to list
-            payload_list.append(payload)
+        return self.empty(object_type, condition=condition, batch_size=batch_limit)
 
-        # The specified operation for Bulk job
-        operation = "delete"
-
-        # Create a list for the Bulk job ID
-        bulk_job_id_list = []
-        # Loop through the payload batch and create the Bulk jobs
-        for payload in payload_list:
-            bulk_job_r = self.create_job(operation, object_type)
-
-            # Parse the Bulk job ID
-            bulk_job_id = json.loads(bulk_job_r)["id"]
-            # Add the Bulk job ID to list
-            bulk_job_id_list.append(bulk_job_id)
-
-        # Align the Bulk job ID to the payload
-        bulk_job_id_payload_list = zip(bulk_job_id_list, payload_list)
-
-        # Loop through and add data (payload) to job (bulk_job_id)
-        for bulk_job in bulk_job_id_payload_list:
-            # Unpack the tuple
-            bulk_job_id, payload = bulk_job
-            # Add the data to the job and get the response
-            add_data_r = self.add_data(bulk_job_id, payload)
-
-            if add_data_r == 201:
-                # Upload successful, close the job
-                _ = self.close_job(bulk_job_id)
-            else:
-                # Failure, something went wrong
-                print("Failure, Status Code: {}".format(add_data_r))
-
-
-    def empty(self, object_type, condition=None, batch_size=1000):
+
+    def empty(self, object_type, condition=None, batch_size=None, byte_limit=10 * 1024 * 1024, concurrency=4, progress=None, operation="delete"):
         """Empty
 
+        Stream the ID from a Bulk query job straight into delete job
+        sharded by byte size, the delete job upload and run while the
+        ID are still being downloaded. The full ID set is never held in
+        memory.
+
         Args:
             object_type (str): The object type (API name) for the Bulk job
             condition (str): The WHERE clause
-            batch_size (int): The record size of the Bulk job
+            batch_size (int): The maximum record size of the Bulk job
+            byte_limit (int): The maximum upload size in byte of the Bulk
+                job, kept well below the API limit so the first delete job
+                start early
+            concurrency (int): The maximum number of Bulk job uploading at once
+            progress (callable): The function called with a dictionary of
+                the running count (`job`, `record`, `complete`,
+                `processed`, `failed`)
+            operation (str): The operation of the Bulk job, `delete` or
+                `hardDelete`
+
+        Returns:
+            A list of dictionary for the final status of each Bulk job
         """
 
         # Query all the data from the object
@@ -321,47 +392,395 @@ class Bulk(Rest):
             query = "SELECT Id FROM " + object_type + " WHERE " + condition
         else:
             query = "SELECT Id FROM " + object_type
-        # Retrieve the object data
-        object_data = self.query(query)
-        # JSONify the object data
-        object_data = json.loads(object_data)
 
-        # Build a string with the object data for the delete request body
-        payload = "Id\n"
-        for record in object_data["records"]:
-            payload += record["Id"] + "\n"
+        # Stream the ID with a Bulk query job
+        id_list = ({"Id": row["Id"]} for row in self.query_job(query))
 
-        # The specified operation for Bulk job
-        operation = "delete"
+        # Delete the ID as they arrive
+        return self.ingest(object_type,
+                           operation,
+                           id_list,
+                           batch_limit=batch_size,
+                           byte_limit=byte_limit,
+                           concurrency=concurrency,
+                           progress=progress)
 
-        # Create the Bulk job and get the response
-        bulk_job_r = self.create_job(operation, object_type)
 
-        # Parse the Bulk job ID
-        bulk_job_id = json.loads(bulk_job_r)["id"]
-        # Add the data to the job and get the response
-        add_data_r = self.add_data(bulk_job_id, payload)
+    def create_query_job(self, query, operation="query"):
+        """Create a Bulk query job
 
-        if add_data_r == 201:
-            # Upload successful, close the job
-            _ = self.close_job(bulk_job_id)
-        else:
-            # Failure, something went wrong
-            print("Failure, Status Code: {}".format(add_data_r))
+        Args:
+            query (str): The SOQL (Salesforce Object Query Language) query
+            operation (str): The operation of the Bulk query job, `query`
+                or `queryAll` (include deleted and archived record)
 
-        # Check the state of the job
-        check_status_r = self.check_status(bulk_job_id)
+        Returns:
+            A string formatted JSON for the HTTP response object
+        """
 
-        # Get the current state
-        current_state = json.loads(check_status_r)["state"]
+        # Create the request relative URL
+        relative_url = "/jobs/query"
+
+        # Create payload
+        payload = {
+            "operation": operation,
+            "query": query,
+            "contentType": "CSV"
+        }
+
+        # Send the request
+        r = self.send(HTTP_POST, relative_url, json.dumps(payload), headers={"Content-Type": "application/json"})
+
+        return r.text
+
+
+    def check_query_status(self, id):
+        """Check the status of the query job
+
+        Args:
+            id (str): The ID of the Bulk query job
+
+        Returns:
+            A string formatted JSON for the HTTP response object
+        """
+
+        # Create the job request relative URL
+        relative_url = "/jobs/query/" + id
+
+        # Send the job request
+        r = self.send(HTTP_GET, relative_url, None)
+
+        return r.text
+
+
+    def wait_query_job(self, id, poll=1, max_poll=30):
+        """Wait for the query job to complete
+
+        The status is checked with exponential backoff and jitter, from
+        `poll` up to `max_poll` second between check.
+
+        Args:
+            id (str): The ID of the Bulk query job
+            poll (float): The first delay in second between status check
+            max_poll (float): The maximum delay in second between status check
+
+        Returns:
+            A dictionary for the status of the completed job
+
+        Raises:
+            BulkError: If the job failed or was aborted
+        """
+
+        for delay in backoff(poll, max_poll):
+            # Check the state of the job
+            status = json.loads(self.check_query_status(id))
+
+            # The job is done
+            if status["state"] == "JobComplete":
+                return status
+
+            # The job will never complete
+            if status["state"] in ("Failed", "Aborted"):
+                raise BulkError(status)
 
-        # See if the job is done (need to use equality compare)
-        while current_state != "JobComplete":
             # If job is not done, wait and check again
-            print("Job State: {}".format(current_state))
-            print("Waiting 10 Seconds...")
-            time.sleep(10)
-            check_status_r = self.check_status(bulk_job_id)
-            current_state = json.loads(check_status_r)["state"]
+            time.sleep(delay)
+
+
+    def get_query_result(self, id, path=None, max_records=None):
+        """Get the query job result
+
+        The result is downloaded page by page with the `Sforce-Locator`
+        header, only one page is streamed at a time.
+
+        Args:
+            id (str): The ID of the completed Bulk query job
+            path (str): The path of the CSV file to write the result to,
+                the rows are returned as a generator if not provided
+            max_records (int): The maximum number of record per page
+
+        Returns:
+            The number of record written to `path`, or a generator of
+            dictionary for each row if no path is provided
+        """
+
+        # Create the result request relative URL
+        relative_url = "/jobs/query/" + id + "/results"
+
+        # Create the request for each page
+        page_list = self._page(relative_url, max_records)
+
+        if path is None:
+            # Return the row as a generator
+            return _iter_csv(page_list)
+
+        # Write the row to the file
+        return _write_csv(page_list, path)
+
+
+    def query_job(self, query, path=None, max_records=None, operation="query", poll=1):
+        """Query with a Bulk query job
+
+        Create the Bulk query job, wait for it to complete and stream the
+        result without holding the full CSV in memory.
+
+        Args:
+            query (str): The SOQL (Salesforce Object Query Language) query
+            path (str): The path of the CSV file to write the result to,
+                the rows are returned as a generator if not provided
+            max_records (int): The maximum number of record per page
+            operation (str): The operation of the Bulk query job, `query`
+                or `queryAll`
+            poll (float): The first delay in second between status check
+
+        Returns:
+            The number of record written to `path`, or a generator of
+            dictionary for each row if no path is provided
+
+        Raises:
+            BulkError: If the job failed or was aborted
+        """
+
+        # Create the Bulk query job
+        bulk_job = json.loads(self.create_query_job(query, operation))
+
+        # The job was not created
+        if "id" not in bulk_job:
+            raise BulkError(bulk_job)
+
+        # Wait for the job to complete
+        self.wait_query_job(bulk_job["id"], poll=poll)
+
+        # Stream the result
+        return self.get_query_result(bulk_job["id"], path=path, max_records=max_records)
+
+
+    def _page(self, relative_url, max_records=None):
+        """Request each page of a result
+
+        Args:
+            relative_url (str): The result request relative URL
+            max_records (int): The maximum number of record per page
+
+        Yields:
+            A streamed `requests.Response` object for each page
+        """
+
+        # The locator of the first page
+        locator = None
+
+        while True:
+            # Create the query string
+            params = {}
+            if max_records is not None:
+                params["maxRecords"] = max_records
+            if locator is not None:
+                params["locator"] = locator
+
+            # Send the request, the body is read by the caller
+            r = self.send(HTTP_GET, relative_url, None, headers={"Accept": "text/csv"}, params=params, stream=True)
+            r.raise_for_status()
+
+            try:
+                yield r
+            finally:
+                r.close()
+
+            # Get the locator of the next page, `null` on the last page
+            locator = r.headers.get("Sforce-Locator")
+            if not locator or locator == "null":
+                return
+
+
+def _iter_csv(page_list):
+    """Iterate the row of CSV page
+
+    Args:
+        page_list (iterable): A streamed `requests.Response` object for
+            each page, every page start with the header row
+
+    Yields:
+        A dictionary for each row
+    """
+
+    for r in page_list:
+        # Decompress and decode the body while reading
+        r.raw.decode_content = True
+        # Let the wrapper see the end of the body, not a closed file
+        r.raw.auto_close = False
+        reader = csv.DictReader(io.TextIOWrapper(r.raw, encoding="utf-8", newline=""))
+
+        for row in reader:
+            yield row
+
+
+def _write_csv(page_list, path, chunk_size=1024 * 1024):
+    """Write CSV page to file
+
+    Args:
+        page_list (iterable): A streamed `requests.Response` object for
+            each page, every page start with the header row
+        path (str): The path of the CSV file
+        chunk_size (int): The number of byte to read at a time
+
+    Returns:
+        The number of record written
+    """
+
+    # The number of line written, and whether the stream is inside quote
+    line_count = 0
+    quote = False
+
+    with open(path, "wb") as f:
+        for i, r in enumerate(page_list):
+            # Skip the header row of every page but the first
+            skip = i > 0
+
+            for chunk in r.iter_content(chunk_size=chunk_size):
+                if skip:
+                    # Look for the end of the header row
+                    index = chunk.find(b"\n")
+                    if index < 0:
+                        continue
+                    chunk = chunk[index + 1:]
+                    skip = False
+
+                f.write(chunk)
+
+                # Count the line break outside quoted value
+                part_list = chunk.split(b'"')
+                for j, part in enumerate(part_list):
+                    if quote == (j % 2 == 1):
+                        line_count += part.count(b"\n")
+                quote = quote != (len(part_list) % 2 == 0)
+
+    # Do not count the header row
+    return max(line_count - 1, 0)
+
+
+def _csv_row(data):
+    """Serialize data to CSV row
+
+    Args:
+        data (iterable or str): An iterable of dictionary with the same
+            "key", or the path of a CSV file (str or path-like)
+
+    Yields:
+        The header row, then each record row, as byte
+    """
+
+    if isinstance(data, (str, os.PathLike)):
+        # Read the CSV file record by record, a quoted value can span line
+        with open(data, "rb") as f:
+            record = b""
+            quote = False
+            for line in f:
+                record += line
+                if line.count(b'"') % 2:
+                    quote = not quote
+                if not quote:
+                    yield record
+                    record = b""
+
+            # The last record without line break
+            if record:
+                yield record + b"\n"
+        return
+
+    # Write each dictionary to a reused buffer
+    buffer = io.StringIO()
+    writer = None
+    for row in data:
+        if writer is None:
+            # Write the header from the key of the first row
+            writer = csv.DictWriter(buffer, fieldnames=list(row), lineterminator="\n")
+            writer.writeheader()
+            yield buffer.getvalue().encode("utf-8")
+
+            # Empty the buffer
+            buffer.seek(0)
+            buffer.truncate()
+
+        writer.writerow(row)
+        yield buffer.getvalue().encode("utf-8")
+
+        # Empty the buffer
+        buffer.seek(0)
+        buffer.truncate()
+
+
+class _Chunk(tempfile.SpooledTemporaryFile):
+    """CSV chunk kept in memory until it grow past its maximum size.
+
+    `requests` read the size of the body from `len`, without it the
+    `fileno` it call instead roll every chunk over to disk.
+    """
+
+    @property
+    def len(self):
+        """The size in byte of the whole chunk"""
+
+        position = self.tell()
+        self.seek(0, io.SEEK_END)
+        size = self.tell()
+        self.seek(position)
+
+        return size
+
+
+def _csv_chunk(data, byte_limit, batch_limit=None, spool_size=8 * 1024 * 1024):
+    """Split data into CSV chunk
+
+    Args:
+        data (iterable or str): An iterable of dictionary with the same
+            "key", or the path of a CSV file (str or path-like)
+        byte_limit (int): The maximum size in byte of a chunk
+        batch_limit (int): The maximum number of record of a chunk
+        spool_size (int): The size in byte past which a chunk is written
+            to disk instead of memory
+
+    Yields:
+        A tuple of a file object, positioned at the start, for each
+        chunk starting with the header row and the number of record in
+        the chunk
+
+    Raises:
+        ValueError: If a record does not fit in a chunk on its own
+    """
+
+    # Get the header row
+    row_list = _csv_row(data)
+    header = next(row_list, None)
+
+    # There is no data
+    if header is None:
+        return
+
+    chunk = None
+    for index, row in enumerate(row_list):
+        # The API would reject the job, fail before uploading it
+        if len(header) + len(row) > byte_limit:
+            if chunk is not None:
+                chunk.close()
+            raise ValueError(f"Record {index} is {len(row)} byte, a chunk is limited to {byte_limit} byte with the header")
+
+        # Start a new chunk when the current one is full
+        if chunk is None or size + len(row) > byte_limit or (batch_limit and count >= batch_limit):
+            if chunk is not None:
+                chunk.seek(0)
+                yield chunk, count
+
+            chunk = _Chunk(max_size=spool_size)
+            chunk.write(header)
+            size = len(header)
+            count = 0
+
+        chunk.write(row)
+        size += len(row)
+        count += 1
+
+    # The last chunk
+    if chunk is not None:
+        chunk.seek(0)
+        yield chunk, count
 
-        return check_status_r
\ No newline at end of file
@@ -0,0 +1,250 @@
+"""
+SFDCFW.Rest.Cache
+~~~~~~~~~~~~~~~~~
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """Response Cache class.
+
+    Keep the body of a GET response with its validator (ETag and
+    Last-Modified) in a least recently used (LRU) memory cache, and
+    optionally in a directory on disk, so the next request can be sent
+    conditionally and answered with a 304 Not Modified.
+    """
+
+    def __init__(self, maxsize=128, max_bytes=None, path=None):
+        """Constructor
+
+        Args:
+            maxsize (int): The maximum number of response kept in memory
+            max_bytes (int): The maximum total size of the response body
+                kept in memory, no limit if None
+            path (str): The directory of the disk cache, memory only if None
+        """
+
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.path = path
+        self.size = 0
+        self.entry = OrderedDict()
+        self.lock = threading.Lock()
+
+        # Create the directory of the disk cache
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+
+    def get(self, key):
+        """Get Response
+
+        Args:
+            key (str): The cache key, usually the request URL
+
+        Returns:
+            A dictionary with the `body`, `etag` and `last_modified` of the
+            response, None if not cached
+        """
+
+        with self.lock:
+            if key in self.entry:
+                # Mark as most recently used
+                self.entry.move_to_end(key)
+                return self.entry[key]
+
+        # Look in the disk cache
+        entry = self._read(key)
+        if entry is not None:
+            self._add(key, entry)
+
+        return entry
+
+
+    def set(self, key, body, etag=None, last_modified=None):
+        """Set Response
+
+        Args:
+            key (str): The cache key, usually the request URL
+            body (str): The response body
+            etag (str): The ETag header of the response
+            last_modified (str): The Last-Modified (or Date) header of the response
+        """
+
+        entry = {
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified
+        }
+
+        self._add(key, entry)
+        self._write(key, entry)
+
+
+    def delete(self, key):
+        """Delete Response
+
+        Args:
+            key (str): The cache key, usually the request URL
+        """
+
+        with self.lock:
+            entry = self.entry.pop(key, None)
+            if entry is not None:
+                self.size -= len(entry['body'])
+
+        if self.path is not None:
+            try:
+                os.remove(self._file(key))
+            except FileNotFoundError:
+                pass
+
+
+    def clear(self):
+        """Clear every response in memory and on disk"""
+
+        with self.lock:
+            self.entry.clear()
+            self.size = 0
+
+        if self.path is not None:
+            for name in os.listdir(self.path):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(self.path, name))
+
+
+    def __len__(self):
+        return len(self.entry)
+
+
+    def _add(self, key, entry):
+        """Add the response to the memory cache, evicting the least recently used
+
+        Args:
+            key (str): The cache key
+            entry (dict): The cached response
+        """
+
+        with self.lock:
+            previous = self.entry.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous['body'])
+
+            self.entry[key] = entry
+            self.size += len(entry['body'])
+
+            # Evict until within the limit, keeping at least the new response
+            while len(self.entry) > 1 and (len(self.entry) > self.maxsize or
+                                           (self.max_bytes is not None and self.size > self.max_bytes)):
+                _, evicted = self.entry.popitem(last=False)
+                self.size -= len(evicted['body'])
+
+
+    def _file(self, key):
+        """Get the path of the disk cache file
+
+        Args:
+            key (str): The cache key
+
+        Returns:
+            The path of the file for the key
+        """
+
+        return os.path.join(self.path, hashlib.sha256(key.encode()).hexdigest() + '.json')
+
+
+    def _read(self, key):
+        """Read the response from the disk cache
+
+        Args:
+            key (str): The cache key
+
+        Returns:
+            The cached response, None if not cached or unreadable
+        """
+
+        if self.path is None:
+            return None
+
+        try:
+            with open(self._file(key), 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # A different key with the same hash
+        if entry.pop('key', None) != key:
+            return None
+
+        return entry
+
+
+    def _write(self, key, entry):
+        """Write the response to the disk cache
+
+        Args:
+            key (str): The cache key
+            entry (dict): The cached response
+        """
+
+        if self.path is None:
+            return
+
+        # Write to a temporary file then rename, reader never see a partial file
+        fd, temp_path = tempfile.mkstemp(dir=self.path)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(dict(entry, key=key), f)
+        os.replace(temp_path, self._file(key))
+
+
+def conditional_get(transport, url, headers, cache, key=None):
+    """Conditional GET Request
+
+    Send the validator of the cached response, so an unchanged resource
+    is answered with a 304 Not Modified and served from the cache.
+
+    Args:
+        transport (Transport): The transport used to send the request
+        url (str): The request URL
+        headers (dict): The request header
+        cache (ResponseCache): The response cache
+        key (str): The cache key, the request URL if not provided
+
+    Returns:
+        The response text (message body), None if there was an error
+    """
+
+    key = key if key is not None else url
+    entry = cache.get(key)
+
+    # Add the validator of the cached response
+    header = dict(headers)
+    if entry is not None:
+        if entry['etag'] is not None:
+            header['If-None-Match'] = entry['etag']
+        if entry['last_modified'] is not None:
+            header['If-Modified-Since'] = entry['last_modified']
+
+    # Send the request
+    r = transport.get(url=url, headers=header)
+
+    # Not modified, use the cached response
+    if r.status_code == 304 and entry is not None:
+        return entry['body']
+
+    if r.status_code == 200:
+        # Keep the response, the Date header validate a response without Last-Modified
+        cache.set(key,
+                  r.text,
+                  etag=r.headers.get('ETag'),
+                  last_modified=r.headers.get('Last-Modified', r.headers.get('Date')))
+        return r.text
+
+    # There was an error
+    return None
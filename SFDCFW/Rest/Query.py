@@ -4,7 +4,12 @@ SFDCFW.Query
 """
 
 import json
-import requests
+import queue
+import re
+import string
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 
 from SFDCFW.Constant import SFDC_API_V
 from SFDCFW.Rest.Rest import Rest
@@ -40,8 +45,8 @@ class Query(Rest):
         request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/query/?q={format_query}'
 
         # Send the request
-        r = requests.get(url=request_url,
-                         headers=self.header)
+        r = self.transport.get(url=request_url,
+                               headers=self.header)
 
         # Check the status code
         if r.status_code == 200:
@@ -51,6 +56,222 @@ class Query(Rest):
         # There was an error
         return None
 
+
+    def query_iter(self, query, prefetch=2):
+        """Iterate SOQL (Salesforce Object Query Language) Query Record
+
+        Follow the `nextRecordsUrl` of each page and yield the record
+        one by one. The next page is fetched on a background thread
+        while the current page is consumed, at most `prefetch` page are
+        held in memory ahead of the caller.
+
+        Args:
+            query (str): The SOQL (Salesforce Object Query Language) query
+            prefetch (int): The maximum number of page fetched ahead
+
+        Yields:
+            A dictionary for each record of the query
+
+        Raises:
+            requests.HTTPError: If the request of any page failed
+        """
+
+        # Fetch the page in the background and yield each record
+        for page in _background([lambda put: self._fetch_page(query, put)], prefetch):
+            for record in page:
+                yield record
+
+
+    def query_partition(self, query, partition=4, thread=None, field='Id', dedupe=False, prefetch=2):
+        """Iterate SOQL (Salesforce Object Query Language) Query Record In Partition
+
+        Find the lowest and highest value of `field`, split the range
+        into non-overlapping partition and run the query of each
+        partition on a worker thread. The record of every partition
+        are merged into one stream, in no particular order.
+
+        Args:
+            query (str): The SOQL (Salesforce Object Query Language)
+                query, without GROUP BY, LIMIT or OFFSET
+            partition (int): The number of partition
+            thread (int): The number of thread to use, one per partition
+                by default
+            field (str): The field to partition on, `Id` or a (never
+                null) datetime field such as `CreatedDate`
+            dedupe (bool): Whether to skip record with an already seen ID,
+                the query must select `Id`
+            prefetch (int): The maximum number of page fetched ahead per
+                thread
+
+        Yields:
+            A dictionary for each record of the query
+
+        Raises:
+            ValueError: If the query cannot be partitioned, or deduped
+                without `Id`
+            requests.HTTPError: If the request of any page failed
+        """
+
+        # The ID of each record is needed to dedupe
+        if dedupe and 'id' not in _select_field(query):
+            raise ValueError('Cannot dedupe a query that does not select Id')
+
+        # Create the query of each partition
+        query_list = self.partition(query, partition=partition, field=field)
+
+        # Create a producer for each partition
+        producer_list = [lambda put, q=q: self._fetch_page(q, put) for q in query_list]
+
+        # Set of ID already seen
+        id_set = set()
+
+        # Fetch the page of every partition in the background
+        thread = thread or len(query_list)
+        for page in _background(producer_list, thread * max(prefetch, 1), thread=thread):
+            for record in page:
+                if dedupe:
+                    # Skip the record if already seen
+                    if record['Id'] in id_set:
+                        continue
+                    id_set.add(record['Id'])
+
+                yield record
+
+
+    def partition(self, query, partition=4, field='Id'):
+        """Partition SOQL (Salesforce Object Query Language) Query
+
+        Args:
+            query (str): The SOQL (Salesforce Object Query Language)
+                query, without GROUP BY, LIMIT or OFFSET
+            partition (int): The number of partition
+            field (str): The field to partition on, `Id` or a (never
+                null) datetime field such as `CreatedDate`
+
+        Returns:
+            A list of string for the query of each partition
+
+        Raises:
+            ValueError: If the query cannot be partitioned
+        """
+
+        # Find the clause of the query
+        clause = _clause(query)
+
+        # A partition would change the result of these clause
+        for keyword in ('GROUP BY', 'LIMIT', 'OFFSET'):
+            if keyword in clause:
+                raise ValueError(f'Cannot partition a query with {keyword}')
+
+        # Get the FROM object and WHERE condition
+        from_start, from_end = clause['FROM']
+        object_name = query[from_start:from_end].split()[0]
+        condition = query[slice(*clause['WHERE'])].strip() if 'WHERE' in clause else None
+
+        # Find the lowest and highest value of the field
+        low = self._boundary(object_name, condition, field, 'ASC')
+        high = self._boundary(object_name, condition, field, 'DESC')
+
+        # Nothing to partition
+        if low is None or high is None:
+            return [query]
+
+        # Convert the value to number for the interpolation
+        if field == 'Id':
+            low_n, high_n = _id_to_int(low), _id_to_int(high)
+        else:
+            low_n, high_n = _datetime_to_int(low), _datetime_to_int(high)
+
+        # Calculate the cut point between the lowest and highest value
+        cut_list = sorted(set(low_n + (high_n - low_n) * i // partition for i in range(1, partition)) - {low_n})
+
+        # Format the cut point as SOQL literal
+        if field == 'Id':
+            literal_list = [f"'{_int_to_id(n)}'" for n in cut_list]
+        else:
+            literal_list = [_int_to_datetime(n) for n in cut_list]
+
+        # Create the range predicate, the first and last are open ended
+        bound_list = [None] + literal_list + [None]
+        predicate_list = []
+        for lower, upper in zip(bound_list, bound_list[1:]):
+            if lower is None and upper is None:
+                return [query]
+            elif lower is None:
+                predicate_list.append(f'{field} < {upper}')
+            elif upper is None:
+                predicate_list.append(f'{field} >= {lower}')
+            else:
+                predicate_list.append(f'{field} >= {lower} AND {field} < {upper}')
+
+        # Rewrite the query with each predicate
+        return [_add_condition(query, clause, predicate) for predicate in predicate_list]
+
+
+    def _boundary(self, object_name, condition, field, order):
+        """Get The Lowest Or Highest Value Of A Field
+
+        Args:
+            object_name (str): The object to query
+            condition (str): The WHERE condition, or None
+            field (str): The field to sort on
+            order (str): ASC for the lowest value, DESC for the highest
+
+        Returns:
+            The value of the field, or None if there is no record
+        """
+
+        # Create the query
+        query = f'SELECT {field} FROM {object_name}'
+        if condition:
+            query += f' WHERE {condition}'
+        query += f' ORDER BY {field} {order} LIMIT 1'
+
+        # Send the request
+        r = self.transport.get(url=f'{self.base_url}/services/data/v{SFDC_API_V}/query/',
+                               headers=self.header,
+                               params={'q': query})
+        r.raise_for_status()
+
+        # Get the value of the single record
+        records = r.json()['records']
+        return records[0][field] if records else None
+
+
+    def _fetch_page(self, query, put):
+        """Fetch Every Page Of A Query
+
+        Args:
+            query (str): The SOQL (Salesforce Object Query Language) query
+            put (callable): The function receiving the record list of
+                each page, returning False to stop
+
+        Raises:
+            requests.HTTPError: If the request of any page failed
+        """
+
+        # Send the request for the first page
+        r = self.transport.get(url=f'{self.base_url}/services/data/v{SFDC_API_V}/query/',
+                               headers=self.header,
+                               params={'q': query})
+
+        while True:
+            # Check the status code
+            r.raise_for_status()
+            page = r.json()
+
+            # Hand the page over
+            if not put(page['records']):
+                return
+
+            # Check if there is more page
+            if page['done'] or not page.get('nextRecordsUrl'):
+                return
+
+            # Send the request for the next page
+            r = self.transport.get(url=f'{self.base_url}{page["nextRecordsUrl"]}',
+                                   headers=self.header)
+
     
     def explain(self, query):
         """Get Performance Feedback
@@ -58,4 +279,211 @@ class Query(Rest):
         Retrieve performance feedback on query (without executing),
         report, or list view.
         """
-        pass
\ No newline at end of file
+        pass
+
+
+# SOQL clause keyword at the top level of a query
+CLAUSE_PATTERN = re.compile(r'\b(FROM|USING\s+SCOPE|WHERE|WITH|GROUP\s+BY|ORDER\s+BY|LIMIT|OFFSET|FOR)\b', re.IGNORECASE)
+
+# Base 62 digit of the Salesforce ID, in sort order
+ID_DIGIT = string.digits + string.ascii_uppercase + string.ascii_lowercase
+
+
+class _Error:
+    """Error raised by a background producer."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def _background(producer_list, maxsize, thread=1):
+    """Yield Item From Background Producer
+
+    Args:
+        producer_list (list): A list of function called with a `put`
+            function, `put` return False once the caller stopped
+        maxsize (int): The maximum number of item held in the queue
+        thread (int): The number of thread to run the producer on
+
+    Yields:
+        Each item put by the producer, until every producer is done
+
+    Raises:
+        Exception: The first error raised by a producer
+    """
+
+    # Create a bounded queue for the item produced ahead
+    item_queue = queue.Queue(maxsize=max(maxsize, 1))
+    # Signal the producer to stop if the caller stop early
+    stop = threading.Event()
+    # Mark the end of a producer
+    done = object()
+
+    def _put(item):
+        # Wait for room in the queue unless the caller stopped
+        while not stop.is_set():
+            try:
+                item_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(producer):
+        # The caller stopped before the producer started
+        if stop.is_set():
+            return
+
+        try:
+            producer(_put)
+        except Exception as e:
+            # Hand the error over to the caller
+            _put(_Error(e))
+        finally:
+            _put(done)
+
+    # Start the producer in the background
+    executor = ThreadPoolExecutor(max_workers=thread)
+    for producer in producer_list:
+        executor.submit(_run, producer)
+
+    try:
+        remaining = len(producer_list)
+        while remaining:
+            item = item_queue.get()
+
+            # A producer is done
+            if item is done:
+                remaining -= 1
+                continue
+
+            # There was an error
+            if isinstance(item, _Error):
+                raise item.error
+
+            yield item
+    finally:
+        # Stop the producer, and drop the one not started yet
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _clause(query):
+    """Find The Top Level Clause Of A Query
+
+    Args:
+        query (str): The SOQL (Salesforce Object Query Language) query
+
+    Returns:
+        A dictionary of the (start, end) position of each clause body,
+        keyed by the upper case keyword
+    """
+
+    # Mask the string literal and subquery so only the top level is matched
+    mask = []
+    depth = 0
+    quote = False
+    escape = False
+    for c in query:
+        if quote:
+            quote = escape or c != "'"
+            escape = not escape and c == '\\'
+            mask.append(' ')
+        elif c == "'":
+            quote = True
+            mask.append(' ')
+        elif c == '(':
+            depth += 1
+            mask.append(' ')
+        elif c == ')':
+            depth -= 1
+            mask.append(' ')
+        else:
+            mask.append(c if depth == 0 else ' ')
+
+    # Find the keyword, the body run until the next keyword
+    match_list = list(CLAUSE_PATTERN.finditer(''.join(mask)))
+    clause = {}
+    for i, match in enumerate(match_list):
+        keyword = ' '.join(match.group(1).upper().split())
+        end = match_list[i + 1].start() if i + 1 < len(match_list) else len(query)
+        clause[keyword] = (match.end(), end)
+
+    return clause
+
+
+def _select_field(query):
+    """Find The Top Level Field Of The SELECT Clause
+
+    Args:
+        query (str): The SOQL (Salesforce Object Query Language) query
+
+    Returns:
+        A list of string for each field (or subquery), in lower case
+    """
+
+    # The field run from the SELECT keyword to the top level FROM keyword
+    from_start, _ = _clause(query)['FROM']
+    select = query[:from_start].strip()[len('SELECT'):-len('FROM')]
+
+    return [field.strip().lower() for field in select.split(',')]
+
+
+def _add_condition(query, clause, predicate):
+    """Add A Condition To The WHERE Clause Of A Query
+
+    Args:
+        query (str): The SOQL (Salesforce Object Query Language) query
+        clause (dict): The clause position of the query
+        predicate (str): The condition to add
+
+    Returns:
+        A string for the rewritten query
+    """
+
+    if 'WHERE' in clause:
+        # Combine with the existing condition
+        start, end = clause['WHERE']
+        return f'{query[:start]} ({query[start:end].strip()}) AND {predicate} {query[end:].lstrip()}'.rstrip()
+
+    # Insert the WHERE clause after the FROM (and USING SCOPE) clause
+    end = clause['USING SCOPE'][1] if 'USING SCOPE' in clause else clause['FROM'][1]
+    return f'{query[:end].rstrip()} WHERE {predicate} {query[end:].lstrip()}'.rstrip()
+
+
+def _id_to_int(id):
+    """Convert The 15 Character Salesforce ID To Number"""
+
+    n = 0
+    for c in id[:15]:
+        n = n * 62 + ID_DIGIT.index(c)
+    return n
+
+
+def _int_to_id(n):
+    """Convert A Number To The 18 Character Salesforce ID"""
+
+    # Encode the 15 character case sensitive ID
+    digit_list = []
+    for _ in range(15):
+        n, d = divmod(n, 62)
+        digit_list.append(ID_DIGIT[d])
+    id = ''.join(reversed(digit_list))
+
+    # Add the case insensitive checksum of each 5 character
+    suffix = ''
+    for i in range(0, 15, 5):
+        flag = sum(1 << j for j, c in enumerate(id[i : i + 5]) if c in string.ascii_uppercase)
+        suffix += (string.ascii_uppercase + '012345')[flag]
+
+    return id + suffix
+
+
+def _datetime_to_int(value):
+    """Convert A Salesforce Datetime To POSIX Timestamp"""
+    return int(datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z').timestamp())
+
+
+def _int_to_datetime(n):
+    """Convert A POSIX Timestamp To A SOQL Datetime Literal"""
+    return datetime.fromtimestamp(n, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
@@ -4,20 +4,40 @@ SFDCFW.Rest.Rest
 """
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 
+from SFDCFW.Constant import SFDC_API_V
+from SFDCFW.Rest.Cache import ResponseCache
+from SFDCFW.Retry import Retry
+from SFDCFW.Transport import Transport
+
 
 class Rest(object):
     """REST (REpresentational State Transfer) class."""
 
-    def __init__(self, access):
+    def __init__(self, access, transport=None, describe_cache=None, read_cache=None):
         """Constructor
 
         Args:
             access (tuple): The Salesforce session ID / access token and
                 server URL / instance URL tuple
+            transport (Transport): The pooled HTTP transport to share with
+                other REST class of the same organization, one with the
+                default retry policy is created if not provided
+            describe_cache (ResponseCache): The cache of the describe
+                result, one in memory is created if not provided
+            read_cache (ResponseCache): The cache of the record read,
+                record are read without cache if not provided
         """
 
+        # Use the shared transport, or create one for this instance
+        self.transport = transport if transport is not None else Transport(retry=Retry())
+
+        # Use the shared describe cache, or create one for this instance
+        self.describe_cache = describe_cache if describe_cache is not None else ResponseCache()
+        self.read_cache = read_cache
+
         # Unpack the tuple for session ID / access token and server URL / instance URL
         id_token, base_url = access
         
@@ -45,4 +65,56 @@ class Rest(object):
         self.label = label
 
         # Return the self instance
-        return self
\ No newline at end of file
+        return self
+
+    def send(self, method, relative_url, data=None, headers=None, **kwargs):
+        """Send Request
+
+        Args:
+            method (str): The HTTP method
+            relative_url (str): The request URL relative to the versioned
+                REST API (for example `/jobs/ingest`)
+            data (str): The request body
+            headers (dict): The header to add to (or override in) the
+                REST header for this request only
+            **kwargs: Any keyword argument accepted by `Transport.request`
+
+        Returns:
+            A `requests.Response` object
+        """
+
+        # Create the request URL
+        request_url = f'{self.base_url}/services/data/v{SFDC_API_V}{relative_url}'
+
+        # Create the header for this request
+        header = self.header if headers is None else dict(self.header, **headers)
+
+        # Send the request through the shared transport
+        return self.transport.request(method,
+                                      request_url,
+                                      headers=header,
+                                      data=data,
+                                      **kwargs)
+
+    def _map(self, function, iterable, thread=4):
+        """Map Function Over Worker Thread
+
+        Args:
+            function (callable): The function to call for each item
+            iterable (iterable): The item to pass to the function
+            thread (int): The number of thread to use
+
+        Returns:
+            A list of the function result in the same order as the item
+        """
+
+        # Create the item list
+        item_list = list(iterable)
+
+        # No need for thread with a single item
+        if thread <= 1 or len(item_list) <= 1:
+            return [function(item) for item in item_list]
+
+        # Dispatch the item over the worker thread, keeping the order
+        with ThreadPoolExecutor(max_workers=min(thread, len(item_list))) as executor:
+            return list(executor.map(function, item_list))
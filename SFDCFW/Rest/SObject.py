@@ -4,9 +4,9 @@ SFDCFW.SObject
 """
 
 import json
-import requests
 
 from SFDCFW.Constant import SFDC_API_V
+from SFDCFW.Rest.Cache import conditional_get
 from SFDCFW.Rest.Rest import Rest
 
 class SObject(Rest):
@@ -27,9 +27,12 @@ class SObject(Rest):
         request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/sobjects/{self.label}'
 
         # Send the request
-        r = requests.post(url=request_url,
-                          headers=self.header,
-                          data=payload)
+        r = self.transport.post(url=request_url,
+                                headers=self.header,
+                                data=payload)
+
+        # The cached object summary is out of date
+        self._invalidate([])
 
         # Check the status code
         if r.status_code == 201:
@@ -59,9 +62,13 @@ class SObject(Rest):
             # Create the request URL without ID
             request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/sobjects/{self.label}'
 
+        # Send the conditional request if the read is cached
+        if self.read_cache is not None:
+            return conditional_get(self.transport, request_url, self.header, self.read_cache)
+
         # Send the request
-        r = requests.get(url=request_url,
-                         headers=self.header)
+        r = self.transport.get(url=request_url,
+                               headers=self.header)
 
         # Check the status code
         if r.status_code == 200:
@@ -72,6 +79,83 @@ class SObject(Rest):
         return None
 
 
+    def describe(self):
+        """Describe SObject.
+
+        The result is cached, and revalidated with If-Modified-Since so
+        an unchanged describe is answered with a 304 Not Modified.
+
+        Returns:
+            A string formatted JSON for the request.
+        """
+
+        # Create the request URL
+        request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/sobjects/{self.label}/describe'
+
+        # Send the conditional request
+        return conditional_get(self.transport, request_url, self.header, self.describe_cache)
+
+
+    def read_many(self, ids, fields, thread=4):
+        """Read Many SObject.
+
+        Use the SObject Collections resource to retrieve up to 2,000
+        records per request, the requests are sent in parallel.
+
+        Args:
+            ids (list): A list of string for the ID of each SObject.
+            fields (list): A list of string for the field to retrieve.
+            thread (int): The number of thread to use.
+
+        Returns:
+            A dictionary of the SObject data keyed by ID, or None if
+            any request failed.
+        """
+
+        # Create the request URL
+        request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/composite/sobjects/{self.label}'
+
+        # Always retrieve the ID to key the result
+        field_list = list(fields)
+        if 'Id' not in field_list:
+            field_list.insert(0, 'Id')
+
+        def _read_many(chunk):
+            # Create the payload
+            payload = {
+                'ids': chunk,
+                'fields': field_list
+            }
+
+            # Send the request
+            r = self.transport.post(url=request_url,
+                                    headers=self.header,
+                                    data=json.dumps(payload))
+
+            # Check the status code
+            if r.status_code == 200:
+                # Return the records, not found record are null
+                return r.json()
+
+            # There was an error
+            return None
+
+        # Split the ID into chunk of the request limit
+        id_list = list(ids)
+        record_limit = 2000
+        chunk_list = [id_list[i : i + record_limit] for i in range(0, len(id_list), record_limit)]
+
+        # Send the chunk in parallel
+        chunk_result = self._map(_read_many, chunk_list, thread)
+
+        # There was an error
+        if any(records is None for records in chunk_result):
+            return None
+
+        # Key the SObject data by ID
+        return {record['Id']: record for records in chunk_result for record in records if record is not None}
+
+
     def update(self, id, payload):
         """Update SObject.
 
@@ -87,9 +171,12 @@ class SObject(Rest):
         request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/sobjects/{self.label}/{id}'
 
         # Send the request
-        r = requests.patch(url=request_url,
-                           headers=self.header,
-                           data=payload)
+        r = self.transport.patch(url=request_url,
+                                 headers=self.header,
+                                 data=payload)
+
+        # The cached read is out of date
+        self._invalidate([id])
 
         # Check the status code
         if r.status_code == 204:
@@ -114,8 +201,11 @@ class SObject(Rest):
         request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/sobjects/{self.label}/{id}'
 
         # Send the request
-        r = requests.delete(url=request_url,
-                            headers=self.header)
+        r = self.transport.delete(url=request_url,
+                                  headers=self.header)
+
+        # The cached read is out of date
+        self._invalidate([id])
 
         # Check the status code
         if r.status_code == 204:
@@ -125,6 +215,205 @@ class SObject(Rest):
         # There was an error
         return None
 
+    def create_many(self, records, all_or_none=False, thread=4):
+        """Create Many SObject.
+
+        Use the SObject Collections resource to create up to 200
+        records per request, the requests are sent in parallel.
+
+        Args:
+            records (list): A list of dictionary with the required data
+                for each SObject.
+            all_or_none (bool): Whether to roll back the whole request
+                when any record fail, for no more than 200 records.
+            thread (int): The number of thread to use.
+
+        Returns:
+            A list of dictionary for the result of each record, in the
+            same order as the records.
+
+        Raises:
+            ValueError: If all or none is asked for more than 200 records
+        """
+
+        # Get the name / label before dispatching to thread
+        label = self.label
+
+        # Add the SObject type to each record
+        record_list = [dict({'attributes': {'type': label}}, **record) for record in records]
+
+        # Create the request URL
+        request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/composite/sobjects'
+
+        def _create_many(chunk):
+            # Create the payload
+            payload = {
+                'allOrNone': all_or_none,
+                'records': chunk
+            }
+
+            # Send the request
+            r = self.transport.post(url=request_url,
+                                    headers=self.header,
+                                    data=json.dumps(payload))
+
+            return _collection_result(r, len(chunk))
+
+        return self._collection(_create_many, record_list, thread, all_or_none=all_or_none)
+
+
+    def update_many(self, records, all_or_none=False, thread=4):
+        """Update Many SObject.
+
+        Use the SObject Collections resource to update up to 200
+        records per request, the requests are sent in parallel.
+
+        Args:
+            records (list): A list of dictionary with the updated data
+                for each SObject, each dictionary must have the `Id`.
+            all_or_none (bool): Whether to roll back the whole request
+                when any record fail, for no more than 200 records.
+            thread (int): The number of thread to use.
+
+        Returns:
+            A list of dictionary for the result of each record, in the
+            same order as the records.
+
+        Raises:
+            ValueError: If a record has no `Id`, or all or none is asked
+                for more than 200 records, before any request
+        """
+
+        # Get the name / label before dispatching to thread
+        label = self.label
+
+        # Read the records once, they may be a generator
+        records = list(records)
+
+        # Every record must say which SObject to update
+        for index, record in enumerate(records):
+            if not record.get('Id'):
+                raise ValueError(f'Record {index} has no Id to update')
+
+        # Add the SObject type to each record
+        record_list = [dict({'attributes': {'type': label}}, **record) for record in records]
+
+        # Create the request URL
+        request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/composite/sobjects'
+
+        def _update_many(chunk):
+            # Create the payload
+            payload = {
+                'allOrNone': all_or_none,
+                'records': chunk
+            }
+
+            # Send the request
+            r = self.transport.patch(url=request_url,
+                                     headers=self.header,
+                                     data=json.dumps(payload))
+
+            return _collection_result(r, len(chunk))
+
+        # The cached read is out of date
+        self._invalidate([record['Id'] for record in records])
+
+        return self._collection(_update_many, record_list, thread, all_or_none=all_or_none)
+
+
+    def delete_many(self, ids, all_or_none=False, thread=4):
+        """Delete Many SObject.
+
+        Use the SObject Collections resource to delete up to 200
+        records per request, the requests are sent in parallel.
+
+        Args:
+            ids (list): A list of string for the ID of each SObject.
+            all_or_none (bool): Whether to roll back the whole request
+                when any record fail, for no more than 200 records.
+            thread (int): The number of thread to use.
+
+        Returns:
+            A list of dictionary for the result of each record, in the
+            same order as the IDs.
+
+        Raises:
+            ValueError: If all or none is asked for more than 200 IDs
+        """
+
+        # Create the request URL
+        request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/composite/sobjects'
+
+        def _delete_many(chunk):
+            # Create the query string
+            params = {
+                'ids': ','.join(chunk),
+                'allOrNone': str(all_or_none).lower()
+            }
+
+            # Send the request
+            r = self.transport.delete(url=request_url,
+                                      headers=self.header,
+                                      params=params)
+
+            return _collection_result(r, len(chunk))
+
+        # The cached read is out of date
+        id_list = list(ids)
+        self._invalidate(id_list)
+
+        return self._collection(_delete_many, id_list, thread, all_or_none=all_or_none)
+
+
+    def _invalidate(self, ids):
+        """Invalidate the Cached Read
+
+        Args:
+            ids (list): A list of string for the ID of each changed SObject
+        """
+
+        if self.read_cache is None:
+            return
+
+        # Create the request URL without ID
+        request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/sobjects/{self.label}'
+
+        # The object summary list the recently changed record
+        self.read_cache.delete(request_url)
+
+        for id in ids:
+            self.read_cache.delete(f'{request_url}/{id}')
+
+
+    def _collection(self, function, item_list, thread, all_or_none=False, record_limit=200):
+        """Send SObject Collections Request In Chunk
+
+        Args:
+            function (callable): The function sending one chunk
+            item_list (list): The record or ID to send
+            thread (int): The number of thread to use
+            all_or_none (bool): Whether every item must be rolled back together
+            record_limit (int): The maximum number of item per request
+
+        Returns:
+            A flat list of the result of each item, in the same order
+
+        Raises:
+            ValueError: If all or none is asked for more item than a
+                single request hold
+        """
+
+        # Each request is rolled back on its own, not with the other chunk
+        if all_or_none and len(item_list) > record_limit:
+            raise ValueError(f'all_or_none is limited to {record_limit} records per call, got {len(item_list)}')
+
+        # Split the item into chunk of the request limit
+        chunk_list = [item_list[i : i + record_limit] for i in range(0, len(item_list), record_limit)]
+
+        # Send the chunk in parallel and flatten the ordered result
+        return [result for chunk_result in self._map(function, chunk_list, thread) for result in chunk_result]
+
+
 
     # def query(self, query):
     #     """Execute SOQL (Salesforce Object Query Language) Query
@@ -158,4 +447,29 @@ class SObject(Rest):
     #     # Send the request
     #     r = self.send(HTTP_GET, next_record_url, None)
 
-    #     return r.text
\ No newline at end of file
+    #     return r.text
+
+
+def _collection_result(r, size):
+    """Parse SObject Collections Response
+
+    Args:
+        r (requests.Response): The response of the request
+        size (int): The number of record in the request
+
+    Returns:
+        A list of dictionary for the result of each record
+    """
+
+    # Check the status code
+    if r.status_code == 200:
+        # Return the result of each record
+        return r.json()
+
+    # There was an error with the whole request, report it on each record
+    try:
+        errors = r.json()
+    except ValueError:
+        errors = [{'statusCode': str(r.status_code), 'message': r.text}]
+
+    return [{'id': None, 'success': False, 'errors': errors} for _ in range(size)]
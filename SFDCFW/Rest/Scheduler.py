@@ -0,0 +1,231 @@
+"""
+SFDCFW.Rest.Scheduler
+~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from SFDCFW.Exception import BulkError
+from SFDCFW.Retry import backoff
+
+
+# Bulk job state that will not change anymore
+FINAL_STATE = ("JobComplete", "Failed", "Aborted")
+
+
+class Scheduler:
+    """Bulk ingest job scheduler.
+
+    Keep up to `concurrency` ingest job uploading at once, and poll
+    every open job from a single thread with exponential backoff.
+    """
+
+    def __init__(self, bulk, concurrency=4, poll=1, max_poll=30, factor=2, jitter=0.1, max_error=5):
+        """Constructor
+
+        Args:
+            bulk (Bulk): The Bulk API instance used to send the request
+            concurrency (int): The maximum number of job uploading at once
+            poll (float): The first delay in second before checking a job
+            max_poll (float): The maximum delay in second between check
+            factor (float): The multiplier applied to the delay each check
+            jitter (float): The fraction of the delay to randomly add or remove
+            max_error (int): The maximum number of check in a row that
+                failed before the job is failed
+        """
+
+        self.bulk = bulk
+        self.poll = poll
+        self.max_poll = max_poll
+        self.factor = factor
+        self.jitter = jitter
+        self.max_error = max_error
+
+        # Upload the job on a bounded pool of thread
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        # Bound the number of job waiting to upload, so the data of at
+        # most twice the concurrency is held at once
+        self.pending = threading.BoundedSemaphore(concurrency * 2)
+
+        # The open job, keyed by ID, with the future, callback, next check
+        # time, delay generator and number of check in a row that failed
+        self.open_job = {}
+        self.condition = threading.Condition()
+        self.poll_thread = None
+        self.future_list = []
+
+
+    def submit(self, object_type, operation, data, callback=None):
+        """Submit a Bulk ingest job
+
+        Args:
+            object_type (str): The object type (API name) for the Bulk job
+            operation (str): The operation of the Bulk job
+            data (str or file): The data for the Bulk job, must be in CSV
+                format, a file object is streamed and closed once uploaded
+            callback (callable): The function called with the dictionary
+                for the final status of the job
+
+        Returns:
+            A `concurrent.futures.Future` for the final status of the job
+        """
+
+        # Wait for room if too many job are waiting to upload
+        self.pending.acquire()
+
+        future = Future()
+        self.future_list.append(future)
+
+        # Upload the job in the background
+        self.executor.submit(self._upload, object_type, operation, data, callback, future)
+
+        return future
+
+
+    def wait(self):
+        """Wait for every submitted job
+
+        Returns:
+            A list of dictionary for the final status of each job, in
+            the order submitted
+
+        Raises:
+            Exception: The error of the first job that failed to upload
+        """
+
+        return [future.result() for future in self.future_list]
+
+
+    def close(self):
+        """Wait for every submitted job and release the thread."""
+
+        for future in self.future_list:
+            future.exception()
+
+        self.executor.shutdown()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
+
+
+    def _upload(self, object_type, operation, data, callback, future):
+        """Create, upload and close a Bulk ingest job
+
+        Args:
+            object_type (str): The object type (API name) for the Bulk job
+            operation (str): The operation of the Bulk job
+            data (str or file): The data for the Bulk job, must be in CSV format
+            callback (callable): The function called with the final status
+            future (Future): The future for the final status of the job
+        """
+
+        try:
+            # Create the Bulk job
+            bulk_job = json.loads(self.bulk.create_job(operation, object_type))
+
+            # The job was not created
+            if "id" not in bulk_job:
+                raise BulkError(bulk_job)
+
+            bulk_job_id = bulk_job["id"]
+
+            # Add the data to the job
+            add_data_r = self.bulk.add_data(bulk_job_id, data)
+
+            if add_data_r == 201:
+                # Upload successful, close the job
+                self.bulk.close_job(bulk_job_id)
+            else:
+                # Failure, abort the job and let the poll report it
+                self.bulk.abort_job(bulk_job_id)
+        except Exception as e:
+            future.set_exception(e)
+            return
+        finally:
+            # Release the data and make room for the next job
+            if hasattr(data, "close"):
+                data.close()
+            self.pending.release()
+
+        # Hand the job over to the poll thread
+        with self.condition:
+            delay = backoff(self.poll, self.max_poll, self.factor, self.jitter)
+            self.open_job[bulk_job_id] = (future, callback, time.monotonic() + next(delay), delay, 0)
+
+            # Start the poll thread if it is not running
+            if self.poll_thread is None:
+                self.poll_thread = threading.Thread(target=self._poll, daemon=True)
+                self.poll_thread.start()
+
+            self.condition.notify()
+
+
+    def _poll(self):
+        """Check every open job until there is none left"""
+
+        while True:
+            with self.condition:
+                # Stop the thread when there is no open job
+                if not self.open_job:
+                    self.poll_thread = None
+                    return
+
+                # Wait until the next job is due
+                now = time.monotonic()
+                due = min(job[2] for job in self.open_job.values())
+                if due > now:
+                    self.condition.wait(due - now)
+                    continue
+
+                # Get the job that are due
+                due_list = [(id, job) for id, job in self.open_job.items() if job[2] <= now]
+
+            for bulk_job_id, (future, callback, _, delay, error_count) in due_list:
+                error = None
+                try:
+                    # Check the state of the job
+                    status = json.loads(self.bulk.check_status(bulk_job_id))
+                except Exception as e:
+                    # Try again later, unless it keeps failing
+                    status = None
+                    error_count += 1
+                    if error_count >= self.max_error:
+                        error = BulkError({"id": bulk_job_id, "error": repr(e)})
+                else:
+                    error_count = 0
+                    # An error response (job not found, invalid session) will not change
+                    if not isinstance(status, dict) or "state" not in status:
+                        error = BulkError(status)
+
+                with self.condition:
+                    if error is None and (status is None or status["state"] not in FINAL_STATE):
+                        # Check again after the next delay
+                        self.open_job[bulk_job_id] = (future, callback, time.monotonic() + next(delay), delay, error_count)
+                        continue
+
+                    # The job is done
+                    del self.open_job[bulk_job_id]
+
+                # Fail the job that cannot be checked
+                if error is not None:
+                    future.set_exception(error)
+                    continue
+
+                # Fire the callback, an error must not stop the poll thread
+                if callback is not None:
+                    try:
+                        callback(status)
+                    except Exception:
+                        logging.getLogger(__name__).exception("Bulk job callback failed")
+
+                # Resolve the future
+                future.set_result(status)
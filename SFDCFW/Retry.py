@@ -0,0 +1,271 @@
+"""
+SFDCFW.Retry
+~~~~~~~~~~~~
+"""
+
+import asyncio
+import random
+import time
+
+import requests
+from urllib3.exceptions import ConnectTimeoutError
+
+
+# The HTTP status code of a transient error
+RETRY_STATUS = (502, 503, 504)
+
+# The Salesforce error code of a transient error, in a REST error body
+# or a SOAP fault
+RETRY_ERROR_CODE = (
+    'UNABLE_TO_LOCK_ROW',
+    'REQUEST_LIMIT_EXCEEDED',
+    'SERVER_UNAVAILABLE'
+)
+
+# The exception of a transient error
+RETRY_EXCEPTION = (
+    requests.ConnectionError,
+    requests.Timeout
+)
+
+# The HTTP method safe to send again after any transient error
+IDEMPOTENT_METHOD = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+# The Salesforce error code proving the request was not applied, the
+# only error a non idempotent request (POST, PATCH) is retried on once
+# it may have reached the server
+NOT_APPLIED_ERROR_CODE = (
+    'UNABLE_TO_LOCK_ROW',
+    'REQUEST_LIMIT_EXCEEDED'
+)
+
+
+def backoff(poll=1, max_poll=30, factor=2, jitter=0.1):
+    """Exponential Backoff With Jitter
+
+    Args:
+        poll (float): The first delay in second
+        max_poll (float): The maximum delay in second
+        factor (float): The multiplier applied to the delay each time
+        jitter (float): The fraction of the delay to randomly add or remove
+
+    Yields:
+        The next delay in second
+    """
+
+    delay = poll
+    while True:
+        yield delay * random.uniform(1 - jitter, 1 + jitter)
+        delay = min(delay * factor, max_poll)
+
+
+class Retry:
+    """Retry class.
+
+    The retry policy for transient Salesforce error, with exponential
+    backoff, jitter and a maximum elapsed time.
+    """
+
+    def __init__(self,
+                 max_attempts=5,
+                 backoff=0.5,
+                 max_backoff=30,
+                 factor=2,
+                 jitter=0.1,
+                 max_elapsed=300,
+                 status=RETRY_STATUS,
+                 error_code=RETRY_ERROR_CODE,
+                 exception=RETRY_EXCEPTION):
+        """Constructor
+
+        Args:
+            max_attempts (int): The maximum number of attempt, including
+                the first
+            backoff (float): The first delay in second
+            max_backoff (float): The maximum delay in second
+            factor (float): The multiplier applied to the delay each retry
+            jitter (float): The fraction of the delay to randomly add or remove
+            max_elapsed (float): The maximum number of second to keep
+                retrying for, no retry start past it
+            status (tuple): The HTTP status code to retry
+            error_code (tuple): The Salesforce error code to retry
+            exception (tuple): The exception class to retry
+        """
+
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.factor = factor
+        self.jitter = jitter
+        self.max_elapsed = max_elapsed
+        self.status = tuple(status)
+        self.error_code = tuple(error_code)
+        self.exception = tuple(exception)
+
+
+    def delays(self):
+        """Delay Before Each Retry
+
+        Yields:
+            The number of second to wait before the next attempt, until
+            out of attempt or time
+        """
+
+        start = time.monotonic()
+        delay = backoff(self.backoff, self.max_backoff, self.factor, self.jitter)
+
+        for _ in range(self.max_attempts - 1):
+            wait = next(delay)
+
+            # Do not start a retry past the maximum elapsed time
+            if time.monotonic() - start + wait > self.max_elapsed:
+                return
+
+            yield wait
+
+
+    def retry_response(self, r, method=None):
+        """Check if the response is a transient error
+
+        A non idempotent request (POST, PATCH) may have been applied
+        before a 5xx, it is only retried on an error code proving it was
+        not.
+
+        Args:
+            r (requests.Response): The response of the request
+            method (str): The HTTP method of the request, every method is
+                treated as idempotent if not provided
+
+        Returns:
+            True if the request should be retried
+        """
+
+        if r.status_code < 400:
+            return False
+
+        if method is not None and method.upper() not in IDEMPOTENT_METHOD:
+            error_code = [code for code in self.error_code if code in NOT_APPLIED_ERROR_CODE]
+            return any(code.encode() in r.content for code in error_code)
+
+        if r.status_code in self.status:
+            return True
+
+        # Look for the error code in the error body
+        if self.error_code:
+            return any(code.encode() in r.content for code in self.error_code)
+
+        return False
+
+
+    def retry_exception(self, e, method=None):
+        """Check if the exception is a transient error
+
+        A non idempotent request (POST, PATCH) is only retried on an error
+        of the connect phase, before any byte was sent.
+
+        Args:
+            e (Exception): The exception raised by the call
+            method (str): The HTTP method of the request, every method is
+                treated as idempotent if not provided
+
+        Returns:
+            True if the call should be retried
+        """
+
+        if method is not None and method.upper() not in IDEMPOTENT_METHOD:
+            return isinstance(e, self.exception) and _connect_error(e)
+
+        if isinstance(e, self.exception):
+            return True
+
+        # The HTTP status of a zeep transport error
+        if getattr(e, 'status_code', None) in self.status:
+            return True
+
+        # The fault code and message of a zeep SOAP fault
+        fault = f"{getattr(e, 'code', '') or ''} {getattr(e, 'message', '') or ''}"
+
+        return any(code in fault for code in self.error_code)
+
+
+    def call(self, function, *args, **kwargs):
+        """Call With Retry
+
+        Args:
+            function (callable): The function to call
+            *args: The positional argument of the function
+            **kwargs: The keyword argument of the function
+
+        Returns:
+            The result of the function
+
+        Raises:
+            Exception: The error of the last attempt, or a permanent error
+        """
+
+        delay = self.delays()
+
+        while True:
+            try:
+                return function(*args, **kwargs)
+            except Exception as e:
+                if not self.retry_exception(e):
+                    raise
+
+                wait = next(delay, None)
+                if wait is None:
+                    raise
+
+            time.sleep(wait)
+
+
+    async def call_async(self, function, *args, **kwargs):
+        """Call A Coroutine Function With Retry
+
+        Args:
+            function (callable): The coroutine function to call
+            *args: The positional argument of the function
+            **kwargs: The keyword argument of the function
+
+        Returns:
+            The result of the function
+
+        Raises:
+            Exception: The error of the last attempt, or a permanent error
+        """
+
+        delay = self.delays()
+
+        while True:
+            try:
+                return await function(*args, **kwargs)
+            except Exception as e:
+                if not self.retry_exception(e):
+                    raise
+
+                wait = next(delay, None)
+                if wait is None:
+                    raise
+
+            # Wait without blocking the event loop
+            await asyncio.sleep(wait)
+
+
+def _connect_error(e):
+    """Check if the exception happened before the request was sent
+
+    Args:
+        e (Exception): The exception raised by the call
+
+    Returns:
+        True for a connect timeout or a refused connection
+    """
+
+    if isinstance(e, requests.ConnectTimeout):
+        return True
+
+    # The connection error wrap the urllib3 error, a refused or
+    # unresolved connection is a subclass of the connect timeout
+    reason = getattr(e.args[0], 'reason', e.args[0]) if e.args else None
+
+    return isinstance(reason, ConnectTimeoutError)
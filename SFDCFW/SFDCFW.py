@@ -3,10 +3,10 @@ SFDCFW.SFDCFW
 ~~~~~~~~~~~~~
 """
 
-from urllib.parse import urlparse
-
 from SFDCFW.Access import Access
+from SFDCFW.Retry import Retry
 from SFDCFW.Rest.SObject import SObject
+from SFDCFW.Transport import Transport
 
 from SFDCFW.Constant import SFDC_API_V
 
@@ -23,7 +23,21 @@ class SFDCFW(SObject):
                  version=SFDC_API_V,
                  domain='login',
                  wsdl=None,
-                 metadata=False):
+                 metadata=False,
+                 transport=None,
+                 pool_size=10,
+                 pool_block=False,
+                 keep_alive=True,
+                 max_retries=0,
+                 timeout=None,
+                 throttle=None,
+                 priority='normal',
+                 retry=None,
+                 token_store=None,
+                 describe_cache=None,
+                 read_cache=None,
+                 instrument=None,
+                 cassette=None):
         """Constructor
 
         Args:
@@ -36,29 +50,66 @@ class SFDCFW(SObject):
             domain (str): The common Salesforce domain for connection (login or test)
             wsdl (str): The path to the WSDL (Web Services Description Language) file
             metadata (bool): Whether or not this is for metadata
+            transport (Transport): The pooled HTTP transport to use, one is
+                created from the setting below if not provided
+            pool_size (int): The maximum number of connection to keep to the instance
+            pool_block (bool): Whether to block when there is no free connection
+            keep_alive (bool): Whether to keep the connection alive between request
+            max_retries (int): The number of connection level retry
+            timeout (float or tuple): The default (connect, read) timeout in seconds
+            throttle (Throttle): The throttle policy applied as the daily API
+                usage approach its limit
+            priority (str): The priority of the request (low, normal or high)
+            retry (Retry): The retry policy for transient error, the default
+                policy if not provided, `Retry(max_attempts=1)` to disable
+            token_store (TokenStore): The store checked for a valid token
+                before login, to skip repeated login
+            describe_cache (ResponseCache): The cache of the describe
+                result, use one with a `path` to keep it between run
+            read_cache (ResponseCache): The cache of the record read, used
+                for conditional read with ETag if provided
+            instrument (Instrument): The instrument receiving an event for
+                each call made through the transport
+            cassette (Cassette): The cassette to record the request to,
+                or to replay the response from
         """
 
-        # Create an instance of Access object and login
-        access = Access(username=username,
-                        password=password,
-                        security_token=security_token,
-                        client_id=client_id,
-                        client_secret=client_secret,
-                        version=version,
-                        domain=domain,
-                        wsdl=wsdl,
-                        metadata=metadata).login()
+        # Create the pooled transport shared by every call of this organization
+        if transport is None:
+            transport = Transport(pool_maxsize=pool_size,
+                                  pool_block=pool_block,
+                                  max_retries=max_retries,
+                                  keep_alive=keep_alive,
+                                  timeout=timeout,
+                                  throttle=throttle,
+                                  priority=priority,
+                                  retry=retry if retry is not None else Retry(),
+                                  instrument=instrument,
+                                  cassette=cassette)
+
+        # Create an instance of Access object
+        login = Access(username=username,
+                       password=password,
+                       security_token=security_token,
+                       client_id=client_id,
+                       client_secret=client_secret,
+                       version=version,
+                       domain=domain,
+                       wsdl=wsdl,
+                       metadata=metadata,
+                       transport=transport,
+                       token_store=token_store)
 
-        # Unpack the tuple for session ID / access token and server URL / instance URL
-        id_token, base_url = access
+        # Login
+        access = login.login()
 
-        # Parse the URL
-        u = urlparse(base_url)
-        self.base_url = f'{u.scheme}://{u.netloc}'
+        # Login again through the transport if the session expire
+        if access is not None:
+            transport.token = access[0]
+            transport.refresh = login.refresh
 
-        # Create REST header
-        self.header = {
-            'Authorization': f'Bearer {id_token}',
-            'Content-Type': 'application/json; charset=utf-8',
-            'Accept': 'application/json'
-        }
\ No newline at end of file
+        # Set up the REST base URL and header with the shared transport
+        super().__init__(access,
+                         transport=transport,
+                         describe_cache=describe_cache,
+                         read_cache=read_cache)
\ No newline at end of file
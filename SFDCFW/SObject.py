@@ -6,21 +6,25 @@ SFDCFW.Rest.SObject
 import json
 from urllib.parse import urlparse
 
-import requests
-
 from SFDCFW.Constant import SFDC_API_V
+from SFDCFW.Transport import Transport
 
 class SObject:
     """SObject class."""
 
-    def __init__(self, access):
+    def __init__(self, access, transport=None):
         """Constructor
 
         Args:
             access (tuple): The Salesforce session ID / access token and
                 server URL / instance URL tuple
+            transport (Transport): The pooled HTTP transport to share with
+                other REST class of the same organization
         """
 
+        # Use the shared transport, or create one for this instance
+        self.transport = transport if transport is not None else Transport()
+
         # Unpack the tuple for session ID / access token and server URL / instance URL
         self.id_token, self.base_url = access
         
@@ -66,9 +70,9 @@ class SObject:
         request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/sobjects/{self.label}'
 
         # Send the request
-        r = requests.post(url=request_url,
-                          headers=self.header,
-                          data=payload)
+        r = self.transport.post(url=request_url,
+                                headers=self.header,
+                                data=payload)
 
         # Check the status code
         if r.status_code == 201:
@@ -99,8 +103,8 @@ class SObject:
             request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/sobjects/{self.label}'
 
         # Send the request
-        r = requests.get(url=request_url,
-                         headers=self.header)
+        r = self.transport.get(url=request_url,
+                               headers=self.header)
 
         # Check the status code
         if r.status_code == 200:
@@ -126,9 +130,9 @@ class SObject:
         request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/sobjects/{self.label}/{id}'
 
         # Send the request
-        r = requests.patch(url=request_url,
-                           headers=self.header,
-                           data=payload)
+        r = self.transport.patch(url=request_url,
+                                 headers=self.header,
+                                 data=payload)
 
         # Check the status code
         if r.status_code == 204:
@@ -153,8 +157,8 @@ class SObject:
         request_url = f'{self.base_url}/services/data/v{SFDC_API_V}/sobjects/{self.label}/{id}'
 
         # Send the request
-        r = requests.delete(url=request_url,
-                            headers=self.header)
+        r = self.transport.delete(url=request_url,
+                                  headers=self.header)
 
         # Check the status code
         if r.status_code == 204:
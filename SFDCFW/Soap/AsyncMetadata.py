@@ -0,0 +1,285 @@
+"""
+Asynchronous Metadata API
+
+Metadata Coverage
+
+.. _Metadata Coverage:
+   https://developer.salesforce.com/docs/metadata-coverage/54
+"""
+
+import asyncio
+
+import httpx
+
+from SFDCFW.Constant import SFDC_API_V
+from SFDCFW.Exception import MetadataError
+from SFDCFW.Retry import RETRY_EXCEPTION, Retry
+from SFDCFW.Soap import Wsdl
+from SFDCFW.Soap.Metadata import RECORD_LIMIT
+
+
+class AsyncMetadata:
+    """Asynchronous Metadata class.
+
+    Every call is a coroutine sent through one pooled asynchronous HTTP
+    client, with at most `concurrency` call in flight. The read and
+    update are split into chunk of 10 component, and the `_iter` variant
+    yield each chunk as it finish.
+    """
+
+    def __init__(self, access, wsdl, cache_dir=None, client=None, concurrency=10, timeout=None, retry=None):
+        """Constructor
+
+        The WSDL is parsed (blocking) on construction, once per process.
+
+        Args:
+            access (tuple): The Salesforce session ID / access token and
+                server URL / instance URL tuple
+            wsdl (str): The path to the WSDL file
+            cache_dir (str): The directory of the on-disk parsed WSDL cache
+            client (httpx.AsyncClient): The asynchronous HTTP client to use,
+                one is created if not provided, the caller close the one
+                it provide
+            concurrency (int): The maximum number of call in flight
+            timeout (float): The request timeout in seconds
+            retry (Retry): The retry policy for transient error, the
+                default policy if not provided, `Retry(max_attempts=1)`
+                to disable
+        """
+
+        from zeep.proxy import AsyncServiceProxy
+
+        # Retry the transient error of each call, the connection error
+        # of the asynchronous client included
+        self.retry = retry if retry is not None else Retry(exception=RETRY_EXCEPTION + (httpx.TransportError,))
+
+        # Create the client with a connection pool sized to the concurrency,
+        # the client is closed with this instance only if it was created here
+        self.own_client = client is None
+        if client is None:
+            limits = httpx.Limits(max_connections=concurrency,
+                                  max_keepalive_connections=concurrency)
+            client = httpx.AsyncClient(limits=limits, timeout=timeout)
+        self.client = client
+
+        # Limit the number of call in flight
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+        # Unpack the tuple for session ID / access token and server URL / instance URL
+        self.id_token, self.url = access
+
+        # Create client from the cached WSDL, parsed once per process
+        self.zeep_transport = Wsdl.async_transport(self.client)
+        zeep_client = Wsdl.async_client(wsdl, cache_dir=cache_dir, transport=self.zeep_transport)
+        # Create the service with custom binding and URL, zeep only
+        # create a synchronous proxy for a custom binding
+        binding = zeep_client.wsdl.bindings["{http://soap.sforce.com/2006/04/metadata}MetadataBinding"]
+        self.service = AsyncServiceProxy(zeep_client, binding, address=self.url)
+
+        # Create the SOAP header (this is different than the HTTP header)
+        self.soap_header = {
+            "SessionHeader": {
+                "sessionId": self.id_token
+            }
+        }
+
+
+    async def _send(self, operation, **kwargs):
+        # Limit the number of call in flight, not held during the backoff
+        async with self.semaphore:
+            return await getattr(self.service, operation)(**kwargs)
+
+
+    async def _call(self, operation, **kwargs):
+        """Call a Metadata API Operation
+
+        Args:
+            operation (str): The name of the operation
+            **kwargs: The keyword argument of the operation
+
+        Returns:
+            The result of the operation
+        """
+
+        return await self.retry.call_async(self._send, operation, **kwargs)
+
+
+    async def _call_chunk_iter(self, operation, field, item, **kwargs):
+        """Call a Metadata API Operation Over Chunk Of Item
+
+        Args:
+            operation (str): The name of the operation
+            field (str): The name of the argument taking the chunk
+            item (list): The item to split into chunk
+            **kwargs: The other keyword argument of the operation
+
+        Yields:
+            The dictionary (`index`, `item`, `result`, `error`) of each
+            chunk, in the order they finish
+        """
+
+        # Create the chunk, each carry its own result and error
+        chunk_list = [{"index": index, "item": item[i : i + RECORD_LIMIT], "result": None, "error": None}
+                      for index, i in enumerate(range(0, len(item), RECORD_LIMIT))]
+
+        async def _run(chunk):
+            try:
+                chunk["result"] = list(await self._call(operation, **{field: chunk["item"]}, **kwargs) or [])
+            except Exception as e:
+                chunk["error"] = e
+            return chunk
+
+        # Start every chunk, the semaphore keep the call in flight bounded
+        task_list = [asyncio.ensure_future(_run(chunk)) for chunk in chunk_list]
+
+        try:
+            for future in asyncio.as_completed(task_list):
+                yield await future
+        finally:
+            # Cancel the chunk not finished if the caller stop early
+            for task in task_list:
+                task.cancel()
+
+
+    async def _call_chunk(self, operation, field, item, **kwargs):
+        """Call a Metadata API Operation Over Chunk Of Item
+
+        Args:
+            operation (str): The name of the operation
+            field (str): The name of the argument taking the chunk
+            item (list): The item to split into chunk
+            **kwargs: The other keyword argument of the operation
+
+        Returns:
+            A list of the result of every chunk, in the order of the item
+
+        Raises:
+            MetadataError: If a chunk failed, once every chunk finished
+        """
+
+        chunk_list = [chunk async for chunk in self._call_chunk_iter(operation, field, item, **kwargs)]
+        chunk_list.sort(key=lambda chunk: chunk["index"])
+
+        # Report every chunk, the caller keep the result that succeeded
+        if any(chunk["error"] is not None for chunk in chunk_list):
+            raise MetadataError(chunk_list)
+
+        return [result for chunk in chunk_list for result in chunk["result"]]
+
+
+    async def list_metadata(self, query):
+        """List Metadata
+
+        Args:
+            query (list): A complex list of dictionary specify components
+                [
+                    { "folder": "Report", "type": "ReportName" },
+                    { "type": "WorkflowRule" }
+                ]
+
+        Returns:
+            A complex list of dictionary for the requested metadata
+            component(s)
+        """
+
+        return await self._call("listMetadata",
+                                queries=query,
+                                asOfVersion=SFDC_API_V,
+                                _soapheaders=self.soap_header)
+
+
+    async def read_metadata(self, metadata_type, full_name):
+        """Read Metadata
+
+        Args:
+            metadata_type (str): The type of the metadata
+            full_name (list): A complex list of string for the full
+                name(s) of the metadata component
+
+        Returns:
+            A complex list of dictionary for the requested metadata
+            component(s), in the order of the full name
+
+        Raises:
+            MetadataError: If a chunk failed, with every chunk
+        """
+
+        return await self._call_chunk("readMetadata",
+                                      "fullNames",
+                                      list(full_name),
+                                      type=metadata_type,
+                                      _soapheaders=self.soap_header)
+
+
+    def read_metadata_iter(self, metadata_type, full_name):
+        """Read Metadata As Each Chunk Finish
+
+        Args:
+            metadata_type (str): The type of the metadata
+            full_name (list): A complex list of string for the full
+                name(s) of the metadata component
+
+        Returns:
+            An asynchronous iterator of the dictionary (`index`, `item`,
+            `result`, `error`) of each chunk of 10 component
+        """
+
+        return self._call_chunk_iter("readMetadata",
+                                     "fullNames",
+                                     list(full_name),
+                                     type=metadata_type,
+                                     _soapheaders=self.soap_header)
+
+
+    async def update_metadata(self, metadata):
+        """Update Metadata
+
+        Args:
+            metadata (list): A complex list of dictionary for metadata
+                component to update
+
+        Returns:
+            A complex list of dictionary for result of the metadata
+            component update, in the order of the metadata
+
+        Raises:
+            MetadataError: If a chunk failed, with every chunk
+        """
+
+        return await self._call_chunk("updateMetadata",
+                                      "metadata",
+                                      list(metadata),
+                                      _soapheaders=self.soap_header)
+
+
+    def update_metadata_iter(self, metadata):
+        """Update Metadata As Each Chunk Finish
+
+        Args:
+            metadata (list): A complex list of dictionary for metadata
+                component to update
+
+        Returns:
+            An asynchronous iterator of the dictionary (`index`, `item`,
+            `result`, `error`) of each chunk of 10 component
+        """
+
+        return self._call_chunk_iter("updateMetadata",
+                                     "metadata",
+                                     list(metadata),
+                                     _soapheaders=self.soap_header)
+
+
+    async def close(self):
+        """Close the client and all pooled connection, if created here."""
+        if self.own_client:
+            await self.client.aclose()
+        self.zeep_transport.wsdl_client.close()
+
+
+    async def __aenter__(self):
+        return self
+
+
+    async def __aexit__(self, *args):
+        await self.close()
@@ -6,17 +6,20 @@ class CustomField(Metadata):
     """Custom Field.
     """
 
-    def __init__(self, access, wsdl):
+    def __init__(self, access, wsdl, cache_dir=None, thread=20):
         """Constructor.
 
         Args:
             access (tuple): The Salesforce session ID / access token and server
                 URL / instance URL tuple.
             wsdl (str): The path to the WSDL file.
+            cache_dir (str): The directory of the on-disk parsed WSDL cache.
+            thread (int): The number of worker of the Metadata API thread
+                call.
         """
 
         # Use the Metadata API
-        self.metadata = Metadata(access, wsdl)
+        self.metadata = Metadata(access, wsdl, cache_dir=cache_dir, thread=thread)
 
     def toggle_lookup_filter_parallel(self, active, thread=20, process=10):
         """(De)Activate Lookup Filter(s) Parallel.
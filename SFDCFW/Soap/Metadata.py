@@ -7,36 +7,91 @@ Metadata Coverage
    https://developer.salesforce.com/docs/metadata-coverage/54
 """
 
+import contextlib
+import itertools
+import queue
 import threading
 import sys
+import warnings
 # import xml.etree.ElementTree as ET
-import requests
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
-from zeep import Client, Settings
+import requests
 
 from SFDCFW.Constant import SFDC_API_V
+from SFDCFW.Exception import MetadataError
+from SFDCFW.Instrument import SoapPlugin, instrument_call
+from SFDCFW.Retry import Retry
+from SFDCFW.Soap import Wsdl
+from SFDCFW.Transport import Transport
+
+
+# Maximum component per read and update call of the Metadata API
+RECORD_LIMIT = 10
+
 
 class Metadata:
-    """Metadata class."""
+    """Metadata class.
+
+    Each concurrent call take its own service proxy from a pool, so
+    worker do not contend on one client, and every proxy send through
+    one pooled keep-alive HTTP session.
+    """
 
-    def __init__(self, access, wsdl):
+    def __init__(self, access, wsdl, cache_dir=None, retry=None, instrument=None, transport=None, thread=10, refresh=None):
         """Constructor
 
         Args:
             access (tuple): The Salesforce session ID / access token and
                 server URL / instance URL tuple
             wsdl (str): The path to the WSDL file
+            cache_dir (str): The directory of the on-disk parsed WSDL cache
+            retry (Retry): The retry policy for transient error, the
+                default policy if not provided, `Retry(max_attempts=1)`
+                to disable
+            instrument (Instrument): The instrument receiving an event for
+                each call
+            transport (Transport): The pooled HTTP transport whose session
+                send the SOAP request, one sized to the thread is created
+                if not provided
+            thread (int): The number of worker of the thread call, shared
+                by every call, and the connection pool size of the created
+                transport
+            refresh (callable): The function to login again, returning the
+                session ID and metadata server URL tuple, or None if the
+                login failed, for the created transport (a provided
+                transport use its own)
         """
 
+        # Retry the transient error of each call
+        self.retry = retry if retry is not None else Retry()
+
+        # Measure the envelope and serialization of each call
+        self.instrument = instrument
+        self.plugin = SoapPlugin() if instrument is not None else None
+
         # Unpack the tuple for session ID / access token and server URL / instance URL
         self.id_token, self.url = access
 
-        # Create client with setting of disable strict mode, use recovery mode
-        setting = Settings(strict=False)
-        client = Client(wsdl, settings=setting)
-        # Create the service with custom binding and URL
-        binding = "{http://soap.sforce.com/2006/04/metadata}MetadataBinding"
-        self.service = client.create_service(binding, self.url)
+        # Keep a connection per worker, the transport is closed with this
+        # instance only if it was created here
+        self.thread = thread
+        self.own_transport = transport is None
+        self.transport = transport if transport is not None else Transport(pool_maxsize=thread, token=self.id_token, refresh=refresh)
+        # Send every SOAP request through the pooled session
+        self.zeep_transport = Wsdl.transport(self.transport.session)
+
+        self.wsdl = wsdl
+        self.cache_dir = cache_dir
+
+        # The idle service proxy, one is created for each concurrent call
+        self.service_pool = queue.LifoQueue()
+        self.service_size = 0
+        self.service_lock = threading.Lock()
+
+        # Create the first service, it fail early on an invalid WSDL
+        self.service = self._create_service()
+        self.service_pool.put(self.service)
 
         # Create the SOAP header (this is different than the HTTP header)
         self.soap_header = {
@@ -45,6 +100,247 @@ class Metadata:
             }
         }
 
+        # The worker pool of the thread call, sized to the thread, created
+        # on first use and reused by every call after
+        self.executor = None
+        # The number of thread call using the worker pool
+        self.active = 0
+        self.executor_condition = threading.Condition()
+
+
+    def close(self):
+        """Shut down the worker pool, and the transport if created here
+
+        Wait for the thread call in progress to finish first.
+        """
+
+        with self.executor_condition:
+            self.executor_condition.wait_for(lambda: self.active == 0)
+            executor, self.executor = self.executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+        if self.own_transport:
+            self.transport.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
+
+
+    def _create_service(self):
+        """Create A Service Proxy
+
+        Returns:
+            A `zeep.proxy.ServiceProxy` on its own client, sharing the
+            parsed WSDL and the transport
+        """
+
+        # Create client from the cached WSDL, parsed once per process
+        client = Wsdl.client(self.wsdl,
+                             cache_dir=self.cache_dir,
+                             transport=self.zeep_transport,
+                             plugins=[self.plugin] if self.plugin else None)
+        # Create the service with custom binding and URL
+        binding = "{http://soap.sforce.com/2006/04/metadata}MetadataBinding"
+
+        with self.service_lock:
+            self.service_size += 1
+
+        return client.create_service(binding, self.url)
+
+
+    @contextlib.contextmanager
+    def _service(self):
+        """Check Out A Service Proxy
+
+        Yields:
+            An idle service proxy, or a new one if all are in use, put
+            back in the pool once the call finish
+        """
+
+        try:
+            service = self.service_pool.get_nowait()
+        except queue.Empty:
+            service = self._create_service()
+
+        try:
+            yield service
+        finally:
+            self.service_pool.put(service)
+
+
+    @contextlib.contextmanager
+    def _worker(self):
+        """Use The Worker Pool
+
+        Yields:
+            The `concurrent.futures.ThreadPoolExecutor` of the instance,
+            not shut down until every call using it finish
+        """
+
+        with self.executor_condition:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.thread, thread_name_prefix="Metadata")
+            self.active += 1
+            executor = self.executor
+
+        try:
+            yield executor
+        finally:
+            with self.executor_condition:
+                self.active -= 1
+                self.executor_condition.notify_all()
+
+
+    def _call_chunk(self, operation, field, item, thread, callback=None, progress=None, **kwargs):
+        """Call a Metadata API Operation Over Chunk Of Item
+
+        Split the item into chunk of the record limit and call the
+        operation for each on the worker pool, with at most `thread`
+        chunk in flight. The callback and progress function are called
+        from the calling thread as each chunk finish.
+
+        Args:
+            operation (str): The name of the operation
+            field (str): The name of the argument taking the chunk
+            item (list): The item to split into chunk
+            thread (int): The maximum number of chunk in flight, capped with a
+                warning to the worker of the instance
+            callback (callable): The function called with the dictionary
+                (`index`, `item`, `result`, `error`) of each chunk
+            progress (callable): The function called with a dictionary of
+                the running count (`chunk`, `complete`, `component`,
+                `failed`) each time a chunk finish
+            **kwargs: The other keyword argument of the operation
+
+        Returns:
+            A list of the result of every chunk, in the order of the item
+
+        Raises:
+            MetadataError: If a chunk failed, once every chunk finished
+        """
+
+        # Create the chunk, each carry its own result and error
+        chunk_list = [{"index": index, "item": item[i : i + RECORD_LIMIT], "result": None, "error": None}
+                      for index, i in enumerate(range(0, len(item), RECORD_LIMIT))]
+
+        # Running count reported to the progress function
+        count = {"chunk": len(chunk_list), "complete": 0, "component": 0, "failed": 0}
+
+        # The worker pool is shared by every call, sized once
+        if thread > self.thread:
+            warnings.warn(f"{thread} thread requested, the worker pool has {self.thread}, "
+                          f"set `thread` on the constructor to use more", stacklevel=3)
+        thread = max(min(thread, self.thread), 1)
+        waiting = iter(chunk_list)
+        running = {}
+
+        def _submit(executor):
+            # Keep at most `thread` chunk in flight
+            for chunk in itertools.islice(waiting, thread - len(running)):
+                future = executor.submit(self._call, operation, **{field: chunk["item"]}, **kwargs)
+                running[future] = chunk
+
+        with self._worker() as executor:
+            _submit(executor)
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    chunk = running.pop(future)
+
+                    try:
+                        chunk["result"] = list(future.result() or [])
+                    except Exception as e:
+                        chunk["error"] = e
+                        count["failed"] += 1
+
+                    count["complete"] += 1
+                    count["component"] += len(chunk["item"])
+
+                    if callback is not None:
+                        callback(chunk)
+                    if progress is not None:
+                        progress(dict(count))
+
+                # Fill the free worker with the next chunk
+                _submit(executor)
+
+        # Report every chunk, the caller keep the result that succeeded
+        if any(chunk["error"] is not None for chunk in chunk_list):
+            raise MetadataError(chunk_list)
+
+        return [result for chunk in chunk_list for result in chunk["result"]]
+
+
+    def _call(self, operation, **kwargs):
+        """Call a Metadata API Operation
+
+        A call rejected for an expired session is replayed once with the
+        session ID of a single refresh of the transport, shared by every
+        concurrent call.
+
+        Args:
+            operation (str): The name of the operation
+            **kwargs: The keyword argument of the operation
+
+        Returns:
+            The result of the operation
+        """
+
+        # The session ID the call is sent with
+        session_id = self.soap_header["SessionHeader"]["sessionId"]
+
+        try:
+            return self._call_service(operation, **kwargs)
+        except Exception as e:
+            # Only an expired session can be fixed by a refresh
+            if not _session_expired(e) or self.transport.refresh is None:
+                raise
+
+            if not self.transport._refresh(session_id):
+                raise
+
+        # Replay with the new session ID
+        self.id_token = self.transport.token
+        self.soap_header["SessionHeader"]["sessionId"] = self.id_token
+
+        return self._call_service(operation, **kwargs)
+
+
+    def _call_service(self, operation, **kwargs):
+        """Call a Metadata API Operation On A Service Proxy
+
+        Args:
+            operation (str): The name of the operation
+            **kwargs: The keyword argument of the operation
+
+        Returns:
+            The result of the operation
+        """
+
+        with self._service() as service:
+            function = getattr(service, operation)
+
+            if self.instrument is None:
+                return self.retry.call(function, **kwargs)
+
+            # Retry and report the call to the instrument
+            return instrument_call(self.instrument,
+                                   self.plugin,
+                                   "metadata",
+                                   operation,
+                                   function,
+                                   self.retry,
+                                   **kwargs)
+
 
     def list_metadata(self, query):
         """List Metadata
@@ -61,9 +357,10 @@ class Metadata:
             component(s)
         """
 
-        return self.service.listMetadata(queries=query,
-                                         asOfVersion=SFDC_API_V,
-                                         _soapheaders=self.soap_header)
+        return self._call("listMetadata",
+                          queries=query,
+                          asOfVersion=SFDC_API_V,
+                          _soapheaders=self.soap_header)
 
 
     def read_metadata(self, metadata_type, full_name, thread=32):
@@ -89,94 +386,48 @@ class Metadata:
         # Loop through the full name list 10 records at a time
         for i in range(0, full_name_size, record_limit):
             # Make request(s) to read metadata, 10 at a time
-            read_result = self.service.readMetadata(type=metadata_type,
-                                                    fullNames=full_name[ i : i + record_limit ],
-                                                    _soapheaders=self.soap_header)
+            read_result = self._call("readMetadata",
+                                     type=metadata_type,
+                                     fullNames=full_name[ i : i + record_limit ],
+                                     _soapheaders=self.soap_header)
             # Add the current read result to all the read result
             read_result_all.extend(read_result)
 
         return read_result_all
 
 
-    def read_metadata_thread(self, metadata_type, full_name, thread=10):
+    def read_metadata_thread(self, metadata_type, full_name, thread=None, callback=None, progress=None):
         """Read Metadata
 
         Args:
             metadata_type (str): The type of the metadata
             full_name (list): A complex list of string for the full
                 name(s) of the metadata component
-            thread (int): The number of thread to use
+            thread (int): The number of thread to use, no more than the
+                worker of the instance (warned), all of them if not provided
+            callback (callable): The function called with the dictionary
+                (`index`, `item`, `result`, `error`) of each chunk of 10
+                component as it finish
+            progress (callable): The function called with a dictionary of
+                the running count (`chunk`, `complete`, `component`,
+                `failed`) each time a chunk finish
 
         Returns:
             A complex list of dictionary for the requested metadata
-            component(s)
-        """
+            component(s), in the order of the full name
 
-        def _read_metadata_thread(self, metadata_type, full_name):
-            """Read Metadata Thread Function
-
-            Args:
-                metadata_type (str): The type of the metadata
-                full_name (list): A complex list of string for the full
-                    name(s) of the metadata component
-            """
-            # Make request(s) to read metadata, 10 at a time
-            read_result = self.service.readMetadata(type=metadata_type,
-                                                    fullNames=full_name,
-                                                    _soapheaders=self.soap_header)
-
-            # Add the current read result to all the read result
-            read_result_all.extend(read_result)
-
-        # Create a new list to store all the read result
-        read_result_all = []
-        # Get the size of the full name list
-        full_name_size = len(full_name)
-        # Limit for the metadata API function
-        record_limit = 10
-
-        # Round the thread to multiple of 10
-        # thread_size = thread + (-thread) % 10
-        thread_size = thread
-        # Calculate the thread batch size based on metadata API limit
-        thread_batch_size = (full_name_size + (-full_name_size) % record_limit) // record_limit
-        # Check which is smaller, thread batch size or thread size
-        # Take the smaller of the two
-        thread_count = thread_batch_size if thread_batch_size < thread_size else thread_size
-        # Create a thread list
-        t_list = []
-
-        # Loop through the full name list
-        for i in range(0, thread_batch_size, thread_size):
-            # Account for last iteration, maximum thread (thread_size) not needed
-            if thread_batch_size - i < thread_size:
-                # Use only maximum thread needed
-                thread_count = thread_batch_size - i
-
-            # Loop through and execute the thread
-            for j in range(thread_count):
-                # Calculate full name start and end range
-                full_name_start = (j + i) * record_limit
-                # Calculate the precise end range for last iteration...
-                # Because I can...
-                if full_name_start + record_limit > full_name_size:
-                    full_name_end = full_name_start + thread_count
-                else:
-                    full_name_end = full_name_start + record_limit
-
-                # Create the thread
-                t = threading.Thread(target=_read_metadata_thread,
-                                     args=(self, metadata_type, full_name[ full_name_start : full_name_end ],))
-                # Add it to a thread list
-                t_list.append(t)
-                # Start the thread
-                t.start()
-
-            # Wait for all threads to finish
-            for t in t_list:
-                t.join()
+        Raises:
+            MetadataError: If a chunk failed, with every chunk
+        """
 
-        return read_result_all
+        return self._call_chunk("readMetadata",
+                                "fullNames",
+                                list(full_name),
+                                thread if thread is not None else self.thread,
+                                callback=callback,
+                                progress=progress,
+                                type=metadata_type,
+                                _soapheaders=self.soap_header)
 
 
     def update_metadata(self, metadata):
@@ -201,84 +452,56 @@ class Metadata:
         # Loop through the metadata list 10 records at a time
         for i in range(0, metadata_size, record_limit):
             # Make request(s) to update metadata, 10 at a time
-            update_result = self.service.updateMetadata(metadata=metadata[ i : i + record_limit ],
-                                                        _soapheaders=self.soap_header)
+            update_result = self._call("updateMetadata",
+                                       metadata=metadata[ i : i + record_limit ],
+                                       _soapheaders=self.soap_header)
             # Add the current update result to all the update result
             update_result_all.extend(update_result)
 
         return update_result_all
 
-    def update_metadata_thread(self, metadata, thread=10):
+    def update_metadata_thread(self, metadata, thread=None, callback=None, progress=None):
         """Update Metadata
 
         Args:
             metadata (list): A complex list of dictionary for metadata
                 component to update
-            thread (int): The number of thread to use
+            thread (int): The number of thread to use, no more than the
+                worker of the instance (warned), all of them if not provided
+            callback (callable): The function called with the dictionary
+                (`index`, `item`, `result`, `error`) of each chunk of 10
+                component as it finish
+            progress (callable): The function called with a dictionary of
+                the running count (`chunk`, `complete`, `component`,
+                `failed`) each time a chunk finish
 
         Returns:
             A complex list of dictionary for result of the metadata
-                component update
+                component update, in the order of the metadata
+
+        Raises:
+            MetadataError: If a chunk failed, with every chunk
         """
 
-        def _update_metadata_thread(self, metadata):
-            """Update Metadata
+        return self._call_chunk("updateMetadata",
+                                "metadata",
+                                list(metadata),
+                                thread if thread is not None else self.thread,
+                                callback=callback,
+                                progress=progress,
+                                _soapheaders=self.soap_header)
 
-            Args:
-                metadata (list): A complex list of dictionary for
-                    metadata component to update
 
-            Returns:
-                A complex list of dictionary for result of the metadata
-                    component update
-            """
+def _session_expired(e):
+    """Check if the call was rejected for an expired session
 
-            # Make request(s) to update metadata, 10 at a time
-            update_result = self.service.updateMetadata(metadata=metadata,
-                                                        _soapheaders=self.soap_header)
+    Args:
+        e (Exception): The exception raised by the call
 
-            # Add the current update result to all the update result
-            update_result_all.extend(update_result)
+    Returns:
+        True for a SOAP fault with INVALID_SESSION_ID
+    """
 
-        # Create a new list to store all the update result
-        update_result_all = []
-        # Get the size of the metadata list
-        metadata_size = len(metadata)
-        # Limit for the metadata API function
-        record_limit = 10
+    fault = f"{getattr(e, 'code', '') or ''} {getattr(e, 'message', '') or ''}"
 
-        # Thread size
-        thread_size = thread
-        # Calculate the thread batch size based on metadata API limit
-        thread_batch_size = (metadata_size + (-metadata_size) % record_limit) // record_limit
-        # Check which is smaller, thread batch size or thread size
-        # Take the smaller of the two
-        thread_count = thread_batch_size if thread_batch_size < thread_size else thread_size
-        # Create a thread list
-        t_list = []
-
-        # Loop through the metadata list
-        for i in range(0, thread_batch_size, thread_size):
-
-            # Account for last iteration, maximum thread (thread_size) not needed
-            if thread_batch_size - i < thread_size:
-                # Use only maximum thread needed
-                thread_count = thread_batch_size - i
-            
-            for j in range(thread_count):
-                # Calculate metadata start and end range
-                metadata_start = (j + i) * record_limit
-                metadata_end = metadata_start + record_limit
-                # Create the thread
-                t = threading.Thread(target=_update_metadata_thread,
-                                     args=(self, metadata[ metadata_start : metadata_end ],))
-                # Add it to a thread list
-                t_list.append(t)
-                # Start the thread
-                t.start()
-
-            # Wait for all threads to finish
-            for t in t_list:
-                t.join()
-
-        return update_result_all
\ No newline at end of file
+    return "INVALID_SESSION_ID" in fault
@@ -5,17 +5,20 @@ class WorkflowRule:
     """Workflow Rule.
     """
 
-    def __init__(self, access, wsdl):
+    def __init__(self, access, wsdl, cache_dir=None, thread=10):
         """Constructor.
 
         Args:
             access (tuple): The Salesforce session ID / access token and
                 server URL / instance URL tuple.
             wsdl (str): The path to the WSDL file.
+            cache_dir (str): The directory of the on-disk parsed WSDL cache.
+            thread (int): The number of worker of the Metadata API thread
+                call.
         """
 
         # Use the Metadata API
-        self.metadata = Metadata(access, wsdl)
+        self.metadata = Metadata(access, wsdl, cache_dir=cache_dir, thread=thread)
 
     def toggle_active(self, active, full_name=None):
         """(De)Activate specific Workflow Rule(s) for a given list of
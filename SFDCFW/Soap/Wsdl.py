@@ -0,0 +1,412 @@
+"""
+SFDCFW.Soap.Wsdl
+~~~~~~~~~~~~~~~~
+"""
+
+import hashlib
+import hmac
+import io
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import threading
+
+from SFDCFW.Constant import SFDC_API_V
+
+
+# The parsed WSDL, keyed by path, modification time and API version
+_document = {}
+# The lock for each key, so a WSDL is only parsed once at a time
+_key_lock = {}
+_lock = threading.Lock()
+
+# The default directory of the on-disk cache, disabled if not set
+CACHE_DIR = os.environ.get("SFDCFW_WSDL_CACHE")
+
+# The file of the per user key signing the on-disk cache, kept outside
+# the cache directory so a writer of a shared cache can not sign a file
+KEY_FILE = os.environ.get("SFDCFW_WSDL_CACHE_KEY",
+                          os.path.join(os.path.expanduser("~"), ".sfdcfw", "wsdl_cache.key"))
+
+# The key signing the on-disk cache, read once per process
+_sign_key_cache = {}
+
+# The recursion limit is process wide, only one pickle raise it at a time
+_recursion_lock = threading.Lock()
+
+
+def client(wsdl, version=SFDC_API_V, cache_dir=None, transport=None, plugins=None):
+    """Create a zeep Client from the cached WSDL
+
+    Args:
+        wsdl (str): The path to the WSDL file
+        version (str): The Salesforce version of the Application Programming Interface
+        cache_dir (str): The directory of the on-disk cache
+        transport (zeep.Transport): The transport used by the client
+        plugins (list): The zeep plugin of the client
+
+    Returns:
+        A `zeep.Client` sharing the parsed WSDL with every other client
+    """
+
+    from zeep import Client, Settings
+
+    # Create client with setting of disable strict mode, use recovery mode
+    setting = Settings(strict=False)
+
+    return Client(document(wsdl, version, cache_dir), transport=transport, plugins=plugins, settings=setting)
+
+
+def async_client(wsdl, version=SFDC_API_V, cache_dir=None, transport=None, plugins=None):
+    """Create a zeep AsyncClient from the cached WSDL
+
+    Args:
+        wsdl (str): The path to the WSDL file
+        version (str): The Salesforce version of the Application Programming Interface
+        cache_dir (str): The directory of the on-disk cache
+        transport (zeep.transports.AsyncTransport): The transport used by the client
+        plugins (list): The zeep plugin of the client
+
+    Returns:
+        A `zeep.AsyncClient` sharing the parsed WSDL with every other client
+    """
+
+    from zeep import AsyncClient, Settings
+
+    # Create client with setting of disable strict mode, use recovery mode
+    setting = Settings(strict=False)
+
+    return AsyncClient(document(wsdl, version, cache_dir), transport=transport, plugins=plugins, settings=setting)
+
+
+def transport(session):
+    """Create a zeep Transport sending through an existing session
+
+    Args:
+        session (requests.Session): The pooled session, shared with the
+            REST call of the organization
+
+    Returns:
+        A `zeep.transports.Transport` using the session
+    """
+
+    from zeep.transports import Transport
+
+    # zeep set its own User-Agent on the session, keep the original one
+    user_agent = session.headers.get("User-Agent")
+    zeep_transport = Transport(session=session)
+    if user_agent is not None:
+        session.headers["User-Agent"] = user_agent
+
+    return zeep_transport
+
+
+def async_transport(client):
+    """Create a zeep AsyncTransport sending through an existing client
+
+    Args:
+        client (httpx.AsyncClient): The pooled asynchronous HTTP client
+
+    Returns:
+        A `zeep.transports.AsyncTransport` using the client
+    """
+
+    import httpx
+    from zeep.transports import AsyncTransport
+
+    # zeep replace every header of the client, keep the original one
+    header = httpx.Headers(client.headers)
+    zeep_transport = AsyncTransport(client=client)
+    client.headers = header
+
+    return zeep_transport
+
+
+def document(wsdl, version=SFDC_API_V, cache_dir=None):
+    """Get the parsed WSDL
+
+    Look in the process memory, then the on-disk cache, and only parse
+    the WSDL if neither has it.
+
+    Args:
+        wsdl (str): The path to the WSDL file
+        version (str): The Salesforce version of the Application Programming Interface
+        cache_dir (str): The directory of the on-disk cache
+
+    Returns:
+        A `zeep.wsdl.Document` for the WSDL
+    """
+
+    key = _key(wsdl, version)
+
+    with _lock:
+        if key in _document:
+            return _document[key]
+        lock = _key_lock.setdefault(key, threading.Lock())
+
+    # Parse the WSDL once, other thread wait for the result
+    with lock:
+        if key in _document:
+            return _document[key]
+
+        cache_dir = cache_dir or CACHE_DIR
+        path = os.path.join(cache_dir, _file_name(key)) if cache_dir else None
+
+        wsdl_document = _read(path) if path else None
+        if wsdl_document is None:
+            wsdl_document = _parse(wsdl)
+            if path:
+                _write(wsdl_document, path)
+
+        with _lock:
+            _document[key] = wsdl_document
+
+    return wsdl_document
+
+
+def clear():
+    """Clear the in-memory cache"""
+
+    with _lock:
+        _document.clear()
+        _key_lock.clear()
+        _sign_key_cache.clear()
+
+
+def _key(wsdl, version):
+    """Create the cache key
+
+    Args:
+        wsdl (str): The path to the WSDL file
+        version (str): The Salesforce version of the Application Programming Interface
+
+    Returns:
+        A tuple of the WSDL path, modification time and API version
+    """
+
+    # A remote WSDL has no modification time
+    if os.path.exists(wsdl):
+        return (os.path.abspath(wsdl), os.stat(wsdl).st_mtime_ns, version)
+
+    return (wsdl, None, version)
+
+
+def _file_name(key):
+    """Create the file name in the on-disk cache
+
+    Args:
+        key (tuple): The cache key
+
+    Returns:
+        The file name, changing with the zeep version as well
+    """
+
+    import zeep
+
+    digest = hashlib.sha256(repr((key, zeep.__version__, sys.version_info[:2])).encode()).hexdigest()
+
+    return f"{digest}.pickle"
+
+
+def _parse(wsdl):
+    """Parse the WSDL
+
+    Args:
+        wsdl (str): The path to the WSDL file
+
+    Returns:
+        A `zeep.wsdl.Document` for the WSDL
+    """
+
+    from zeep import Settings
+    from zeep.transports import Transport
+    from zeep.wsdl import Document
+
+    return Document(wsdl, Transport(), settings=Settings(strict=False))
+
+
+def _read(path):
+    """Read the parsed WSDL from the on-disk cache
+
+    Args:
+        path (str): The path to the cache file
+
+    Returns:
+        A `zeep.wsdl.Document` for the WSDL, None if not cached or unreadable
+    """
+
+    from zeep.transports import Transport
+
+    key = _sign_key()
+    if key is None:
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            # Only trust a file of this user, signed with its key
+            if not _owned(os.fstat(f.fileno())):
+                raise ValueError("Not owned by the current user")
+            data = f.read()
+
+        signature, data = data[:hashlib.sha256().digest_size], data[hashlib.sha256().digest_size:]
+        if not hmac.compare_digest(signature, hmac.new(key, data, hashlib.sha256).digest()):
+            raise ValueError("Invalid signature")
+
+        wsdl_document = pickle.loads(data)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # A corrupt, incompatible or untrusted file, parse the WSDL again
+        logging.getLogger(__name__).warning("Ignore unreadable WSDL cache %s", path, exc_info=True)
+        return None
+
+    # The transport is not stored, give the document a new one
+    wsdl_document.transport = Transport()
+
+    return wsdl_document
+
+
+def _write(wsdl_document, path):
+    """Write the parsed WSDL to the on-disk cache
+
+    Args:
+        wsdl_document (zeep.wsdl.Document): The parsed WSDL
+        path (str): The path to the cache file
+    """
+
+    try:
+        key = _sign_key()
+        if key is None:
+            return
+
+        # The parsed WSDL is deeply nested, restore the limit before
+        # another thread raise it
+        with _recursion_lock:
+            recursion_limit = sys.getrecursionlimit()
+            sys.setrecursionlimit(max(recursion_limit, 50000))
+
+            try:
+                buffer = io.BytesIO()
+                _Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(wsdl_document)
+            finally:
+                sys.setrecursionlimit(recursion_limit)
+
+        data = buffer.getvalue()
+
+        # Write to a temporary file then rename, reader never see a partial file
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(hmac.new(key, data, hashlib.sha256).digest())
+            f.write(data)
+        os.replace(temp_path, path)
+    except Exception:
+        # The cache is optional, keep the in-memory copy only
+        logging.getLogger(__name__).warning("Unable to write WSDL cache %s", path, exc_info=True)
+
+
+def _sign_key():
+    """Get the key signing the on-disk cache
+
+    Create the key file with a random key on first use, readable by
+    the current user only.
+
+    Returns:
+        The key in bytes, None if the key file is not usable
+    """
+
+    path = os.path.abspath(KEY_FILE)
+
+    with _lock:
+        if path in _sign_key_cache:
+            return _sign_key_cache[path]
+
+    try:
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            pass
+        else:
+            with os.fdopen(fd, "wb") as f:
+                f.write(os.urandom(32))
+
+        with open(path, "rb") as f:
+            # A key other user can read or write sign nothing
+            stat = os.fstat(f.fileno())
+            if not _owned(stat) or stat.st_mode & 0o077:
+                raise ValueError("Key file not private to the current user")
+            key = f.read()
+
+        if len(key) < 32:
+            raise ValueError("Key file too short")
+    except Exception:
+        # The cache is optional, keep the in-memory copy only
+        logging.getLogger(__name__).warning("Disable WSDL disk cache, unusable key %s", path, exc_info=True)
+        key = None
+
+    with _lock:
+        _sign_key_cache[path] = key
+
+    return key
+
+
+def _owned(stat):
+    """Check if a file is owned by the current user
+
+    Args:
+        stat (os.stat_result): The status of the file
+
+    Returns:
+        True if owned by the current user, or there is no owner
+    """
+
+    return not hasattr(os, "getuid") or stat.st_uid == os.getuid()
+
+
+def _element(data):
+    """Rebuild an XML element
+
+    Args:
+        data (bytes): The serialized XML element
+
+    Returns:
+        A `lxml.etree._Element`
+    """
+
+    from lxml import etree
+
+    return etree.fromstring(data)
+
+
+class _Pickler(pickle.Pickler):
+    """Pickler for the part of a zeep Document pickle can not handle."""
+
+    def reducer_override(self, obj):
+        from lxml import etree
+        from zeep.transports import Transport
+
+        # The transport hold a session, give a new one on read
+        if isinstance(obj, Transport):
+            return (type(None), ())
+
+        # The thread local setting of zeep
+        if isinstance(obj, threading.local):
+            return (threading.local, ())
+
+        if isinstance(obj, etree.QName):
+            return (etree.QName, (obj.text,))
+
+        if isinstance(obj, etree._Element):
+            return (_element, (etree.tostring(obj),))
+
+        # The type zeep create on the fly for each XSD type
+        if isinstance(obj, type) and obj.__module__ in ("zeep.xsd.dynamic_types", "zeep.objects"):
+            attribute = {name: value for name, value in vars(obj).items()
+                         if name not in ("__dict__", "__weakref__")}
+            return (type, (obj.__name__, obj.__bases__, attribute))
+
+        return NotImplemented
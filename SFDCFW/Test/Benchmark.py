@@ -0,0 +1,355 @@
+"""
+SFDCFW.Test.Benchmark
+~~~~~~~~~~~~~~~~~~~~~
+
+Benchmark the framework against the in-process fake Salesforce server,
+without touching a real organization::
+
+    python -m SFDCFW.Test.Benchmark --latency 0.02 --iteration 20
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+
+from SFDCFW.Access import Access
+from SFDCFW.Rest.Bulk import Bulk
+from SFDCFW.Rest.Query import Query
+from SFDCFW.Rest.SObject import SObject
+from SFDCFW.Retry import Retry
+from SFDCFW.Soap.Metadata import Metadata
+from SFDCFW.Test.FakeSalesforce import FakeSalesforce
+from SFDCFW.Transport import Transport
+
+
+# Every scenario, in the order they are run
+SCENARIO = (
+    'login',
+    'crud',
+    'query',
+    'bulk_upload',
+    'bulk_query',
+    'metadata_read',
+    'metadata_read_thread',
+    'metadata_update'
+)
+
+
+class Measure:
+    """Measure class.
+
+    The latency of each unit of work of a scenario, and the number of
+    item (record, component or call) processed.
+    """
+
+    def __init__(self, name):
+        """Constructor
+
+        Args:
+            name (str): The name of the measure
+        """
+
+        self.name = name
+        self.latency_list = []
+        self.item = 0
+
+
+    def time(self, function, *args, item=1, **kwargs):
+        """Time A Unit Of Work
+
+        Args:
+            function (callable): The function doing the work
+            *args: The positional argument of the function
+            item (int or callable): The number of item processed, or a
+                function called with the result to count them
+            **kwargs: The keyword argument of the function
+
+        Returns:
+            The result of the function
+        """
+
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        self.latency_list.append(time.perf_counter() - start)
+
+        self.item += item(result) if callable(item) else item
+
+        return result
+
+
+    def report(self):
+        """Report
+
+        Returns:
+            A dictionary with the `name`, `unit`, `item`, `elapsed`
+            (second), `throughput` (item per second), `p50` and `p99`
+            (second per unit)
+        """
+
+        elapsed = sum(self.latency_list)
+
+        return {
+            'name': self.name,
+            'unit': len(self.latency_list),
+            'item': self.item,
+            'elapsed': elapsed,
+            'throughput': self.item / elapsed if elapsed else None,
+            'p50': percentile(self.latency_list, 0.50),
+            'p99': percentile(self.latency_list, 0.99)
+        }
+
+
+def percentile(latency_list, q):
+    """Get A Percentile With The Nearest Rank Method
+
+    Args:
+        latency_list (list): The latency of each unit
+        q (float): The percentile between 0 and 1
+
+    Returns:
+        The latency at the percentile, None if there is none
+    """
+
+    if not latency_list:
+        return None
+
+    latency_list = sorted(latency_list)
+    rank = max(math.ceil(q * len(latency_list)), 1)
+
+    return latency_list[rank - 1]
+
+
+def bench_login(server, transport, iteration, **kwargs):
+    """Login with OAuth username-password flow and SOAP"""
+
+    rest_measure = Measure('login_rest')
+    soap_measure = Measure('login_soap')
+
+    rest_access = Access(username='user@example.com',
+                         password='password',
+                         security_token='token',
+                         client_id='client',
+                         client_secret='secret',
+                         transport=transport)
+    # Point the OAuth endpoint to the fake server
+    rest_access.rest_url = f'{server.url}/services/oauth2/token'
+
+    soap_access = Access(username='user@example.com',
+                         password='password',
+                         security_token='token',
+                         wsdl=server.partner_wsdl,
+                         metadata=True,
+                         transport=transport)
+
+    for _ in range(iteration):
+        rest_measure.time(rest_access.login)
+        soap_measure.time(soap_access.login)
+
+    return [rest_measure, soap_measure]
+
+
+def bench_crud(server, transport, iteration, **kwargs):
+    """Create, read, update and delete a single record"""
+
+    measure = {name: Measure(f'crud_{name}') for name in ('create', 'read', 'update', 'delete')}
+    sobject = SObject(server.access, transport=transport)
+
+    for i in range(iteration):
+        id = measure['create'].time(sobject.Account.create, json.dumps({'Name': f'Account {i}'}))
+        measure['read'].time(sobject.Account.read, id)
+        measure['update'].time(sobject.Account.update, id, json.dumps({'Name': f'Account {i} Updated'}))
+        measure['delete'].time(sobject.Account.delete, id)
+
+    return list(measure.values())
+
+
+def bench_query(server, transport, iteration, record, **kwargs):
+    """Query every record, following the `nextRecordsUrl` of each page"""
+
+    measure = Measure('query')
+    query = Query(server.access, transport=transport)
+
+    server.seed('Contact', record)
+
+    for _ in range(iteration):
+        measure.time(lambda: sum(1 for _ in query.query_iter('SELECT Id, Name FROM Contact')), item=lambda size: size)
+
+    return [measure]
+
+
+def bench_bulk_upload(server, transport, iteration, record, thread, **kwargs):
+    """Insert record with Bulk API 2.0 ingest job"""
+
+    measure = Measure('bulk_upload')
+    bulk = Bulk(server.access, transport=transport)
+
+    for i in range(iteration):
+        data = ({'Name': f'Lead {i} {j}', 'Company': 'Example'} for j in range(record))
+        measure.time(bulk.ingest,
+                     'Lead',
+                     'insert',
+                     data,
+                     batch_limit=max(record // thread, 1),
+                     concurrency=thread,
+                     poll=0.01,
+                     item=lambda status_list: sum(status['numberRecordsProcessed'] for status in status_list))
+
+    return [measure]
+
+
+def bench_bulk_query(server, transport, iteration, record, **kwargs):
+    """Query every record with a Bulk API 2.0 query job"""
+
+    measure = Measure('bulk_query')
+    bulk = Bulk(server.access, transport=transport)
+
+    if not server.record.get('Contact'):
+        server.seed('Contact', record)
+
+    for _ in range(iteration):
+        measure.time(lambda: sum(1 for _ in bulk.query_job('SELECT Id, Name FROM Contact', poll=0.01)),
+                     item=lambda size: size)
+
+    return [measure]
+
+
+def bench_metadata_read(server, iteration, component, **kwargs):
+    """Read metadata component, ten per call"""
+
+    measure = Measure('metadata_read')
+    metadata = Metadata(server.metadata_access, server.metadata_wsdl)
+
+    full_name_list = server.seed_metadata('WorkflowRule', component, active=False)
+
+    for _ in range(iteration):
+        measure.time(metadata.read_metadata, 'WorkflowRule', full_name_list, item=len)
+
+    return [measure]
+
+
+def bench_metadata_read_thread(server, iteration, component, thread, **kwargs):
+    """Read metadata component, ten per call over worker thread"""
+
+    measure = Measure('metadata_read_thread')
+    full_name_list = server.seed_metadata('WorkflowRule', component, active=False)
+
+    with Metadata(server.metadata_access, server.metadata_wsdl) as metadata:
+        for _ in range(iteration):
+            measure.time(metadata.read_metadata_thread, 'WorkflowRule', full_name_list, thread=thread, item=len)
+
+    return [measure]
+
+
+def bench_metadata_update(server, iteration, component, **kwargs):
+    """Update metadata component, ten per call"""
+
+    measure = Measure('metadata_update')
+    metadata = Metadata(server.metadata_access, server.metadata_wsdl)
+
+    full_name_list = server.seed_metadata('WorkflowRule', component, active=False)
+    record_list = metadata.read_metadata('WorkflowRule', full_name_list)
+
+    for i in range(iteration):
+        for record in record_list:
+            record['active'] = bool(i % 2)
+        measure.time(metadata.update_metadata, record_list, item=len)
+
+    return [measure]
+
+
+def run(server, scenario=SCENARIO, iteration=10, record=5000, component=100, thread=4):
+    """Run The Benchmark
+
+    Args:
+        server (FakeSalesforce): The started fake Salesforce server
+        scenario (iterable): The name of each scenario to run
+        iteration (int): The number of time each scenario is repeated
+        record (int): The number of record of the query and Bulk scenario
+        component (int): The number of metadata component
+        thread (int): The number of connection and concurrent Bulk job
+
+    Returns:
+        A list of dictionary for the report of each measure
+    """
+
+    report_list = []
+
+    with Transport(pool_maxsize=thread, retry=Retry()) as transport:
+        for name in scenario:
+            bench = getattr(sys.modules[__name__], f'bench_{name}')
+            for measure in bench(server,
+                                 transport=transport,
+                                 iteration=iteration,
+                                 record=record,
+                                 component=component,
+                                 thread=thread):
+                report_list.append(measure.report())
+
+    return report_list
+
+
+def format_report(report_list):
+    """Format The Report As A Table
+
+    Args:
+        report_list (list): The report of each measure
+
+    Returns:
+        A string with a row for each measure
+    """
+
+    line_list = [f'{"measure":<20} {"unit":>6} {"item":>9} {"elapsed s":>10} {"item/s":>10} {"p50 ms":>9} {"p99 ms":>9}']
+
+    for report in report_list:
+        line_list.append(f'{report["name"]:<20} '
+                         f'{report["unit"]:>6} '
+                         f'{report["item"]:>9} '
+                         f'{report["elapsed"]:>10.3f} '
+                         f'{report["throughput"] or 0:>10.1f} '
+                         f'{(report["p50"] or 0) * 1000:>9.2f} '
+                         f'{(report["p99"] or 0) * 1000:>9.2f}')
+
+    return '\n'.join(line_list)
+
+
+def main(argv=None):
+    """Run the benchmark from the command line
+
+    Args:
+        argv (list): The command line argument, `sys.argv` if not provided
+
+    Returns:
+        A list of dictionary for the report of each measure
+    """
+
+    parser = argparse.ArgumentParser(description='Benchmark SFDCFW against a fake Salesforce server.')
+    parser.add_argument('--latency', type=float, default=0.0, help='second injected before each response')
+    parser.add_argument('--page-size', type=int, default=2000, help='record per query page')
+    parser.add_argument('--iteration', type=int, default=10, help='repetition of each scenario')
+    parser.add_argument('--record', type=int, default=5000, help='record of the query and Bulk scenario')
+    parser.add_argument('--component', type=int, default=100, help='metadata component to read and update')
+    parser.add_argument('--thread', type=int, default=4, help='connection and concurrent Bulk job')
+    parser.add_argument('--scenario', nargs='+', choices=SCENARIO, default=SCENARIO, help='scenario to run')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    argument = parser.parse_args(argv)
+
+    with FakeSalesforce(latency=argument.latency, page_size=argument.page_size) as server:
+        report_list = run(server,
+                          scenario=argument.scenario,
+                          iteration=argument.iteration,
+                          record=argument.record,
+                          component=argument.component,
+                          thread=argument.thread)
+
+    if argument.json:
+        print(json.dumps(report_list, indent=2))
+    else:
+        print(format_report(report_list))
+
+    return report_list
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,1042 @@
+"""
+SFDCFW.Test.FakeSalesforce
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import csv
+import io
+import itertools
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, parse_qsl, urlparse
+from xml.sax.saxutils import escape
+
+from SFDCFW.Constant import SFDC_API_V
+
+
+# A minimal Partner API WSDL with the login operation
+PARTNER_WSDL = '''<?xml version="1.0" encoding="UTF-8"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+             xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+             xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+             xmlns:tns="urn:partner.soap.sforce.com"
+             targetNamespace="urn:partner.soap.sforce.com">
+  <types>
+    <xsd:schema targetNamespace="urn:partner.soap.sforce.com" elementFormDefault="qualified">
+      <xsd:complexType name="GetUserInfoResult">
+        <xsd:sequence>
+          <xsd:element name="organizationId" type="xsd:string"/>
+          <xsd:element name="sessionSecondsValid" type="xsd:int"/>
+          <xsd:element name="userId" type="xsd:string"/>
+          <xsd:element name="userName" type="xsd:string"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:complexType name="LoginResult">
+        <xsd:sequence>
+          <xsd:element name="metadataServerUrl" type="xsd:string" nillable="true"/>
+          <xsd:element name="passwordExpired" type="xsd:boolean"/>
+          <xsd:element name="sandbox" type="xsd:boolean"/>
+          <xsd:element name="serverUrl" type="xsd:string" nillable="true"/>
+          <xsd:element name="sessionId" type="xsd:string" nillable="true"/>
+          <xsd:element name="userId" type="xsd:string" nillable="true"/>
+          <xsd:element name="userInfo" type="tns:GetUserInfoResult" minOccurs="0"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:element name="login">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="username" type="xsd:string"/>
+            <xsd:element name="password" type="xsd:string"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="loginResponse">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="result" type="tns:LoginResult"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+    </xsd:schema>
+  </types>
+  <message name="loginRequest">
+    <part name="parameters" element="tns:login"/>
+  </message>
+  <message name="loginResponse">
+    <part name="parameters" element="tns:loginResponse"/>
+  </message>
+  <portType name="Soap">
+    <operation name="login">
+      <input message="tns:loginRequest"/>
+      <output message="tns:loginResponse"/>
+    </operation>
+  </portType>
+  <binding name="SoapBinding" type="tns:Soap">
+    <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+    <operation name="login">
+      <soap:operation soapAction=""/>
+      <input>
+        <soap:body use="literal" parts="parameters"/>
+      </input>
+      <output>
+        <soap:body use="literal"/>
+      </output>
+    </operation>
+  </binding>
+  <service name="SforceService">
+    <port binding="tns:SoapBinding" name="Soap">
+      <soap:address location="{url}/services/Soap/u/{version}"/>
+    </port>
+  </service>
+</definitions>
+'''
+
+# A minimal Metadata API WSDL with the list, read and update operation
+METADATA_WSDL = '''<?xml version="1.0" encoding="UTF-8"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+             xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+             xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+             xmlns:tns="http://soap.sforce.com/2006/04/metadata"
+             targetNamespace="http://soap.sforce.com/2006/04/metadata">
+  <types>
+    <xsd:schema targetNamespace="http://soap.sforce.com/2006/04/metadata" elementFormDefault="qualified">
+      <xsd:complexType name="Metadata">
+        <xsd:sequence>
+          <xsd:element name="fullName" type="xsd:string" minOccurs="0"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:complexType name="WorkflowRule">
+        <xsd:complexContent>
+          <xsd:extension base="tns:Metadata">
+            <xsd:sequence>
+              <xsd:element name="active" type="xsd:boolean"/>
+              <xsd:element name="description" type="xsd:string" minOccurs="0"/>
+            </xsd:sequence>
+          </xsd:extension>
+        </xsd:complexContent>
+      </xsd:complexType>
+      <xsd:complexType name="ListMetadataQuery">
+        <xsd:sequence>
+          <xsd:element name="folder" type="xsd:string" minOccurs="0"/>
+          <xsd:element name="type" type="xsd:string"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:complexType name="FileProperties">
+        <xsd:sequence>
+          <xsd:element name="fullName" type="xsd:string"/>
+          <xsd:element name="type" type="xsd:string"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:complexType name="ReadResult">
+        <xsd:sequence>
+          <xsd:element name="records" type="tns:Metadata" minOccurs="0" maxOccurs="unbounded"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:complexType name="Error">
+        <xsd:sequence>
+          <xsd:element name="message" type="xsd:string"/>
+          <xsd:element name="statusCode" type="xsd:string"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:complexType name="SaveResult">
+        <xsd:sequence>
+          <xsd:element name="errors" type="tns:Error" minOccurs="0" maxOccurs="unbounded"/>
+          <xsd:element name="fullName" type="xsd:string"/>
+          <xsd:element name="success" type="xsd:boolean"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:element name="listMetadata">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="queries" type="tns:ListMetadataQuery" minOccurs="0" maxOccurs="unbounded"/>
+            <xsd:element name="asOfVersion" type="xsd:double" minOccurs="0"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="listMetadataResponse">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="result" type="tns:FileProperties" minOccurs="0" maxOccurs="unbounded"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="readMetadata">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="type" type="xsd:string"/>
+            <xsd:element name="fullNames" type="xsd:string" minOccurs="0" maxOccurs="unbounded"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="readMetadataResponse">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="result" type="tns:ReadResult"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="updateMetadata">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="metadata" type="tns:Metadata" minOccurs="0" maxOccurs="unbounded"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="updateMetadataResponse">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="result" type="tns:SaveResult" minOccurs="0" maxOccurs="unbounded"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="SessionHeader">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="sessionId" type="xsd:string"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+    </xsd:schema>
+  </types>
+  <message name="Header">
+    <part name="SessionHeader" element="tns:SessionHeader"/>
+  </message>
+  <message name="listMetadataRequest">
+    <part name="parameters" element="tns:listMetadata"/>
+  </message>
+  <message name="listMetadataResponse">
+    <part name="parameters" element="tns:listMetadataResponse"/>
+  </message>
+  <message name="readMetadataRequest">
+    <part name="parameters" element="tns:readMetadata"/>
+  </message>
+  <message name="readMetadataResponse">
+    <part name="parameters" element="tns:readMetadataResponse"/>
+  </message>
+  <message name="updateMetadataRequest">
+    <part name="parameters" element="tns:updateMetadata"/>
+  </message>
+  <message name="updateMetadataResponse">
+    <part name="parameters" element="tns:updateMetadataResponse"/>
+  </message>
+  <portType name="MetadataPortType">
+    <operation name="listMetadata">
+      <input message="tns:listMetadataRequest"/>
+      <output message="tns:listMetadataResponse"/>
+    </operation>
+    <operation name="readMetadata">
+      <input message="tns:readMetadataRequest"/>
+      <output message="tns:readMetadataResponse"/>
+    </operation>
+    <operation name="updateMetadata">
+      <input message="tns:updateMetadataRequest"/>
+      <output message="tns:updateMetadataResponse"/>
+    </operation>
+  </portType>
+  <binding name="MetadataBinding" type="tns:MetadataPortType">
+    <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+    <operation name="listMetadata">
+      <soap:operation soapAction=""/>
+      <input>
+        <soap:header use="literal" part="SessionHeader" message="tns:Header"/>
+        <soap:body use="literal" parts="parameters"/>
+      </input>
+      <output>
+        <soap:body use="literal"/>
+      </output>
+    </operation>
+    <operation name="readMetadata">
+      <soap:operation soapAction=""/>
+      <input>
+        <soap:header use="literal" part="SessionHeader" message="tns:Header"/>
+        <soap:body use="literal" parts="parameters"/>
+      </input>
+      <output>
+        <soap:body use="literal"/>
+      </output>
+    </operation>
+    <operation name="updateMetadata">
+      <soap:operation soapAction=""/>
+      <input>
+        <soap:header use="literal" part="SessionHeader" message="tns:Header"/>
+        <soap:body use="literal" parts="parameters"/>
+      </input>
+      <output>
+        <soap:body use="literal"/>
+      </output>
+    </operation>
+  </binding>
+  <service name="MetadataService">
+    <port binding="tns:MetadataBinding" name="Metadata">
+      <soap:address location="{url}/services/Soap/m/{version}"/>
+    </port>
+  </service>
+</definitions>
+'''
+
+# The namespace of the SOAP message
+SOAP_ENVELOPE_NS = 'http://schemas.xmlsoap.org/soap/envelope/'
+PARTNER_NS = 'urn:partner.soap.sforce.com'
+METADATA_NS = 'http://soap.sforce.com/2006/04/metadata'
+XSI_NS = 'http://www.w3.org/2001/XMLSchema-instance'
+
+# The organization ID of the fake organization
+ORGANIZATION_ID = '00D000000000001AAA'
+
+# The maximum number of component per Metadata API read or update call
+METADATA_LIMIT = 10
+
+
+class FakeSalesforce:
+    """Fake Salesforce class.
+
+    An in-process stand-in for the OAuth, SOAP login, sobjects,
+    composite, query, Bulk API 2.0 and Metadata API endpoint, answering
+    from an in-memory store. Every request wait for the injected
+    `latency` before being answered, so the client concurrency behave
+    as it would against a remote organization.
+    """
+
+    def __init__(self, latency=0, page_size=2000, api_limit=15000):
+        """Constructor
+
+        Args:
+            latency (float): The number of second to wait before
+                answering each request
+            page_size (int): The number of record per query page
+            api_limit (int): The daily API request limit reported in the
+                Sforce-Limit-Info header
+        """
+
+        self.latency = latency
+        self.page_size = page_size
+        self.api_limit = api_limit
+        self.token = 'FAKE_SESSION_ID'
+
+        # The record of each SObject, keyed by ID
+        self.record = {}
+        # The metadata component of each type, keyed by full name
+        self.metadata = {}
+        # The Bulk API 2.0 job, keyed by ID
+        self.job = {}
+        # The open query cursor, keyed by ID
+        self.cursor = {}
+
+        self.counter = itertools.count(1)
+        self.request_count = 0
+        self.lock = threading.Lock()
+
+        self.server = None
+        self.thread = None
+        self.directory = None
+        self.url = None
+        self.partner_wsdl = None
+        self.metadata_wsdl = None
+
+
+    def start(self):
+        """Start the server on a random local port
+
+        Returns:
+            The `FakeSalesforce` instance
+        """
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeSalesforceHandler)
+        self.server.daemon_threads = True
+        self.server.salesforce = self
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+
+        # Write the WSDL pointing to this server
+        self.directory = tempfile.TemporaryDirectory()
+        self.partner_wsdl = self._write_wsdl('partner.wsdl', PARTNER_WSDL)
+        self.metadata_wsdl = self._write_wsdl('metadata.wsdl', METADATA_WSDL)
+
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        return self
+
+
+    def stop(self):
+        """Stop the server"""
+
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.thread.join()
+            self.server = None
+
+        if self.directory is not None:
+            self.directory.cleanup()
+            self.directory = None
+
+
+    def __enter__(self):
+        return self.start()
+
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+    @property
+    def access(self):
+        """The session ID and instance URL tuple, as returned by a login"""
+
+        return (self.token, self.url)
+
+
+    @property
+    def metadata_access(self):
+        """The session ID and metadata server URL tuple, as returned by a SOAP login"""
+
+        return (self.token, f'{self.url}/services/Soap/m/{SFDC_API_V}/{ORGANIZATION_ID[:15]}')
+
+
+    def seed(self, label, size, **field):
+        """Create Record In The Store
+
+        Args:
+            label (str): The SObject label
+            size (int): The number of record to create
+            **field: The field value of every record
+
+        Returns:
+            A list of string for the ID of each record
+        """
+
+        return [self.insert(label, dict(field, Name=f'{label} {i}')) for i in range(size)]
+
+
+    def seed_metadata(self, metadata_type, size, **field):
+        """Create Metadata Component In The Store
+
+        Args:
+            metadata_type (str): The type of the metadata
+            size (int): The number of component to create
+            **field: The field value of every component
+
+        Returns:
+            A list of string for the full name of each component
+        """
+
+        full_name_list = [f'Account.{metadata_type}{i}' for i in range(size)]
+
+        with self.lock:
+            component = self.metadata.setdefault(metadata_type, {})
+            for full_name in full_name_list:
+                component[full_name] = dict(field, fullName=full_name)
+
+        return full_name_list
+
+
+    def insert(self, label, record):
+        """Insert A Record
+
+        Args:
+            label (str): The SObject label
+            record (dict): The field of the record
+
+        Returns:
+            A string for the ID of the record
+        """
+
+        with self.lock:
+            id = f'001{next(self.counter):012d}AAA'
+            self.record.setdefault(label, {})[id] = dict(record, Id=id)
+
+        return id
+
+
+    def _write_wsdl(self, name, wsdl):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as f:
+            f.write(wsdl.replace('{url}', self.url).replace('{version}', SFDC_API_V))
+        return path
+
+
+class FakeSalesforceHandler(BaseHTTPRequestHandler):
+    """Handler routing each request to the fake endpoint."""
+
+    # Keep the connection open between request
+    protocol_version = 'HTTP/1.1'
+
+    # Send the header and body without waiting for the client ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+    def log_message(self, *args):
+        pass
+
+
+    def _handle(self, method):
+        salesforce = self.server.salesforce
+        body = self._read_body()
+
+        # The round trip to a remote organization
+        if salesforce.latency:
+            time.sleep(salesforce.latency)
+
+        with salesforce.lock:
+            salesforce.request_count += 1
+
+        url = urlparse(self.path)
+        path = url.path
+        query = dict(parse_qsl(url.query))
+
+        if path == '/services/oauth2/token' and method == 'POST':
+            return self._oauth(body)
+
+        if path.startswith('/services/Soap/u/') and method == 'POST':
+            return self._soap_login(body)
+
+        if path.startswith('/services/Soap/m/') and method == 'POST':
+            return self._soap_metadata(body)
+
+        match = re.match(r'^/services/data/v[\d.]+(/.*)$', path)
+        if match is None:
+            return self._json(404, [{'errorCode': 'NOT_FOUND', 'message': 'The requested resource does not exist'}])
+
+        # Reject a request without the current session
+        if self.headers.get('Authorization') != f'Bearer {salesforce.token}':
+            return self._json(401, [{'errorCode': 'INVALID_SESSION_ID', 'message': 'Session expired or invalid'}])
+
+        segment = match.group(1).strip('/').split('/')
+
+        if segment[0] == 'sobjects':
+            return self._sobject(method, segment[1:], body)
+
+        if segment[:2] == ['composite', 'sobjects']:
+            return self._composite(method, segment[2:], body, query)
+
+        if segment[0] == 'query':
+            return self._query(segment[1:], query)
+
+        if segment[:2] == ['jobs', 'ingest']:
+            return self._ingest(method, segment[2:], body)
+
+        if segment[:2] == ['jobs', 'query']:
+            return self._bulk_query(method, segment[2:], body, query)
+
+        return self._json(404, [{'errorCode': 'NOT_FOUND', 'message': 'The requested resource does not exist'}])
+
+
+    def _read_body(self):
+        # Read a chunked upload chunk by chunk
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            chunk_list = []
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                chunk_list.append(self.rfile.read(size))
+                self.rfile.readline()
+                if size == 0:
+                    return b''.join(chunk_list)
+
+        return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+
+    def _send(self, status, body=b'', content_type='application/json', header=None):
+        salesforce = self.server.salesforce
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Sforce-Limit-Info', f'api-usage={salesforce.request_count}/{salesforce.api_limit}')
+        for name, value in (header or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+    def _json(self, status, body):
+        self._send(status, json.dumps(body).encode() if body is not None else b'')
+
+
+    def _csv(self, status, row_list, field_list, header=None):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=field_list, extrasaction='ignore', lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(row_list)
+        self._send(status, buffer.getvalue().encode(), content_type='text/csv', header=header)
+
+
+    def _oauth(self, body):
+        salesforce = self.server.salesforce
+
+        form = dict(parse_qsl(body.decode()))
+        if form.get('grant_type') != 'password':
+            return self._json(400, {'error': 'unsupported_grant_type'})
+
+        self._json(200, {
+            'access_token': salesforce.token,
+            'instance_url': salesforce.url,
+            'id': f'{salesforce.url}/id/{ORGANIZATION_ID}/005000000000001AAA',
+            'token_type': 'Bearer',
+            'issued_at': str(int(time.time() * 1000)),
+            'signature': 'fake'
+        })
+
+
+    def _sobject(self, method, segment, body):
+        salesforce = self.server.salesforce
+
+        if not segment:
+            return self._json(200, {'sobjects': [{'name': label} for label in salesforce.record]})
+
+        label = segment[0]
+        record = salesforce.record.setdefault(label, {})
+
+        if len(segment) == 1 and method == 'GET':
+            return self._json(200, {'objectDescribe': {'name': label}, 'recentItems': []})
+
+        if len(segment) == 1 and method == 'POST':
+            id = salesforce.insert(label, _payload(body))
+            return self._json(201, {'id': id, 'success': True, 'errors': []})
+
+        if len(segment) == 1:
+            return self._json(405, [{'errorCode': 'METHOD_NOT_ALLOWED', 'message': f'HTTP Method {method} not allowed'}])
+
+        if segment[1] == 'describe':
+            return self._json(200, {
+                'name': label,
+                'fields': [{'name': 'Id', 'type': 'id'}, {'name': 'Name', 'type': 'string'}]
+            })
+
+        id = segment[1]
+        if id not in record:
+            return self._json(404, [{'errorCode': 'NOT_FOUND', 'message': 'The requested resource does not exist'}])
+
+        if method == 'GET':
+            return self._json(200, dict(record[id], attributes={'type': label}))
+
+        if method == 'PATCH':
+            with salesforce.lock:
+                record[id].update(_payload(body))
+            return self._send(204)
+
+        if method == 'DELETE':
+            with salesforce.lock:
+                del record[id]
+            return self._send(204)
+
+        self._json(405, [{'errorCode': 'METHOD_NOT_ALLOWED', 'message': f'HTTP Method {method} not allowed'}])
+
+
+    def _composite(self, method, segment, body, query):
+        salesforce = self.server.salesforce
+
+        # Read many record of a single SObject
+        if segment and method == 'POST':
+            payload = json.loads(body)
+            record = salesforce.record.get(segment[0], {})
+            field_list = payload['fields']
+            return self._json(200, [{field: record[id].get(field) for field in field_list} if id in record else None
+                                    for id in payload['ids']])
+
+        result_list = []
+
+        if method == 'POST':
+            for item in json.loads(body)['records']:
+                label = item.pop('attributes')['type']
+                result_list.append({'id': salesforce.insert(label, item), 'success': True, 'errors': []})
+
+        elif method == 'PATCH':
+            for item in json.loads(body)['records']:
+                label = item.pop('attributes')['type']
+                with salesforce.lock:
+                    record = salesforce.record.get(label, {}).get(item['Id'])
+                    if record is not None:
+                        record.update(item)
+                result_list.append(_save_result(item['Id'], record is not None))
+
+        elif method == 'DELETE':
+            for id in query.get('ids', '').split(','):
+                with salesforce.lock:
+                    found = any(record.pop(id, None) is not None for record in salesforce.record.values())
+                result_list.append(_save_result(id, found))
+
+        self._json(200, result_list)
+
+
+    def _query(self, segment, query):
+        salesforce = self.server.salesforce
+
+        if segment:
+            # Get the next page of an open cursor
+            cursor_id, offset = segment[0].rsplit('-', 1)
+            record_list = salesforce.cursor.get(cursor_id)
+            if record_list is None:
+                return self._json(400, [{'errorCode': 'INVALID_QUERY_LOCATOR', 'message': 'invalid query locator'}])
+            offset = int(offset)
+        else:
+            try:
+                record_list = _soql(salesforce, query.get('q', ''))
+            except ValueError as e:
+                return self._json(400, [{'errorCode': 'MALFORMED_QUERY', 'message': str(e)}])
+            cursor_id = f'01g{next(salesforce.counter):012d}AAA'
+            offset = 0
+
+        end = min(offset + salesforce.page_size, len(record_list))
+        page = {
+            'totalSize': len(record_list),
+            'done': end >= len(record_list),
+            'records': record_list[offset:end]
+        }
+
+        if page['done']:
+            salesforce.cursor.pop(cursor_id, None)
+        else:
+            salesforce.cursor[cursor_id] = record_list
+            page['nextRecordsUrl'] = f'/services/data/v{SFDC_API_V}/query/{cursor_id}-{end}'
+
+        self._json(200, page)
+
+
+    def _ingest(self, method, segment, body):
+        salesforce = self.server.salesforce
+
+        if not segment and method == 'POST':
+            payload = json.loads(body)
+            id = f'750{next(salesforce.counter):012d}AAA'
+            job = salesforce.job[id] = {
+                'id': id,
+                'operation': payload['operation'],
+                'object': payload['object'],
+                'state': 'Open',
+                'numberRecordsProcessed': 0,
+                'numberRecordsFailed': 0,
+                'row': [],
+                'success': [],
+                'failure': []
+            }
+            return self._json(200, _job(job))
+
+        job = salesforce.job.get(segment[0]) if segment else None
+        if job is None:
+            return self._json(404, [{'errorCode': 'NOT_FOUND', 'message': 'The requested resource does not exist'}])
+
+        if len(segment) == 2 and segment[1] == 'batches' and method == 'PUT':
+            job['row'].extend(csv.DictReader(io.StringIO(body.decode())))
+            return self._send(201)
+
+        if len(segment) == 1 and method == 'PATCH':
+            state = json.loads(body)['state']
+            if state == 'UploadComplete':
+                _process_job(salesforce, job)
+            else:
+                job['state'] = state
+            return self._json(200, _job(job))
+
+        if len(segment) == 1 and method == 'GET':
+            return self._json(200, _job(job))
+
+        if len(segment) == 2 and segment[1] == 'successfulResults':
+            field_list = ['sf__Id', 'sf__Created'] + list(job['row'][0] if job['row'] else [])
+            return self._csv(200, job['success'], field_list)
+
+        if len(segment) == 2 and segment[1] == 'failedResults':
+            field_list = ['sf__Id', 'sf__Error'] + list(job['row'][0] if job['row'] else [])
+            return self._csv(200, job['failure'], field_list)
+
+        if len(segment) == 2 and segment[1] == 'unprocessedrecords':
+            return self._csv(200, [], list(job['row'][0] if job['row'] else []))
+
+        self._json(405, [{'errorCode': 'METHOD_NOT_ALLOWED', 'message': f'HTTP Method {method} not allowed'}])
+
+
+    def _bulk_query(self, method, segment, body, query):
+        salesforce = self.server.salesforce
+
+        if not segment and method == 'POST':
+            payload = json.loads(body)
+            try:
+                record_list = _soql(salesforce, payload['query'])
+            except ValueError as e:
+                return self._json(400, [{'errorCode': 'INVALIDJOB', 'message': str(e)}])
+
+            # The query is run at once, the job is complete on the first check
+            id = f'750{next(salesforce.counter):012d}AAA'
+            job = salesforce.job[id] = {
+                'id': id,
+                'operation': payload.get('operation', 'query'),
+                'object': record_list[0]['attributes']['type'] if record_list else None,
+                'state': 'JobComplete',
+                'numberRecordsProcessed': len(record_list),
+                'row': record_list,
+                'field': _select(payload['query'])
+            }
+            return self._json(200, dict(_job(job), state='UploadComplete'))
+
+        job = salesforce.job.get(segment[0]) if segment else None
+        if job is None:
+            return self._json(404, [{'errorCode': 'NOT_FOUND', 'message': 'The requested resource does not exist'}])
+
+        if len(segment) == 1 and method == 'GET':
+            return self._json(200, _job(job))
+
+        if len(segment) == 2 and segment[1] == 'results':
+            # Page the result with the locator
+            offset = int(query.get('locator') or 0)
+            end = min(offset + int(query.get('maxRecords') or salesforce.page_size), len(job['row']))
+            locator = str(end) if end < len(job['row']) else 'null'
+            return self._csv(200, job['row'][offset:end], job['field'], header={'Sforce-Locator': locator})
+
+        self._json(405, [{'errorCode': 'METHOD_NOT_ALLOWED', 'message': f'HTTP Method {method} not allowed'}])
+
+
+    def _soap_login(self, body):
+        salesforce = self.server.salesforce
+
+        body_element = _soap_body(body)
+        if body_element is None or body_element.tag != f'{{{PARTNER_NS}}}login':
+            return self._fault('sf:INVALID_OPERATION', 'Unknown operation')
+
+        username = body_element.findtext(f'{{{PARTNER_NS}}}username')
+
+        self._soap(PARTNER_NS, 'loginResponse', f'''<result>
+<metadataServerUrl>{escape(salesforce.metadata_access[1])}</metadataServerUrl>
+<passwordExpired>false</passwordExpired>
+<sandbox>false</sandbox>
+<serverUrl>{escape(salesforce.url)}/services/Soap/u/{SFDC_API_V}/{ORGANIZATION_ID[:15]}</serverUrl>
+<sessionId>{escape(salesforce.token)}</sessionId>
+<userId>005000000000001AAA</userId>
+<userInfo>
+<organizationId>{ORGANIZATION_ID}</organizationId>
+<sessionSecondsValid>7200</sessionSecondsValid>
+<userId>005000000000001AAA</userId>
+<userName>{escape(username or '')}</userName>
+</userInfo>
+</result>''')
+
+
+    def _soap_metadata(self, body):
+        salesforce = self.server.salesforce
+
+        try:
+            envelope = ET.fromstring(body)
+        except ET.ParseError:
+            return self._fault('soapenv:Client', 'Malformed SOAP message')
+
+        # Check the session of the SOAP header
+        session_id = envelope.findtext(f'.//{{{METADATA_NS}}}SessionHeader/{{{METADATA_NS}}}sessionId')
+        if session_id != salesforce.token:
+            return self._fault('sf:INVALID_SESSION_ID', 'Invalid Session ID found in SessionHeader')
+
+        body_element = envelope.find(f'{{{SOAP_ENVELOPE_NS}}}Body')[0]
+        operation = body_element.tag.split('}', 1)[-1]
+
+        if operation == 'listMetadata':
+            result = ''.join(
+                f'<result><fullName>{escape(full_name)}</fullName><type>{escape(metadata_type)}</type></result>'
+                for query in body_element.iter(f'{{{METADATA_NS}}}queries')
+                for metadata_type in [query.findtext(f'{{{METADATA_NS}}}type')]
+                for full_name in salesforce.metadata.get(metadata_type, {})
+            )
+            return self._soap(METADATA_NS, 'listMetadataResponse', result)
+
+        if operation == 'readMetadata':
+            metadata_type = body_element.findtext(f'{{{METADATA_NS}}}type')
+            full_name_list = [e.text for e in body_element.iter(f'{{{METADATA_NS}}}fullNames')]
+            if len(full_name_list) > METADATA_LIMIT:
+                return self._fault('sf:EXCEEDED_ID_LIMIT', f'record limit reached. cannot submit more than {METADATA_LIMIT} records in this operation')
+
+            component = salesforce.metadata.get(metadata_type, {})
+            record = ''.join(
+                f'<records xsi:type="{escape(metadata_type)}">{_xml_field(component[full_name])}</records>'
+                for full_name in full_name_list if full_name in component
+            )
+            return self._soap(METADATA_NS, 'readMetadataResponse', f'<result>{record}</result>')
+
+        if operation == 'updateMetadata':
+            metadata_list = list(body_element.iter(f'{{{METADATA_NS}}}metadata'))
+            if len(metadata_list) > METADATA_LIMIT:
+                return self._fault('sf:EXCEEDED_ID_LIMIT', f'record limit reached. cannot submit more than {METADATA_LIMIT} records in this operation')
+
+            result_list = []
+            for element in metadata_list:
+                metadata_type = element.get(f'{{{XSI_NS}}}type', '').split(':')[-1]
+                field = {child.tag.split('}', 1)[-1]: child.text for child in element}
+                full_name = field.get('fullName')
+
+                with salesforce.lock:
+                    component = salesforce.metadata.get(metadata_type, {})
+                    found = full_name in component
+                    if found:
+                        component[full_name].update(field)
+
+                if found:
+                    result_list.append(f'<result><fullName>{escape(full_name)}</fullName><success>true</success></result>')
+                else:
+                    result_list.append(f'<result><errors><message>In field: fullName - no {escape(metadata_type)} named {escape(str(full_name))} found</message>'
+                                       f'<statusCode>INVALID_CROSS_REFERENCE_KEY</statusCode></errors>'
+                                       f'<fullName>{escape(str(full_name))}</fullName><success>false</success></result>')
+
+            return self._soap(METADATA_NS, 'updateMetadataResponse', ''.join(result_list))
+
+        self._fault('sf:INVALID_OPERATION', f'Unknown operation {operation}')
+
+
+    def _soap(self, namespace, response, content):
+        body = (f'<?xml version="1.0" encoding="UTF-8"?>'
+                f'<soapenv:Envelope xmlns:soapenv="{SOAP_ENVELOPE_NS}" xmlns="{namespace}" xmlns:xsi="{XSI_NS}">'
+                f'<soapenv:Body><{response}>{content}</{response}></soapenv:Body></soapenv:Envelope>')
+        self._send(200, body.encode(), content_type='text/xml; charset=utf-8')
+
+
+    def _fault(self, code, message):
+        body = (f'<?xml version="1.0" encoding="UTF-8"?>'
+                f'<soapenv:Envelope xmlns:soapenv="{SOAP_ENVELOPE_NS}" xmlns:sf="{METADATA_NS}">'
+                f'<soapenv:Body><soapenv:Fault><faultcode>{code}</faultcode>'
+                f'<faultstring>{escape(code.split(":")[-1])}: {escape(message)}</faultstring>'
+                f'</soapenv:Fault></soapenv:Body></soapenv:Envelope>')
+        self._send(500, body.encode(), content_type='text/xml; charset=utf-8')
+
+
+def _payload(body):
+    """Parse a JSON or form encoded record body"""
+
+    try:
+        return json.loads(body)
+    except ValueError:
+        return {name: value[0] for name, value in parse_qs(body.decode()).items()}
+
+
+def _save_result(id, success):
+    """Create the result of a composite save"""
+
+    if success:
+        return {'id': id, 'success': True, 'errors': []}
+
+    return {'id': id, 'success': False, 'errors': [{'statusCode': 'ENTITY_IS_DELETED', 'message': 'entity is deleted'}]}
+
+
+def _select(query):
+    """Get the field list of a SOQL query"""
+
+    match = re.match(r'^\s*SELECT\s+(.+?)\s+FROM\s', query, re.IGNORECASE | re.DOTALL)
+    if match is None:
+        raise ValueError(f'unexpected token: {query}')
+
+    return [field.strip() for field in match.group(1).split(',')]
+
+
+def _soql(salesforce, query):
+    """Run a SOQL query on the store
+
+    Only the SELECT field, the FROM object, an `ORDER BY` on a single
+    field and `LIMIT` are understood, any other clause is ignored.
+
+    Args:
+        salesforce (FakeSalesforce): The fake organization
+        query (str): The SOQL query
+
+    Returns:
+        A list of dictionary for the matching record
+    """
+
+    field_list = _select(query)
+    label = re.search(r'\sFROM\s+(\w+)', query, re.IGNORECASE).group(1)
+
+    with salesforce.lock:
+        record_list = list(salesforce.record.get(label, {}).values())
+
+    order = re.search(r'\sORDER\s+BY\s+(\w+)(?:\s+(ASC|DESC))?', query, re.IGNORECASE)
+    if order is not None:
+        record_list.sort(key=lambda record: record.get(order.group(1)) or '',
+                         reverse=(order.group(2) or '').upper() == 'DESC')
+
+    limit = re.search(r'\sLIMIT\s+(\d+)', query, re.IGNORECASE)
+    if limit is not None:
+        record_list = record_list[:int(limit.group(1))]
+
+    return [dict({field: record.get(field) for field in field_list}, attributes={'type': label})
+            for record in record_list]
+
+
+def _job(job):
+    """Get the public field of a Bulk job"""
+
+    return {name: value for name, value in job.items() if name not in ('row', 'success', 'failure', 'field')}
+
+
+def _process_job(salesforce, job):
+    """Apply the uploaded row of a Bulk ingest job to the store"""
+
+    label = job['object']
+    record = salesforce.record.setdefault(label, {})
+
+    for row in job['row']:
+        if job['operation'] == 'insert':
+            id = salesforce.insert(label, row)
+            job['success'].append(dict(row, sf__Id=id, sf__Created='true'))
+            continue
+
+        with salesforce.lock:
+            found = row.get('Id') in record
+            if found and job['operation'] in ('delete', 'hardDelete'):
+                del record[row['Id']]
+            elif found:
+                record[row['Id']].update(row)
+
+        if found:
+            job['success'].append(dict(row, sf__Id=row['Id'], sf__Created='false'))
+        else:
+            job['failure'].append(dict(row, sf__Id='', sf__Error='INVALID_CROSS_REFERENCE_KEY:invalid cross reference id:--'))
+
+    job['numberRecordsProcessed'] = len(job['success']) + len(job['failure'])
+    job['numberRecordsFailed'] = len(job['failure'])
+    job['state'] = 'JobComplete'
+
+
+def _soap_body(body):
+    """Get the first element of a SOAP body, None if malformed"""
+
+    try:
+        envelope = ET.fromstring(body)
+    except ET.ParseError:
+        return None
+
+    body_element = envelope.find(f'{{{SOAP_ENVELOPE_NS}}}Body')
+    if body_element is None or len(body_element) == 0:
+        return None
+
+    return body_element[0]
+
+
+def _xml_field(field):
+    """Serialize the field of a metadata component"""
+
+    # The base Metadata field come first
+    name_list = ['fullName'] + sorted(name for name in field if name != 'fullName')
+
+    return ''.join(f'<{name}>{escape(_xml_value(field[name]))}</{name}>'
+                   for name in name_list if field.get(name) is not None)
+
+
+def _xml_value(value):
+    """Format a field value as XML text"""
+
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+
+    return str(value)
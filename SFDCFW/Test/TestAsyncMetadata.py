@@ -0,0 +1,176 @@
+"""
+SFDCFW.Test.TestAsyncMetadata
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import asyncio
+import unittest
+
+import httpx
+
+from SFDCFW.Exception import MetadataError
+from SFDCFW.Retry import Retry
+from SFDCFW.Soap.AsyncMetadata import AsyncMetadata
+from SFDCFW.Test.FakeSalesforce import FakeSalesforce
+
+
+def setUpModule():
+    """Set Up Module"""
+    pass
+
+
+def tearDownModule():
+    """Tear Down Module"""
+    pass
+
+
+class TestAsyncMetadata(unittest.TestCase):
+    """Test the asynchronous Metadata API against the fake Salesforce server."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Prepare test set up class.
+
+        Start the fake Salesforce server with some latency, so the chunk
+        finish out of order.
+        """
+
+        cls.server = FakeSalesforce(latency=0.01).start()
+        cls.full_name_list = cls.server.seed_metadata('WorkflowRule', 83, active=False)
+
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the fake Salesforce server."""
+        cls.server.stop()
+
+
+    def test_list_read_update(self):
+        """Test the list, read and update.
+
+        Should result in every component in the order of the full name,
+        and the update applied to the store.
+        """
+
+        full_name_list = list(reversed(self.full_name_list))
+
+        async def run():
+            async with AsyncMetadata(self.server.metadata_access, self.server.metadata_wsdl) as metadata:
+                file_list = await metadata.list_metadata([{'type': 'WorkflowRule'}])
+                record_list = await metadata.read_metadata('WorkflowRule', full_name_list)
+                for record in record_list:
+                    record['description'] = 'Async'
+                result_list = await metadata.update_metadata(record_list)
+                return file_list, record_list, result_list
+
+        file_list, record_list, result_list = asyncio.run(run())
+
+        self.assertEqual(sorted(file['fullName'] for file in file_list), sorted(self.full_name_list))
+        self.assertEqual([record['fullName'] for record in record_list], full_name_list)
+        self.assertEqual([result['fullName'] for result in result_list], full_name_list)
+        self.assertTrue(all(result['success'] for result in result_list))
+        self.assertEqual(self.server.metadata['WorkflowRule'][self.full_name_list[0]]['description'], 'Async')
+
+
+    def test_read_iter_concurrency(self):
+        """Test the chunk yielded as they finish.
+
+        Should result in every chunk of 10 component, with no more call
+        in flight than the concurrency.
+        """
+
+        count = {'in_flight': 0, 'max_in_flight': 0}
+
+        async def _request(request):
+            count['in_flight'] += 1
+            count['max_in_flight'] = max(count['max_in_flight'], count['in_flight'])
+
+        async def _response(response):
+            count['in_flight'] -= 1
+
+        async def run():
+            async with httpx.AsyncClient(event_hooks={'request': [_request], 'response': [_response]}) as client:
+                async with AsyncMetadata(self.server.metadata_access,
+                                         self.server.metadata_wsdl,
+                                         client=client,
+                                         concurrency=3) as metadata:
+                    chunk_list = [chunk async for chunk in metadata.read_metadata_iter('WorkflowRule', self.full_name_list)]
+
+                # The client of the caller is left open
+                self.assertFalse(client.is_closed)
+
+            return chunk_list
+
+        chunk_list = asyncio.run(run())
+
+        self.assertEqual(sorted(chunk['index'] for chunk in chunk_list), list(range(9)))
+        self.assertEqual(sum(len(chunk['result']) for chunk in chunk_list), 83)
+        self.assertTrue(all(chunk['error'] is None for chunk in chunk_list))
+        self.assertLessEqual(count['max_in_flight'], 3)
+        self.assertGreater(count['max_in_flight'], 1)
+
+
+    def test_read_iter_stop(self):
+        """Test a caller stopping after the first chunk.
+
+        Should result in the chunk not finished cancelled.
+        """
+
+        async def run():
+            async with AsyncMetadata(self.server.metadata_access, self.server.metadata_wsdl, concurrency=2) as metadata:
+                request_count = self.server.request_count
+                iterator = metadata.read_metadata_iter('WorkflowRule', self.full_name_list)
+                async for chunk in iterator:
+                    break
+                await iterator.aclose()
+                await asyncio.sleep(0.05)
+                request_count = self.server.request_count - request_count
+
+            # The client created by the instance is closed with it
+            return chunk, request_count, metadata.client.is_closed
+
+        chunk, request_count, closed = asyncio.run(run())
+
+        self.assertEqual(len(chunk['result']), len(chunk['item']))
+        self.assertLess(request_count, 9)
+        self.assertTrue(closed)
+
+
+    def test_chunk_error(self):
+        """Test a chunk that failed.
+
+        Should result in a Metadata error with the error on its chunk
+        and the result of the other chunk kept.
+        """
+
+        access = ('INVALID', self.server.metadata_access[1])
+
+        async def run():
+            async with AsyncMetadata(access, self.server.metadata_wsdl, retry=Retry(max_attempts=1)) as metadata:
+                await metadata.read_metadata('WorkflowRule', self.full_name_list[:15])
+
+        with self.assertRaises(MetadataError) as context:
+            asyncio.run(run())
+
+        chunk_list = context.exception.args[0]
+
+        self.assertEqual([chunk['index'] for chunk in chunk_list], [0, 1])
+        self.assertTrue(all('INVALID_SESSION_ID' in str(chunk['error']) for chunk in chunk_list))
+
+
+def suite():
+    """Test Suite"""
+
+    # Create the Unit Test Suite
+    suite = unittest.TestSuite()
+
+    # Add the Unit Test
+    suite.addTest(TestAsyncMetadata)
+
+    # Return the Test Suite
+    return suite
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
@@ -0,0 +1,140 @@
+"""
+SFDCFW.Test.TestAsyncRest
+~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import asyncio
+import json
+import unittest
+
+import httpx
+
+from SFDCFW.Rest.AsyncQuery import AsyncQuery
+from SFDCFW.Rest.AsyncSObject import AsyncSObject
+
+
+def setUpModule():
+    """Set Up Module"""
+    pass
+
+
+def tearDownModule():
+    """Tear Down Module"""
+    pass
+
+
+class TestAsyncRest(unittest.TestCase):
+    """Test the asynchronous SObject and Query with a mock transport."""
+
+    def setUp(self):
+        """Prepare test set up.
+
+        Create a mock transport recording the request path and the
+        number of request in flight.
+        """
+
+        self.path_list = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        async def handler(request):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            self.path_list.append((request.method, request.url.path))
+
+            if request.method == 'POST':
+                return httpx.Response(201, json={'id': request.url.path.rsplit('/', 1)[-1]})
+            if request.method in ('PATCH', 'DELETE'):
+                return httpx.Response(204)
+            return httpx.Response(200, json={'totalSize': 0, 'records': []})
+
+        self.transport = httpx.MockTransport(handler)
+        self.access = ('token', 'https://example.my.salesforce.com')
+
+
+    def test_async_sobject_label_handle(self):
+        """Test coroutine for different SObject in flight together.
+
+        Create an Account and a Contact concurrently. Should result in
+        each request using its own SObject label.
+        """
+
+        async def run():
+            async with httpx.AsyncClient(transport=self.transport) as client, AsyncSObject(self.access, client=client) as sobject:
+                return await asyncio.gather(sobject.Account.create('{}'),
+                                            sobject.Contact.create('{}'))
+
+        self.assertEqual(asyncio.run(run()), ['Account', 'Contact'])
+
+
+    def test_async_sobject_concurrency(self):
+        """Test the concurrency semaphore.
+
+        Send twenty request with a concurrency of four. Should result in
+        no more than four request in flight.
+        """
+
+        async def run():
+            async with httpx.AsyncClient(transport=self.transport) as client, \
+                       AsyncSObject(self.access, client=client, concurrency=4) as sobject:
+                return await asyncio.gather(*[sobject.Account.update(str(i), '{}') for i in range(20)])
+
+        self.assertEqual(asyncio.run(run()), [204] * 20)
+        self.assertEqual(self.max_in_flight, 4)
+
+
+    def test_async_query(self):
+        """Test the asynchronous query.
+
+        Should result in the response text of the query.
+        """
+
+        async def run():
+            async with httpx.AsyncClient(transport=self.transport) as client, AsyncQuery(self.access, client=client) as query:
+                return await query.query('SELECT Id FROM Account')
+
+        self.assertEqual(json.loads(asyncio.run(run()))['totalSize'], 0)
+
+
+    def test_async_client_owner(self):
+        """Test the close of a provided and a created client.
+
+        Should result in the provided client left open for the caller,
+        and the created client closed.
+        """
+
+        async def run():
+            async with httpx.AsyncClient(transport=self.transport) as client:
+                async with AsyncSObject(self.access, client=client) as sobject:
+                    pass
+
+                # The client is still usable after the instance is closed
+                r = await client.get('https://example.my.salesforce.com/services/data')
+                provided = (client.is_closed, r.status_code)
+
+            async with AsyncSObject(self.access) as created:
+                pass
+
+            return provided, created.client.is_closed
+
+        self.assertEqual(asyncio.run(run()), ((False, 200), True))
+
+
+def suite():
+    """Test Suite"""
+
+    # Create the Unit Test Suite
+    suite = unittest.TestSuite()
+
+    # Add the Unit Test
+    suite.addTest(TestAsyncRest)
+
+    # Return the Test Suite
+    return suite
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
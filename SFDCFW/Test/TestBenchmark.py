@@ -0,0 +1,212 @@
+"""
+SFDCFW.Test.TestBenchmark
+~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import json
+import unittest
+
+from SFDCFW.Access import Access
+from SFDCFW.Rest.Bulk import Bulk
+from SFDCFW.Rest.Query import Query
+from SFDCFW.Rest.SObject import SObject
+from SFDCFW.Soap.Metadata import Metadata
+from SFDCFW.Test.Benchmark import SCENARIO, format_report, percentile, run
+from SFDCFW.Test.FakeSalesforce import FakeSalesforce
+from SFDCFW.Transport import Transport
+
+
+def setUpModule():
+    """Set Up Module"""
+    pass
+
+
+def tearDownModule():
+    """Tear Down Module"""
+    pass
+
+
+class TestFakeSalesforce(unittest.TestCase):
+    """Test the framework against the fake Salesforce server."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Prepare test set up class.
+
+        Start the fake Salesforce server with a small query page.
+        """
+
+        cls.server = FakeSalesforce(page_size=100).start()
+        cls.transport = Transport()
+
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the fake Salesforce server."""
+        cls.transport.close()
+        cls.server.stop()
+
+
+    def test_login(self):
+        """Test the REST and SOAP login.
+
+        Should result in the session and the instance or metadata server
+        URL of the fake server.
+        """
+
+        rest_access = Access(username='user@example.com',
+                             password='password',
+                             security_token='token',
+                             client_id='client',
+                             client_secret='secret',
+                             transport=self.transport)
+        rest_access.rest_url = f'{self.server.url}/services/oauth2/token'
+
+        soap_access = Access(username='user@example.com',
+                             password='password',
+                             security_token='token',
+                             wsdl=self.server.partner_wsdl,
+                             metadata=True)
+
+        self.assertEqual(rest_access.login(), self.server.access)
+        self.assertEqual(soap_access.login(), self.server.metadata_access)
+        self.assertEqual(soap_access.token_ttl, 7200)
+
+
+    def test_crud(self):
+        """Test the SObject create, read, update and delete.
+
+        Should result in the record changed in the store, and not found
+        once deleted.
+        """
+
+        sobject = SObject(self.server.access, transport=self.transport)
+
+        id = sobject.Account.create(json.dumps({'Name': 'Example'}))
+        self.assertEqual(json.loads(sobject.Account.read(id))['Name'], 'Example')
+
+        self.assertEqual(sobject.Account.update(id, json.dumps({'Name': 'Updated'})), 204)
+        self.assertEqual(self.server.record['Account'][id]['Name'], 'Updated')
+
+        self.assertEqual(sobject.Account.delete(id), 204)
+        self.assertIsNone(sobject.Account.read(id))
+
+
+    def test_query_paging(self):
+        """Test the query paging.
+
+        Should result in every record, following the next records URL
+        of each page.
+        """
+
+        self.server.seed('Opportunity', 250)
+        query = Query(self.server.access, transport=self.transport)
+
+        record_list = list(query.query_iter('SELECT Id, Name FROM Opportunity'))
+
+        self.assertEqual(len(record_list), 250)
+        self.assertEqual(len({record['Id'] for record in record_list}), 250)
+
+
+    def test_bulk(self):
+        """Test the Bulk API 2.0 ingest and query job.
+
+        Should result in the uploaded record queried back.
+        """
+
+        bulk = Bulk(self.server.access, transport=self.transport)
+
+        status_list = bulk.ingest('Case',
+                                  'insert',
+                                  ({'Subject': f'Case {i}'} for i in range(120)),
+                                  batch_limit=50,
+                                  poll=0.01)
+
+        self.assertEqual(len(status_list), 3)
+        self.assertEqual(sum(status['numberRecordsProcessed'] for status in status_list), 120)
+
+        row_list = list(bulk.query_job('SELECT Id, Subject FROM Case', max_records=40, poll=0.01))
+
+        self.assertEqual(len(row_list), 120)
+        self.assertEqual(set(row_list[0]), {'Id', 'Subject'})
+
+
+    def test_metadata(self):
+        """Test the Metadata API list, read and update.
+
+        Should result in the component read ten per call and the update
+        applied to the store.
+        """
+
+        full_name_list = self.server.seed_metadata('WorkflowRule', 25, active=False)
+        metadata = Metadata(self.server.metadata_access, self.server.metadata_wsdl)
+
+        file_list = metadata.list_metadata([{'type': 'WorkflowRule'}])
+        self.assertEqual(sorted(file['fullName'] for file in file_list), sorted(full_name_list))
+
+        record_list = metadata.read_metadata('WorkflowRule', full_name_list)
+        self.assertEqual([record['fullName'] for record in record_list], full_name_list)
+
+        for record in record_list:
+            record['active'] = True
+
+        result_list = metadata.update_metadata(record_list)
+        self.assertTrue(all(result['success'] for result in result_list))
+        self.assertEqual(self.server.metadata['WorkflowRule'][full_name_list[0]]['active'], 'true')
+
+
+class TestBenchmark(unittest.TestCase):
+    """Test the benchmark report."""
+
+    def test_percentile(self):
+        """Test the nearest rank percentile.
+
+        Should result in the smallest value covering the percentile.
+        """
+
+        latency_list = [0.5, 0.1, 0.4, 0.2, 0.3]
+
+        self.assertEqual(percentile(latency_list, 0.5), 0.3)
+        self.assertEqual(percentile(latency_list, 0.99), 0.5)
+        self.assertIsNone(percentile([], 0.5))
+
+
+    def test_run(self):
+        """Test every scenario with injected latency.
+
+        Should result in a report for each measure, no faster than the
+        injected latency.
+        """
+
+        with FakeSalesforce(latency=0.01, page_size=20) as server:
+            report_list = run(server, iteration=2, record=50, component=15, thread=2)
+
+        name_list = [report['name'] for report in report_list]
+        for scenario in SCENARIO:
+            self.assertTrue(any(name.startswith(scenario) for name in name_list), scenario)
+
+        for report in report_list:
+            self.assertEqual(report['unit'], 2)
+            self.assertGreaterEqual(report['p50'], 0.01)
+            self.assertGreaterEqual(report['p99'], report['p50'])
+
+        self.assertEqual(len(format_report(report_list).splitlines()), len(report_list) + 1)
+
+
+def suite():
+    """Test Suite"""
+
+    # Create the Unit Test Suite
+    suite = unittest.TestSuite()
+
+    # Add the Unit Test
+    suite.addTest(TestFakeSalesforce)
+    suite.addTest(TestBenchmark)
+
+    # Return the Test Suite
+    return suite
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
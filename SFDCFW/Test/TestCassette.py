@@ -0,0 +1,219 @@
+"""
+SFDCFW.Test.TestCassette
+~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from SFDCFW.Access import Access
+from SFDCFW.Cassette import Cassette
+from SFDCFW.Exception import CassetteError
+from SFDCFW.Rest.Bulk import Bulk
+from SFDCFW.Rest.Query import Query
+from SFDCFW.Rest.SObject import SObject
+from SFDCFW.Soap.Metadata import Metadata
+from SFDCFW.Test.FakeSalesforce import FakeSalesforce
+from SFDCFW.Transport import Transport
+
+
+def setUpModule():
+    """Set Up Module"""
+    pass
+
+
+def tearDownModule():
+    """Tear Down Module"""
+    pass
+
+
+class TestCassette(unittest.TestCase):
+    """Test the record and replay of a session."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Prepare test set up class.
+
+        Start the fake Salesforce server standing in for an organization.
+        """
+
+        cls.server = FakeSalesforce(latency=0.02, page_size=10).start()
+        cls.server.seed('Account', 25)
+        cls.full_name_list = cls.server.seed_metadata('WorkflowRule', 12, active=True)
+
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the fake Salesforce server."""
+        cls.server.stop()
+
+
+    def setUp(self):
+        """Create the directory of the cassette."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'Session.json')
+
+
+    def tearDown(self):
+        """Remove the directory of the cassette."""
+        self.directory.cleanup()
+
+
+    def session(self, transport):
+        """Run a session against the organization.
+
+        Login with REST and SOAP, then use the REST, Bulk and Metadata
+        API through the transport.
+        """
+
+        rest_access = Access(username='user@example.com',
+                             password='Pa55word',
+                             security_token='T0ken',
+                             client_id='client',
+                             client_secret='S3cret',
+                             transport=transport)
+        rest_access.rest_url = f'{self.server.url}/services/oauth2/token'
+        access = rest_access.login()
+
+        soap_access = Access(username='user@example.com',
+                             password='Pa55word',
+                             security_token='T0ken',
+                             wsdl=self.server.partner_wsdl,
+                             metadata=True,
+                             transport=transport)
+        metadata_access = soap_access.login()
+
+        sobject = SObject(access, transport=transport)
+        query = Query(access, transport=transport)
+        bulk = Bulk(access, transport=transport)
+        metadata = Metadata(metadata_access, self.server.metadata_wsdl, transport=transport)
+
+        id = sobject.Contact.create(json.dumps({'Name': 'Example'}))
+
+        return {
+            'read': json.loads(sobject.Contact.read(id))['Name'],
+            'query': [record['Name'] for record in query.query_iter('SELECT Id, Name FROM Account')],
+            'bulk': [row['Name'] for row in bulk.query_job('SELECT Id, Name FROM Account', max_records=7, poll=0.01)],
+            'metadata': [(record.fullName, record.active) for record in metadata.read_metadata('WorkflowRule', self.full_name_list)]
+        }
+
+
+    def test_record_replay(self):
+        """Test a session recorded then replayed.
+
+        Should result in the same result replayed without any request
+        to the organization, and no credential in the cassette.
+        """
+
+        with Cassette(self.path, mode='record') as cassette:
+            with Transport(cassette=cassette) as transport:
+                recorded = self.session(transport)
+
+        self.assertEqual(len(recorded['query']), 25)
+        self.assertEqual(len(recorded['bulk']), 25)
+        self.assertEqual(len(recorded['metadata']), 12)
+
+        with open(self.path) as f:
+            text = f.read()
+        for secret in (self.server.token, 'user@example.com', 'Pa55word', 'T0ken', 'S3cret'):
+            self.assertNotIn(secret, text)
+
+        request_count = self.server.request_count
+
+        with Transport(cassette=Cassette(self.path)) as transport:
+            replayed = self.session(transport)
+
+        self.assertEqual(replayed, recorded)
+        self.assertEqual(self.server.request_count, request_count)
+
+
+    def test_replay_timing(self):
+        """Test the replay with the original and scaled timing.
+
+        Should result in the recorded latency replayed, scaled, or not
+        at all.
+        """
+
+        url = f'{self.server.url}/services/data/v54.0/sobjects/Account'
+        header = {'Authorization': f'Bearer {self.server.token}'}
+
+        with Cassette(self.path, mode='record') as cassette:
+            with Transport(cassette=cassette) as transport:
+                for _ in range(5):
+                    transport.get(url, headers=header)
+
+        for scale, low, high in ((1, 0.1, 5), (0.1, 0, 0.1), (None, 0, 0.05)):
+            with Transport(cassette=Cassette(self.path, scale=scale)) as transport:
+                start = time.perf_counter()
+                for _ in range(5):
+                    self.assertEqual(transport.get(url, headers=header).status_code, 200)
+                elapsed = time.perf_counter() - start
+
+            self.assertGreaterEqual(elapsed, low, scale)
+            self.assertLess(elapsed, high, scale)
+
+
+    def test_replay_missing(self):
+        """Test a request that was not recorded.
+
+        Should result in a cassette error, and each interaction replayed
+        only once.
+        """
+
+        url = f'{self.server.url}/services/data/v54.0/sobjects/Account'
+
+        with Cassette(self.path, mode='auto') as cassette:
+            self.assertEqual(cassette.mode, 'record')
+            with Transport(cassette=cassette) as transport:
+                transport.get(url)
+
+        cassette = Cassette(self.path, mode='auto')
+        self.assertEqual(cassette.mode, 'replay')
+
+        with Transport(cassette=cassette) as transport:
+            transport.get(url)
+
+            with self.assertRaises(CassetteError):
+                transport.get(url)
+
+            with self.assertRaises(CassetteError):
+                transport.get(f'{self.server.url}/services/data/v54.0/limits')
+
+
+    def test_scrub(self):
+        """Test the scrub of the credential and instance host.
+
+        Should result in the token, password and host replaced, with the
+        extra pattern applied.
+        """
+
+        cassette = Cassette(self.path, mode='record', scrub=[(r'00D\w{12,15}', '00D000000000000')])
+
+        self.assertEqual(cassette.scrub('{"access_token": "00Dxx!AQ0", "instance_url": "https://acme.my.salesforce.com"}'),
+                         '{"access_token": "***", "instance_url": "https://example.my.salesforce.com"}')
+        self.assertEqual(cassette.scrub('<sessionId>00Dxx!AQ0</sessionId><password>secret</password>'),
+                         '<sessionId>***</sessionId><password>***</password>')
+        self.assertEqual(cassette.scrub('grant_type=password&username=user%40example.com&password=secret'),
+                         'grant_type=password&username=***&password=***')
+        self.assertEqual(cassette.scrub('/id/00D5e000000AbCdEAK/005'), '/id/00D000000000000/005')
+
+
+def suite():
+    """Test Suite"""
+
+    # Create the Unit Test Suite
+    suite = unittest.TestSuite()
+
+    # Add the Unit Test
+    suite.addTest(TestCassette)
+
+    # Return the Test Suite
+    return suite
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
@@ -0,0 +1,108 @@
+"""
+SFDCFW.Test.TestImport
+~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+
+# The cold import time budget in second, override with `SFDCFW_IMPORT_BUDGET`
+IMPORT_BUDGET = float(os.environ.get('SFDCFW_IMPORT_BUDGET', '0.5'))
+
+# The heavy dependency only loaded on first use of the SOAP or Bulk path
+HEAVY_MODULE = ('zeep', 'lxml', 'pandas', 'httpx')
+
+# Time the import in a fresh interpreter, report the time and loaded module
+IMPORT_SCRIPT = '''
+import json
+import sys
+import time
+
+start = time.perf_counter()
+import SFDCFW.SFDCFW
+import SFDCFW.Rest.Query
+import SFDCFW.Rest.Bulk
+import SFDCFW.Soap.Metadata
+elapsed = time.perf_counter() - start
+
+print(json.dumps({'elapsed': elapsed, 'module': sorted(sys.modules)}))
+'''
+
+
+def cold_import():
+    """Import the package in a fresh interpreter
+
+    Returns:
+        A dictionary with the elapsed time and the loaded module
+    """
+
+    # Run from the project root so the package is found
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    result = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT],
+                            cwd=root,
+                            capture_output=True,
+                            text=True,
+                            check=True)
+
+    return json.loads(result.stdout)
+
+
+def setUpModule():
+    """Set Up Module"""
+    pass
+
+
+def tearDownModule():
+    """Tear Down Module"""
+    pass
+
+
+class TestImport(unittest.TestCase):
+    """Test the cold import of the package."""
+
+    def test_import_no_heavy_module(self):
+        """Test the import does not load the heavy dependency.
+
+        Should result in none of zeep, lxml, pandas or httpx loaded.
+        """
+
+        module_list = cold_import()['module']
+
+        for module in HEAVY_MODULE:
+            self.assertNotIn(module, module_list)
+
+
+    def test_import_budget(self):
+        """Test the cold import time.
+
+        Take the best of three run to reduce noise. Should result in an
+        import time within the budget.
+        """
+
+        elapsed = min(cold_import()['elapsed'] for _ in range(3))
+
+        self.assertLess(elapsed, IMPORT_BUDGET,
+                        f'Cold import took {elapsed:.3f}s, budget is {IMPORT_BUDGET:.3f}s')
+
+
+def suite():
+    """Test Suite"""
+
+    # Create the Unit Test Suite
+    suite = unittest.TestSuite()
+
+    # Add the Unit Test
+    suite.addTest(TestImport)
+
+    # Return the Test Suite
+    return suite
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
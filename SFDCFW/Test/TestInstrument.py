@@ -0,0 +1,206 @@
+"""
+SFDCFW.Test.TestInstrument
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import io
+import json
+import logging
+import unittest
+
+import requests
+from zeep.exceptions import Fault
+
+from SFDCFW.Instrument import Instrument, LoggingSink, Registry, SoapPlugin, instrument_call, operation
+from SFDCFW.Retry import Retry
+from SFDCFW.Transport import Transport
+
+
+INSTANCE_URL = 'https://example.my.salesforce.com'
+
+
+class FakeSession:
+    """Fake session answering with each response of a list in turn."""
+
+    def __init__(self, response_list):
+        self.response_list = list(response_list)
+        self.headers = {}
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def request(self, method, url, **kwargs):
+        response = self.response_list.pop(0)
+        if isinstance(response, Exception):
+            raise response
+
+        status_code, body = response
+        r = requests.Response()
+        r.status_code = status_code
+        r.raw = io.BytesIO(json.dumps(body).encode())
+        return r
+
+
+def setUpModule():
+    """Set Up Module"""
+    pass
+
+
+def tearDownModule():
+    """Tear Down Module"""
+    pass
+
+
+class TestInstrument(unittest.TestCase):
+    """Test the instrumentation event and sink."""
+
+    def test_operation(self):
+        """Test the operation of a REST URL.
+
+        Should result in the operation and SObject label of each API.
+        """
+
+        data_url = f'{INSTANCE_URL}/services/data/v54.0'
+
+        self.assertEqual(operation('POST', f'{INSTANCE_URL}/services/oauth2/token'), ('login', None))
+        self.assertEqual(operation('GET', f'{data_url}/query?q=SELECT+Id+FROM+Account'), ('query', None))
+        self.assertEqual(operation('GET', f'{data_url}/sobjects/Account/001000000000001'), ('sobject', 'Account'))
+        self.assertEqual(operation('GET', f'{data_url}/sobjects/Account/describe'), ('describe', 'Account'))
+        self.assertEqual(operation('PATCH', f'{data_url}/composite/sobjects/Account'), ('composite', 'Account'))
+        self.assertEqual(operation('PUT', f'{data_url}/jobs/ingest/750/batches'), ('bulk_ingest', None))
+        self.assertEqual(operation('GET', f'{data_url}/jobs/ingest/750'), ('bulk_poll', None))
+        self.assertEqual(operation('GET', f'{data_url}/jobs/query/750/results'), ('bulk_query', None))
+        self.assertEqual(operation('GET', f'{data_url}/limits'), ('limits', None))
+
+
+    def test_transport_event(self):
+        """Test the transport event.
+
+        Should result in one event per call with the status, size and
+        retry count, including the call raising.
+        """
+
+        event_list = []
+        registry = Registry()
+        lock_error = [{'errorCode': 'UNABLE_TO_LOCK_ROW', 'message': 'unable to obtain exclusive access'}]
+        session = FakeSession([(400, lock_error), (200, {'Id': '001000000000001'})] + [requests.ConnectionError()] * 2)
+        transport = Transport(session=session,
+                              retry=Retry(max_attempts=2, backoff=0, max_backoff=0),
+                              instrument=Instrument(event_list.append, registry))
+
+        url = f'{INSTANCE_URL}/services/data/v54.0/sobjects/Account/001000000000001'
+        r = transport.patch(url, data='{"Name": "Example"}')
+
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(event_list[0]['operation'], 'sobject')
+        self.assertEqual(event_list[0]['label'], 'Account')
+        self.assertEqual(event_list[0]['method'], 'PATCH')
+        self.assertEqual(event_list[0]['status'], 200)
+        self.assertEqual(event_list[0]['bytes_sent'], 19)
+        self.assertEqual(event_list[0]['bytes_received'], len(r.content))
+        self.assertEqual(event_list[0]['retry_count'], 1)
+
+        with self.assertRaises(requests.ConnectionError):
+            transport.get(url, operation='custom', label='Label')
+
+        self.assertEqual(event_list[1]['operation'], 'custom')
+        self.assertEqual(event_list[1]['label'], 'Label')
+        self.assertEqual(event_list[1]['error'], 'ConnectionError')
+        self.assertEqual(len(registry.snapshot()), 2)
+
+
+    def test_registry(self):
+        """Test the registry histogram and rendering.
+
+        Should result in the call counted in its latency bucket, the
+        percentile estimated from the bucket and the Prometheus text.
+        """
+
+        registry = Registry(bucket=(0.1, 1))
+        instrument = Instrument(registry)
+
+        for latency in (0.05, 0.05, 0.5, 5):
+            instrument.emit('query', method='GET', status=200, bytes_received=10, latency=latency)
+
+        metric, = registry.snapshot()
+        self.assertEqual(metric['count'], 4)
+        self.assertEqual(metric['bytes_received'], 40)
+        self.assertEqual(metric['latency_bucket'], [2, 1, 1])
+
+        self.assertEqual(registry.percentile('query', 0.5), 0.1)
+        self.assertEqual(registry.percentile('query', 0.75), 1)
+        self.assertEqual(registry.percentile('query', 0.99), float('inf'))
+        self.assertIsNone(registry.percentile('login', 0.5))
+
+        text = registry.render()
+        self.assertIn('sfdcfw_call_latency_seconds_bucket{operation="query",label="",method="GET",status="200",le="1"} 3', text)
+        self.assertIn('sfdcfw_call_latency_seconds_count{operation="query",label="",method="GET",status="200"} 4', text)
+
+
+    def test_sink(self):
+        """Test the logging sink and a failing sink.
+
+        Should result in the event logged and the failing sink not
+        failing the call.
+        """
+
+        def failing_sink(event):
+            raise ValueError(event)
+
+        instrument = Instrument(failing_sink, LoggingSink(level=logging.INFO))
+
+        with self.assertLogs('SFDCFW.Instrument', level=logging.INFO) as log:
+            instrument.emit('login', method='POST', status=200, latency=0.25)
+
+        self.assertIn('Instrument sink failed', log.output[0])
+        self.assertIn('login - POST 200 0.250s', log.output[1])
+
+
+    def test_soap_call(self):
+        """Test the SOAP operation event.
+
+        Should result in the retried fault counted and the SOAP
+        operation name as the label.
+        """
+
+        event_list = []
+        attempt_list = []
+
+        def read_metadata(type, fullNames):
+            attempt_list.append(type)
+            if len(attempt_list) < 2:
+                raise Fault('UNABLE_TO_LOCK_ROW', code='sf:UNABLE_TO_LOCK_ROW')
+            return ['result']
+
+        result = instrument_call(Instrument(event_list.append),
+                                 SoapPlugin(),
+                                 'metadata',
+                                 'readMetadata',
+                                 read_metadata,
+                                 Retry(backoff=0, max_backoff=0),
+                                 type='WorkflowRule',
+                                 fullNames=['Account.Rule'])
+
+        self.assertEqual(result, ['result'])
+        self.assertEqual(event_list[0]['operation'], 'metadata')
+        self.assertEqual(event_list[0]['label'], 'readMetadata')
+        self.assertEqual(event_list[0]['retry_count'], 1)
+        self.assertIn('serialize', event_list[0])
+
+
+def suite():
+    """Test Suite"""
+
+    # Create the Unit Test Suite
+    suite = unittest.TestSuite()
+
+    # Add the Unit Test
+    suite.addTest(TestInstrument)
+
+    # Return the Test Suite
+    return suite
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
@@ -0,0 +1,303 @@
+"""
+SFDCFW.Test.TestMetadataThread
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import threading
+import time
+import unittest
+
+from SFDCFW.Exception import MetadataError
+from SFDCFW.Retry import Retry
+from SFDCFW.Soap.CustomField import CustomField
+from SFDCFW.Soap.Metadata import Metadata
+from SFDCFW.Soap.WorkflowRule import WorkflowRule
+from SFDCFW.Test.FakeSalesforce import FakeSalesforce
+
+
+def setUpModule():
+    """Set Up Module"""
+    pass
+
+
+def tearDownModule():
+    """Tear Down Module"""
+    pass
+
+
+class FailMetadata(Metadata):
+    """Metadata failing the call for the chunk holding a full name."""
+
+    fail = None
+
+    def _call(self, operation, **kwargs):
+        if self.fail in kwargs.get("fullNames", ()):
+            raise ValueError(self.fail)
+        return super()._call(operation, **kwargs)
+
+
+class CountMetadata(Metadata):
+    """Metadata counting the call in flight."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _call(self, operation, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return super()._call(operation, **kwargs)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class TestMetadataThread(unittest.TestCase):
+    """Test the Metadata read and update over worker thread."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Prepare test set up class.
+
+        Start the fake Salesforce server with some latency, so the chunk
+        finish out of order.
+        """
+
+        cls.server = FakeSalesforce(latency=0.01).start()
+        cls.full_name_list = cls.server.seed_metadata('WorkflowRule', 83, active=False)
+
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the fake Salesforce server."""
+        cls.server.stop()
+
+
+    def setUp(self):
+        """Create the Metadata API instance."""
+        self.metadata = Metadata(self.server.metadata_access, self.server.metadata_wsdl)
+
+
+    def tearDown(self):
+        """Shut down the worker pool."""
+        self.metadata.close()
+
+
+    def test_read_order(self):
+        """Test the read of every component over many thread.
+
+        Should result in every component, the last partial chunk
+        included, in the order of the full name.
+        """
+
+        full_name_list = list(reversed(self.full_name_list))
+
+        for thread in (1, 4, 10):
+            record_list = self.metadata.read_metadata_thread('WorkflowRule', full_name_list, thread=thread)
+            self.assertEqual([record['fullName'] for record in record_list], full_name_list, thread)
+
+        self.assertEqual(self.metadata.read_metadata_thread('WorkflowRule', []), [])
+
+
+    def test_update_order(self):
+        """Test the update of every component over many thread.
+
+        Should result in a result for each component, in order, and the
+        update applied to the store.
+        """
+
+        record_list = self.metadata.read_metadata_thread('WorkflowRule', self.full_name_list, thread=8)
+        for record in record_list:
+            record['description'] = 'Updated'
+
+        result_list = self.metadata.update_metadata_thread(record_list, thread=8)
+
+        self.assertEqual([result['fullName'] for result in result_list], self.full_name_list)
+        self.assertTrue(all(result['success'] for result in result_list))
+        self.assertEqual(self.server.metadata['WorkflowRule'][self.full_name_list[-1]]['description'], 'Updated')
+
+
+    def test_progress(self):
+        """Test the callback and progress of each chunk.
+
+        Should result in a call from the calling thread as each chunk
+        finish, with at most `thread` chunk in flight.
+        """
+
+        chunk_list = []
+        report_list = []
+        caller = threading.current_thread()
+
+        def _callback(chunk):
+            self.assertIs(threading.current_thread(), caller)
+            chunk_list.append(chunk)
+
+        with CountMetadata(self.server.metadata_access, self.server.metadata_wsdl) as metadata:
+            metadata.read_metadata_thread('WorkflowRule',
+                                          self.full_name_list,
+                                          thread=3,
+                                          callback=_callback,
+                                          progress=report_list.append)
+
+        self.assertEqual(sorted(chunk['index'] for chunk in chunk_list), list(range(9)))
+        self.assertEqual([report['complete'] for report in report_list], list(range(1, 10)))
+        self.assertEqual(report_list[-1], {'chunk': 9, 'complete': 9, 'component': 83, 'failed': 0})
+        self.assertEqual(metadata.max_in_flight, 3)
+
+
+    def test_concurrent_call(self):
+        """Test thread call made at once from many thread, and closed.
+
+        Should result in every call sharing the worker pool, capped to
+        the worker of the instance, and the close waiting for them.
+        """
+
+        full_name_list = self.full_name_list * 3
+        result = {}
+
+        metadata = CountMetadata(self.server.metadata_access, self.server.metadata_wsdl, thread=4)
+
+        def _read(name, thread):
+            try:
+                record_list = metadata.read_metadata_thread('WorkflowRule', full_name_list, thread=thread)
+                result[name] = [record['fullName'] for record in record_list]
+            except Exception as e:
+                result[name] = e
+
+        t_list = [threading.Thread(target=_read, args=('small', 2)), threading.Thread(target=_read, args=('large', 4))]
+        for t in t_list:
+            t.start()
+
+        # Close while both call are in flight
+        while metadata.active < 2 and any(t.is_alive() for t in t_list):
+            time.sleep(0.001)
+        metadata.close()
+
+        for t in t_list:
+            t.join()
+
+        self.assertEqual(result, {'small': full_name_list, 'large': full_name_list})
+        self.assertLessEqual(metadata.max_in_flight, 4)
+        self.assertIsNone(metadata.executor)
+
+
+    def test_thread_limit(self):
+        """Test a thread call asking for more thread than the worker.
+
+        Should result in a warning naming the size of the worker pool,
+        and the thread of the Metadata component class sizing it.
+        """
+
+        with self.assertWarnsRegex(UserWarning, 'the worker pool has 10'):
+            record_list = self.metadata.read_metadata_thread('WorkflowRule', self.full_name_list, thread=32)
+
+        self.assertEqual(len(record_list), 83)
+
+        custom_field = CustomField(self.server.metadata_access, self.server.metadata_wsdl)
+        workflow_rule = WorkflowRule(self.server.metadata_access, self.server.metadata_wsdl, thread=16)
+        try:
+            self.assertEqual(custom_field.metadata.thread, 20)
+            self.assertEqual(workflow_rule.metadata.thread, 16)
+        finally:
+            custom_field.metadata.close()
+            workflow_rule.metadata.close()
+
+
+    def test_service_pool(self):
+        """Test the service proxy and connection of each worker.
+
+        Should result in a service proxy per concurrent call, and the
+        connection kept alive from one call to the next.
+        """
+
+        with Metadata(self.server.metadata_access, self.server.metadata_wsdl, thread=4) as metadata:
+            metadata.read_metadata_thread('WorkflowRule', self.full_name_list[:10], thread=1)
+            self.assertEqual(metadata.service_size, 1)
+
+            for _ in range(3):
+                metadata.read_metadata_thread('WorkflowRule', self.full_name_list)
+
+            self.assertLessEqual(metadata.service_size, 4)
+            self.assertEqual(metadata.service_pool.qsize(), metadata.service_size)
+
+            # The connection opened by the worker, reused by every call
+            pool = metadata.transport.adapter.poolmanager.connection_from_url(self.server.url)
+            self.assertLessEqual(pool.num_connections, 4)
+
+
+    def test_session_refresh(self):
+        """Test the thread call after the session expired.
+
+        Should result in a single refresh shared by every chunk, each
+        chunk replayed with the new session ID, and the fault raised
+        without a refresh function.
+        """
+
+        refresh_list = []
+
+        def refresh():
+            refresh_list.append(1)
+            return self.server.metadata_access
+
+        metadata = Metadata(self.server.metadata_access, self.server.metadata_wsdl, refresh=refresh)
+        expired = Metadata(self.server.metadata_access, self.server.metadata_wsdl, retry=Retry(max_attempts=1))
+
+        token = self.server.token
+        self.server.token = 'FAKE_SESSION_ID_NEW'
+        try:
+            with metadata, expired:
+                record_list = metadata.read_metadata_thread('WorkflowRule', self.full_name_list, thread=8)
+
+                with self.assertRaises(MetadataError) as context:
+                    expired.read_metadata_thread('WorkflowRule', self.full_name_list[:10])
+        finally:
+            self.server.token = token
+
+        self.assertEqual([record['fullName'] for record in record_list], self.full_name_list)
+        self.assertEqual(len(refresh_list), 1)
+        self.assertEqual(metadata.soap_header['SessionHeader']['sessionId'], 'FAKE_SESSION_ID_NEW')
+        self.assertIn('INVALID_SESSION_ID', str(context.exception.args[0][0]['error']))
+
+
+    def test_chunk_error(self):
+        """Test a chunk that failed.
+
+        Should result in a Metadata error once every chunk finished, with
+        the error on its chunk and the result of the other chunk kept.
+        """
+
+        metadata = FailMetadata(self.server.metadata_access, self.server.metadata_wsdl, retry=Retry(max_attempts=1))
+        metadata.fail = self.full_name_list[25]
+
+        with metadata:
+            with self.assertRaises(MetadataError) as context:
+                metadata.read_metadata_thread('WorkflowRule', self.full_name_list, thread=4)
+
+        chunk_list = context.exception.args[0]
+
+        self.assertEqual([chunk['index'] for chunk in chunk_list], list(range(9)))
+        self.assertIsInstance(chunk_list[2]['error'], ValueError)
+        self.assertIsNone(chunk_list[2]['result'])
+        self.assertEqual(sum(len(chunk['result']) for chunk in chunk_list if chunk['error'] is None), 73)
+
+
+def suite():
+    """Test Suite"""
+
+    # Create the Unit Test Suite
+    suite = unittest.TestSuite()
+
+    # Add the Unit Test
+    suite.addTest(TestMetadataThread)
+
+    # Return the Test Suite
+    return suite
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
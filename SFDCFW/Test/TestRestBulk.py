@@ -0,0 +1,526 @@
+"""
+SFDCFW.Test.TestRestBulk
+~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import io
+import json
+import os
+import pathlib
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import requests
+
+from SFDCFW.Rest.Bulk import Bulk, BulkError, _csv_chunk
+from SFDCFW.Rest.Scheduler import Scheduler
+
+
+class FakeBulkTransport:
+    """Fake transport answering the Bulk API 2.0 resource."""
+
+    def __init__(self, row_list=None, state='JobComplete', poll_count=1):
+        self.row_list = row_list or []
+        self.state = state
+        self.poll_count = poll_count
+        self.lock = threading.Lock()
+        self.request_list = []
+        self.job_poll = {}
+        self.job_data = {}
+
+    def request(self, method, url, headers=None, data=None, params=None, **kwargs):
+        path = urlparse(url).path.split('/services/data/v54.0', 1)[-1]
+        params = params or {}
+        with self.lock:
+            self.request_list.append((method, path, params))
+
+        if method == 'POST' and path == '/jobs/query':
+            return self.response(200, json.dumps({'id': '750Q', 'state': 'UploadComplete'}))
+
+        if method == 'GET' and path == '/jobs/query/750Q':
+            # Report the job in progress for the first poll
+            self.poll_count -= 1
+            state = 'InProgress' if self.poll_count > 0 else self.state
+            return self.response(200, json.dumps({'id': '750Q', 'state': state}))
+
+        if method == 'GET' and path == '/jobs/query/750Q/results':
+            return self.page(int(params.get('locator', 0)), int(params.get('maxRecords', len(self.row_list) or 1)))
+
+        if method == 'POST' and path == '/jobs/ingest':
+            with self.lock:
+                id = f'750I{len(self.job_poll):011d}'
+                self.job_poll[id] = self.poll_count
+            return self.response(200, json.dumps({'id': id, 'state': 'Open'}))
+
+        if method == 'PUT' and path.endswith('/batches'):
+            # Read the streamed body if a file is uploaded
+            self.job_data[path.split('/')[3]] = data if isinstance(data, str) else data.read().decode()
+            return self.response(201, '')
+
+        if method == 'PATCH' and path.startswith('/jobs/ingest/'):
+            return self.response(200, json.dumps({'state': json.loads(data)['state']}))
+
+        if method == 'GET' and path.startswith('/jobs/ingest/750I') and path.count('/') == 3:
+            id = path.split('/')[3]
+            with self.lock:
+                # Report the job in progress for the first poll
+                self.job_poll[id] -= 1
+                state = 'InProgress' if self.job_poll[id] > 0 else self.state
+            return self.response(200, json.dumps({'id': id, 'state': state}))
+
+        if method == 'GET' and path == '/jobs/ingest/750I/failedResults/':
+            body = '"sf__Id","sf__Error",Name\n' + ''.join(f'"","INVALID: line\nbreak","{name}"\n' for _, name in self.row_list)
+            return self.response(200, body)
+
+        return self.response(404, '[]')
+
+    def page(self, offset, size):
+        row_list = self.row_list[offset : offset + size]
+        end = offset + len(row_list)
+
+        body = 'Id,Name\n' + ''.join(f'{id},"{name}"\n' for id, name in row_list)
+        r = self.response(200, body)
+        r.headers['Sforce-Locator'] = str(end) if end < len(self.row_list) else 'null'
+        r.headers['Sforce-NumberOfRecords'] = str(len(row_list))
+        return r
+
+    def response(self, status_code, body):
+        r = requests.Response()
+        r.status_code = status_code
+        r.raw = io.BytesIO(body.encode())
+        return r
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Handler sending the request body back as the response body."""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/csv')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class SocketBulkTransport(FakeBulkTransport):
+    """Fake transport streaming each result page over a real socket."""
+
+    def __init__(self, url, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.url = url
+
+    def page(self, offset, size):
+        fake = super().page(offset, size)
+
+        # Send the page through the echo server, read it back streamed
+        r = requests.post(self.url, data=fake.raw.read(), stream=True)
+        r.headers.update({name: fake.headers[name] for name in ('Sforce-Locator', 'Sforce-NumberOfRecords')})
+        return r
+
+
+def setUpModule():
+    """Set Up Module"""
+    pass
+
+
+def tearDownModule():
+    """Tear Down Module"""
+    pass
+
+
+class TestRestBulkQuery(unittest.TestCase):
+    """Test the Bulk query job with a fake transport."""
+
+    access = ('token', 'https://example.my.salesforce.com')
+
+    row_list = [(f'001{i:012d}', f'Account, {i}') for i in range(25)]
+
+
+    def test_query_job_row(self):
+        """Test the query job row generator.
+
+        Should result in every row across the page, with the header
+        row of each page parsed once.
+        """
+
+        transport = FakeBulkTransport(self.row_list, poll_count=2)
+        bulk = Bulk(self.access, transport=transport)
+
+        row_list = list(bulk.query_job('SELECT Id, Name FROM Account', max_records=10, poll=0))
+
+        self.assertEqual([(row['Id'], row['Name']) for row in row_list], self.row_list)
+        # Three page of result
+        self.assertEqual(len([r for r in transport.request_list if r[1].endswith('/results')]), 3)
+
+
+    def test_query_job_file(self):
+        """Test the query job written to file.
+
+        Should result in a CSV file with a single header row.
+        """
+
+        transport = FakeBulkTransport(self.row_list)
+        bulk = Bulk(self.access, transport=transport)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'Account.csv')
+
+            record_count = bulk.query_job('SELECT Id, Name FROM Account', path=path, max_records=10, poll=0)
+
+            with open(path) as f:
+                line_list = f.read().splitlines()
+
+        self.assertEqual(record_count, 25)
+        self.assertEqual(len(line_list), 26)
+        self.assertEqual(line_list.count('Id,Name'), 1)
+
+
+    def test_query_job_failure(self):
+        """Test the query job failure.
+
+        Should result in a BulkError.
+        """
+
+        bulk = Bulk(self.access, transport=FakeBulkTransport(state='Failed'))
+
+        with self.assertRaises(BulkError):
+            bulk.query_job('SELECT Id FROM Account', poll=0)
+
+
+class TestRestBulkQuerySocket(unittest.TestCase):
+    """Test the Bulk query job result streamed from a real socket."""
+
+    access = ('token', 'https://example.my.salesforce.com')
+
+    row_list = [(f'001{i:012d}', f'Account, {i}') for i in range(25)]
+
+    @classmethod
+    def setUpClass(cls):
+        """Start the echo server."""
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), EchoHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f'http://127.0.0.1:{cls.server.server_address[1]}/'
+
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the echo server."""
+        cls.server.shutdown()
+        cls.server.server_close()
+
+
+    def test_query_job_row(self):
+        """Test the query job row generator over a urllib3 stream.
+
+        Should result in every row across the page, the end of each
+        streamed body read without error.
+        """
+
+        bulk = Bulk(self.access, transport=SocketBulkTransport(self.url, self.row_list))
+
+        row_list = list(bulk.query_job('SELECT Id, Name FROM Account', max_records=10, poll=0))
+
+        self.assertEqual([(row['Id'], row['Name']) for row in row_list], self.row_list)
+
+
+class TestRestBulkResult(unittest.TestCase):
+    """Test the Bulk ingest job result with a fake transport."""
+
+    access = ('token', 'https://example.my.salesforce.com')
+
+    row_list = [(f'001{i:012d}', f'Account, {i}') for i in range(5)]
+
+
+    def test_get_result_row(self):
+        """Test the failed result row generator.
+
+        Should result in a row for each failed record, with the quoted
+        line break kept in the value.
+        """
+
+        bulk = Bulk(self.access, transport=FakeBulkTransport(self.row_list))
+
+        row_list = list(bulk.get_result('750I', 'failedResults'))
+
+        self.assertEqual([row['Name'] for row in row_list], [name for _, name in self.row_list])
+        self.assertEqual(row_list[0]['sf__Error'], 'INVALID: line\nbreak')
+
+
+    def test_get_result_file(self):
+        """Test the failed result written to file.
+
+        Should result in the number of record, not counting the quoted
+        line break.
+        """
+
+        bulk = Bulk(self.access, transport=FakeBulkTransport(self.row_list))
+
+        with tempfile.TemporaryDirectory() as directory:
+            record_count = bulk.get_result('750I', 'failedResults', path=os.path.join(directory, 'failed.csv'))
+
+        self.assertEqual(record_count, 5)
+
+
+    def test_get_result_unknown(self):
+        """Test an unknown result.
+
+        Should result in a ValueError.
+        """
+
+        bulk = Bulk(self.access, transport=FakeBulkTransport())
+
+        with self.assertRaises(ValueError):
+            bulk.get_result('750I', 'allResults')
+
+
+class TestRestBulkScheduler(unittest.TestCase):
+    """Test the Bulk ingest job scheduler with a fake transport."""
+
+    access = ('token', 'https://example.my.salesforce.com')
+
+
+    def test_scheduler(self):
+        """Test the scheduler run every job to completion.
+
+        Submit five job. Should result in the final status of each job,
+        in the order submitted, and a callback for each job.
+        """
+
+        transport = FakeBulkTransport(poll_count=3)
+        bulk = Bulk(self.access, transport=transport)
+        callback_list = []
+
+        with Scheduler(bulk, concurrency=2, poll=0.01, max_poll=0.05) as scheduler:
+            future_list = [scheduler.submit('Account', 'update', f'Id\n001{i:012d}\n', callback=callback_list.append)
+                           for i in range(5)]
+            status_list = scheduler.wait()
+
+        self.assertEqual([status['state'] for status in status_list], ['JobComplete'] * 5)
+        self.assertEqual([status['id'] for status in status_list], [future.result()['id'] for future in future_list])
+        self.assertEqual(len(callback_list), 5)
+        # Each job is checked until the third poll
+        self.assertEqual(len([r for r in transport.request_list if r[0] == 'GET']), 15)
+
+
+    def test_scheduler_check_error(self):
+        """Test the scheduler with a job that cannot be checked.
+
+        Should result in the future failed with a Bulk error, at once
+        for an error response, and after `max_error` check in a row for
+        an error raised.
+        """
+
+        class NotFoundBulk(Bulk):
+            def check_status(self, id):
+                return json.dumps([{'errorCode': 'NOT_FOUND', 'message': 'The requested resource does not exist'}])
+
+        class DownBulk(Bulk):
+            check_count = 0
+
+            def check_status(self, id):
+                self.check_count += 1
+                raise ValueError('<html>503 Service Unavailable</html>')
+
+        bulk = NotFoundBulk(self.access, transport=FakeBulkTransport())
+        with Scheduler(bulk, poll=0.01, max_poll=0.05) as scheduler:
+            future = scheduler.submit('Account', 'update', 'Id\n001000000000001\n')
+            with self.assertRaises(BulkError) as context:
+                future.result(timeout=3)
+
+        self.assertEqual(context.exception.args[0][0]['errorCode'], 'NOT_FOUND')
+
+        bulk = DownBulk(self.access, transport=FakeBulkTransport())
+        with Scheduler(bulk, poll=0.01, max_poll=0.05, max_error=3) as scheduler:
+            future = scheduler.submit('Account', 'update', 'Id\n001000000000001\n')
+            with self.assertRaises(BulkError):
+                future.result(timeout=3)
+
+        self.assertEqual(bulk.check_count, 3)
+
+
+    def test_wait_job_failed(self):
+        """Test waiting on a failed job.
+
+        Should result in the final status instead of waiting forever.
+        """
+
+        bulk = Bulk(self.access, transport=FakeBulkTransport(state='Failed'))
+        id = json.loads(bulk.create_job('delete', 'Account'))['id']
+
+        self.assertEqual(json.loads(bulk.wait_job(id, poll=0.01))['state'], 'Failed')
+
+
+class TestRestBulkIngest(unittest.TestCase):
+    """Test the streamed Bulk ingest with a fake transport."""
+
+    access = ('token', 'https://example.my.salesforce.com')
+
+
+    def test_csv_chunk_byte_limit(self):
+        """Test the data is split by byte size.
+
+        Should result in chunk no larger than the limit, each starting
+        with the header row, and no row lost.
+        """
+
+        row_list = ({'Id': f'001{i:012d}', 'Name': f'Account {i}'} for i in range(1000))
+
+        chunk_list = [chunk.read().decode() for chunk, _ in _csv_chunk(row_list, byte_limit=4096)]
+
+        self.assertTrue(all(len(chunk.encode()) <= 4096 for chunk in chunk_list))
+        self.assertTrue(all(chunk.startswith('Id,Name\n') for chunk in chunk_list))
+        self.assertEqual(sum(chunk.count('\n') - 1 for chunk in chunk_list), 1000)
+
+
+    def test_csv_chunk_memory(self):
+        """Test a chunk prepared as a request body.
+
+        Should result in the chunk kept in memory below the spool size,
+        with its size sent as the content length.
+        """
+
+        row_list = ({'Id': f'001{i:012d}', 'Name': f'Account {i}'} for i in range(100))
+
+        for chunk, _ in _csv_chunk(row_list, byte_limit=4096):
+            request = requests.Request('PUT', 'https://example.my.salesforce.com', data=chunk).prepare()
+
+            with chunk:
+                self.assertFalse(chunk._rolled)
+                self.assertEqual(chunk.tell(), 0)
+                self.assertEqual(int(request.headers['Content-Length']), len(chunk.read()))
+
+
+    def test_csv_chunk_oversize(self):
+        """Test a record larger than the byte limit.
+
+        Should result in a value error naming the record.
+        """
+
+        row_list = [{'Id': '001000000000001', 'Description': 'short'},
+                    {'Id': '001000000000002', 'Description': 'x' * 5000}]
+
+        with self.assertRaisesRegex(ValueError, 'Record 1 is'):
+            list(_csv_chunk(row_list, byte_limit=4096))
+
+
+    def test_csv_chunk_file(self):
+        """Test a CSV file is split on record boundary.
+
+        Should result in the quoted line break kept within its record.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'Account.csv')
+            with open(path, 'w') as f:
+                f.write('Id,Description\n')
+                for i in range(10):
+                    f.write(f'001{i:012d},"line\nbreak"\n')
+
+            chunk_list = [chunk.read().decode() for chunk, _ in _csv_chunk(path, byte_limit=10 ** 6, batch_limit=3)]
+
+        self.assertEqual(len(chunk_list), 4)
+        self.assertEqual(chunk_list[0], 'Id,Description\n' + ''.join(f'001{i:012d},"line\nbreak"\n' for i in range(3)))
+
+
+    def test_update_stream(self):
+        """Test the update stream every row to a Bulk job.
+
+        Should result in one job per chunk with every row uploaded.
+        """
+
+        transport = FakeBulkTransport()
+        bulk = Bulk(self.access, transport=transport)
+
+        row_list = ({'Id': f'001{i:012d}', 'Name': 'Updated'} for i in range(25))
+        status_list = bulk.update('Account', row_list, batch_limit=10)
+
+        self.assertEqual([status['state'] for status in status_list], ['JobComplete'] * 3)
+        self.assertEqual(sum(data.count('\n') - 1 for data in transport.job_data.values()), 25)
+
+
+    def test_create_data(self):
+        """Test the create of a CSV string.
+
+        Should result in a single job uploading the string as is, even
+        without a line break.
+        """
+
+        for data in ('Name', 'Name\nAcme', 'Name\nAcme\n'):
+            transport = FakeBulkTransport()
+            bulk = Bulk(self.access, transport=transport)
+
+            self.assertEqual(json.loads(bulk.create('Account', data))['state'], 'UploadComplete', data)
+            self.assertEqual(list(transport.job_data.values()), [data])
+
+
+    def test_create_path(self):
+        """Test the create of a CSV file.
+
+        Should result in the file streamed through ingest, for a string
+        and a path-like path.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'Account.csv')
+            with open(path, 'w') as f:
+                f.write('Name\nAcme')
+
+            for data in (path, pathlib.Path(path)):
+                transport = FakeBulkTransport()
+                bulk = Bulk(self.access, transport=transport)
+
+                status_list = bulk.create('Account', data)
+
+                self.assertEqual([status['state'] for status in status_list], ['JobComplete'])
+                self.assertEqual(list(transport.job_data.values()), ['Name\nAcme'])
+
+
+    def test_empty_pipeline(self):
+        """Test the empty stream the queried ID into delete job.
+
+        Should result in every ID deleted across the sharded job, and a
+        progress report for each job submitted and completed.
+        """
+
+        row_list = [(f'001{i:012d}', '') for i in range(30)]
+        transport = FakeBulkTransport(row_list)
+        bulk = Bulk(self.access, transport=transport)
+        progress_list = []
+
+        status_list = bulk.empty('Account', batch_size=10, progress=progress_list.append)
+
+        self.assertEqual(len(status_list), 3)
+        self.assertEqual(sorted(''.join(transport.job_data.values()).split()),
+                         sorted(['Id'] * 3 + [id for id, _ in row_list]))
+        self.assertEqual(len(progress_list), 6)
+        self.assertEqual(progress_list[-1]['record'], 30)
+        self.assertEqual(progress_list[-1]['complete'], 3)
+
+
+def suite():
+    """Test Suite"""
+
+    # Create the Unit Test Suite
+    suite = unittest.TestSuite()
+
+    # Add the Unit Test
+    suite.addTest(TestRestBulkQuery)
+    suite.addTest(TestRestBulkQuerySocket)
+    suite.addTest(TestRestBulkResult)
+    suite.addTest(TestRestBulkScheduler)
+    suite.addTest(TestRestBulkIngest)
+
+    # Return the Test Suite
+    return suite
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
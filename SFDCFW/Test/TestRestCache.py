@@ -0,0 +1,251 @@
+"""
+SFDCFW.Test.TestRestCache
+~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import json
+import tempfile
+import threading
+import unittest
+
+import requests
+
+from SFDCFW.Rest.Cache import ResponseCache
+from SFDCFW.Rest.SObject import SObject
+
+
+# The Last-Modified header of every describe
+LAST_MODIFIED = 'Tue, 18 Oct 2022 10:00:00 GMT'
+
+
+class FakeTransport:
+    """Fake transport answering the describe resource conditionally."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.request_list = []
+
+    def get(self, url, headers=None, **kwargs):
+        with self.lock:
+            self.request_list.append((url, headers))
+
+        label = url.split('/')[-2]
+
+        r = requests.Response()
+
+        # Not modified since the client copy
+        if headers.get('If-Modified-Since') == LAST_MODIFIED:
+            r.status_code = 304
+            r._content = b''
+            return r
+
+        r.status_code = 200
+        r.headers['Last-Modified'] = LAST_MODIFIED
+        r._content = json.dumps({'name': label, 'fields': [{'name': 'Id'}]}).encode()
+        return r
+
+
+class FakeRecordTransport:
+    """Fake transport answering the record resource with an ETag."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.request_list = []
+        self.version = {}
+
+    def request(self, method, url, headers=None, **kwargs):
+        with self.lock:
+            self.request_list.append((method, url, headers))
+
+        r = requests.Response()
+
+        if method in ('PATCH', 'DELETE'):
+            # Change the version of the record
+            self.version[url] = self.version.get(url, 0) + 1
+            r.status_code = 204
+            r._content = b''
+            return r
+
+        etag = f'"{self.version.get(url, 0)}"'
+
+        # Not modified since the client copy
+        if headers.get('If-None-Match') == etag:
+            r.status_code = 304
+            r._content = b''
+            return r
+
+        r.status_code = 200
+        r.headers['ETag'] = etag
+        r._content = json.dumps({'Id': url.rsplit('/', 1)[-1], 'version': etag}).encode()
+        return r
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request('PATCH', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+
+def setUpModule():
+    """Set Up Module"""
+    pass
+
+
+def tearDownModule():
+    """Tear Down Module"""
+    pass
+
+
+class TestRestCache(unittest.TestCase):
+    """Test the describe cache with a fake transport."""
+
+    access = ('token', 'https://example.my.salesforce.com')
+
+
+    def test_describe_revalidate(self):
+        """Test the describe is revalidated.
+
+        Describe the Account twice. Should result in the second request
+        sent with If-Modified-Since, answered with a 304 and the cached
+        describe returned.
+        """
+
+        transport = FakeTransport()
+        sobject = SObject(self.access, transport=transport)
+
+        first = sobject.Account.describe()
+        second = sobject.Account.describe()
+
+        self.assertEqual(json.loads(first)['name'], 'Account')
+        self.assertEqual(second, first)
+        self.assertNotIn('If-Modified-Since', transport.request_list[0][1])
+        self.assertEqual(transport.request_list[1][1]['If-Modified-Since'], LAST_MODIFIED)
+
+
+    def test_describe_disk(self):
+        """Test the describe cache on disk.
+
+        Describe with a new cache on the same directory. Should result
+        in the first request already revalidated.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+            SObject(self.access,
+                    transport=FakeTransport(),
+                    describe_cache=ResponseCache(path=directory)).Contact.describe()
+
+            transport = FakeTransport()
+            sobject = SObject(self.access, transport=transport, describe_cache=ResponseCache(path=directory))
+
+            self.assertEqual(json.loads(sobject.Contact.describe())['name'], 'Contact')
+            self.assertEqual(transport.request_list[0][1]['If-Modified-Since'], LAST_MODIFIED)
+
+
+    def test_lru_eviction(self):
+        """Test the least recently used response is evicted.
+
+        Should result in no more response than the limit, keeping the
+        most recently used.
+        """
+
+        cache = ResponseCache(maxsize=2)
+        cache.set('a', 'A')
+        cache.set('b', 'B')
+        cache.get('a')
+        cache.set('c', 'C')
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a')['body'], 'A')
+
+
+    def test_size_eviction(self):
+        """Test the response is evicted by size.
+
+        Should result in a total size within the limit.
+        """
+
+        cache = ResponseCache(max_bytes=10)
+        for key in 'abcd':
+            cache.set(key, key * 4)
+
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.size, 10)
+
+
+class TestRestReadCache(unittest.TestCase):
+    """Test the record read cache with a fake transport."""
+
+    access = ('token', 'https://example.my.salesforce.com')
+
+
+    def test_read_not_cached(self):
+        """Test the read without a read cache.
+
+        Should result in no conditional request.
+        """
+
+        transport = FakeRecordTransport()
+        sobject = SObject(self.access, transport=transport)
+
+        sobject.Account.read('001000000000001')
+        sobject.Account.read('001000000000001')
+
+        self.assertTrue(all('If-None-Match' not in headers for _, _, headers in transport.request_list))
+
+
+    def test_read_etag(self):
+        """Test the read is revalidated with the ETag.
+
+        Should result in the second read answered with a 304 and the
+        same record.
+        """
+
+        transport = FakeRecordTransport()
+        sobject = SObject(self.access, transport=transport, read_cache=ResponseCache())
+
+        first = sobject.Account.read('001000000000001')
+        second = sobject.Account.read('001000000000001')
+
+        self.assertEqual(second, first)
+        self.assertEqual(transport.request_list[1][2]['If-None-Match'], '"0"')
+
+
+    def test_read_invalidate(self):
+        """Test the update invalidate the cached read.
+
+        Should result in the read after the update sent without a
+        validator and returning the new version.
+        """
+
+        transport = FakeRecordTransport()
+        sobject = SObject(self.access, transport=transport, read_cache=ResponseCache())
+
+        sobject.Account.read('001000000000001')
+        sobject.Account.update('001000000000001', '{}')
+        record = json.loads(sobject.Account.read('001000000000001'))
+
+        self.assertEqual(record['version'], '"1"')
+        self.assertNotIn('If-None-Match', transport.request_list[-1][2])
+
+
+def suite():
+    """Test Suite"""
+
+    # Create the Unit Test Suite
+    suite = unittest.TestSuite()
+
+    # Add the Unit Test
+    suite.addTest(TestRestCache)
+    suite.addTest(TestRestReadCache)
+
+    # Return the Test Suite
+    return suite
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
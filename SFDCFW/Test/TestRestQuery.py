@@ -0,0 +1,258 @@
+"""
+SFDCFW.Test.TestRestQuery
+~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import json
+import re
+import threading
+import time
+import unittest
+
+import requests
+
+from SFDCFW.Rest.Query import Query, _id_to_int, _int_to_id
+
+
+class FakeTransport:
+    """Fake transport answering the query resource with paging."""
+
+    def __init__(self, size, page_size=10):
+        self.size = size
+        self.page_size = page_size
+        self.lock = threading.Lock()
+        self.url_list = []
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        with self.lock:
+            self.url_list.append(url)
+
+        # Get the page offset from the next records URL
+        offset = int(url.rsplit('-', 1)[-1]) if '/query/01g' in url else 0
+        end = min(offset + self.page_size, self.size)
+
+        body = {
+            'totalSize': self.size,
+            'done': end >= self.size,
+            'records': [{'Id': f'001{i:012d}'} for i in range(offset, end)]
+        }
+        if not body['done']:
+            body['nextRecordsUrl'] = f'/services/data/v54.0/query/01gxx00000000001-{end}'
+
+        r = requests.Response()
+        r.status_code = 200
+        r._content = json.dumps(body).encode()
+        return r
+
+
+class FakePartitionTransport:
+    """Fake transport answering the query resource with an ID range filter."""
+
+    def __init__(self, id_list):
+        self.id_list = sorted(id_list)
+        self.lock = threading.Lock()
+        self.query_list = []
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        query = params['q']
+        with self.lock:
+            self.query_list.append(query)
+
+        if query.endswith('ASC LIMIT 1'):
+            id_list = self.id_list[:1]
+        elif query.endswith('DESC LIMIT 1'):
+            id_list = self.id_list[-1:]
+        else:
+            # Filter the ID with the range predicate
+            lower = re.search(r"Id >= '(\w+)'", query)
+            upper = re.search(r"Id < '(\w+)'", query)
+            id_list = [id for id in self.id_list
+                       if (lower is None or id[:15] >= lower.group(1)[:15])
+                       and (upper is None or id[:15] < upper.group(1)[:15])]
+
+        r = requests.Response()
+        r.status_code = 200
+        r._content = json.dumps({
+            'totalSize': len(id_list),
+            'done': True,
+            'records': [{'Id': id} for id in id_list]
+        }).encode()
+        return r
+
+
+def setUpModule():
+    """Set Up Module"""
+    pass
+
+
+def tearDownModule():
+    """Tear Down Module"""
+    pass
+
+
+class TestRestQueryIter(unittest.TestCase):
+    """Test the Query iterator with a fake transport."""
+
+    access = ('token', 'https://example.my.salesforce.com')
+
+
+    def test_query_iter_all_page(self):
+        """Test the query iterator follow every page.
+
+        Should result in every record, in order, and one request per
+        page.
+        """
+
+        transport = FakeTransport(95)
+        query = Query(self.access, transport=transport)
+
+        record_list = list(query.query_iter('SELECT Id FROM Account'))
+
+        self.assertEqual([record['Id'] for record in record_list], [f'001{i:012d}' for i in range(95)])
+        self.assertEqual(len(transport.url_list), 10)
+
+
+    def test_query_iter_bounded_prefetch(self):
+        """Test the query iterator prefetch is bounded.
+
+        Consume a single record and stop. Should result in no more page
+        fetched than the prefetch depth plus the one in hand.
+        """
+
+        transport = FakeTransport(1000)
+        query = Query(self.access, transport=transport)
+
+        iterator = query.query_iter('SELECT Id FROM Account', prefetch=2)
+        next(iterator)
+        iterator.close()
+
+        self.assertLessEqual(len(transport.url_list), 4)
+
+
+    def test_query_iter_failure(self):
+        """Test the query iterator with a failed page.
+
+        Should result in the HTTP error raised to the caller.
+        """
+
+        transport = FakeTransport(0)
+
+        def get(url, **kwargs):
+            r = requests.Response()
+            r.status_code = 400
+            r.url = url
+            return r
+
+        transport.get = get
+        query = Query(self.access, transport=transport)
+
+        with self.assertRaises(requests.HTTPError):
+            list(query.query_iter('SELECT Bad FROM Account'))
+
+
+class TestRestQueryPartition(unittest.TestCase):
+    """Test the partitioned Query with a fake transport."""
+
+    access = ('token', 'https://example.my.salesforce.com')
+
+
+    def test_partition_query(self):
+        """Test the query rewrite.
+
+        Should result in one query per partition with the range
+        predicate combined with the existing condition.
+        """
+
+        transport = FakePartitionTransport([_int_to_id(_id_to_int('001000000000000') + i) for i in range(100)])
+        query = Query(self.access, transport=transport)
+
+        query_list = query.partition("SELECT Id FROM Account WHERE Name != 'x' ORDER BY Id", partition=4)
+
+        self.assertEqual(len(query_list), 4)
+        self.assertTrue(query_list[0].startswith("SELECT Id FROM Account WHERE (Name != 'x') AND Id < '"))
+        self.assertTrue(query_list[-1].endswith(' ORDER BY Id'))
+
+
+    def test_partition_query_unsupported(self):
+        """Test the query rewrite with a LIMIT.
+
+        Should result in a ValueError.
+        """
+
+        query = Query(self.access, transport=FakePartitionTransport([]))
+
+        with self.assertRaises(ValueError):
+            query.partition('SELECT Id FROM Account LIMIT 10')
+
+
+    def test_query_partition_merge(self):
+        """Test the partitioned query merge every partition.
+
+        Should result in every record exactly once.
+        """
+
+        id_list = [_int_to_id(_id_to_int('001000000000000') + i * 7919) for i in range(500)]
+        transport = FakePartitionTransport(id_list)
+        query = Query(self.access, transport=transport)
+
+        record_list = list(query.query_partition('SELECT Id FROM Account', partition=8, thread=3, dedupe=True))
+
+        self.assertEqual(sorted(record['Id'] for record in record_list), sorted(id_list))
+        # Two boundary query and one query per partition
+        self.assertEqual(len(transport.query_list), 10)
+
+
+    def test_query_partition_stop(self):
+        """Test the partitioned query stopped early.
+
+        Should result in no query for the partition not started when
+        the caller stopped.
+        """
+
+        id_list = [_int_to_id(_id_to_int('001000000000000') + i * 7919) for i in range(500)]
+        transport = FakePartitionTransport(id_list)
+        query = Query(self.access, transport=transport)
+
+        record_iter = query.query_partition('SELECT Id FROM Account', partition=8, thread=1, prefetch=1)
+        next(record_iter)
+        record_iter.close()
+
+        # Let the running producer see the stop
+        time.sleep(0.3)
+
+        # Two boundary query and the query of the first partition
+        self.assertEqual(len(transport.query_list), 3)
+
+
+    def test_query_partition_dedupe_no_id(self):
+        """Test the dedupe of a query without Id.
+
+        Should result in a ValueError before any request.
+        """
+
+        transport = FakePartitionTransport([])
+        query = Query(self.access, transport=transport)
+
+        with self.assertRaisesRegex(ValueError, 'select Id'):
+            list(query.query_partition('SELECT Name, (SELECT Id FROM Contacts) FROM Account', dedupe=True))
+
+        self.assertEqual(transport.query_list, [])
+
+
+def suite():
+    """Test Suite"""
+
+    # Create the Unit Test Suite
+    suite = unittest.TestSuite()
+
+    # Add the Unit Test
+    suite.addTest(TestRestQueryIter)
+    suite.addTest(TestRestQueryPartition)
+
+    # Return the Test Suite
+    return suite
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
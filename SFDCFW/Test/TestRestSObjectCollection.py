@@ -0,0 +1,238 @@
+"""
+SFDCFW.Test.TestRestSObjectCollection
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import json
+import threading
+import unittest
+
+import requests
+
+from SFDCFW.Rest.SObject import SObject
+
+
+class FakeTransport:
+    """Fake transport answering the SObject Collections resource."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.request_list = []
+
+    def request(self, method, url, headers=None, data=None, params=None, **kwargs):
+        with self.lock:
+            self.request_list.append((method, url, data, params))
+
+        r = requests.Response()
+        r.status_code = 200
+
+        if method == 'DELETE':
+            ids = params['ids'].split(',')
+            body = [{'id': id, 'success': True, 'errors': []} for id in ids]
+        elif 'ids' in json.loads(data):
+            payload = json.loads(data)
+            # Answer null for the ID ending with `x` (not found)
+            body = [None if id.endswith('x') else dict({field: field for field in payload['fields']}, Id=id)
+                    for id in payload['ids']]
+        else:
+            records = json.loads(data)['records']
+            body = [{'id': record.get('Id', record.get('Name')), 'success': True, 'errors': []} for record in records]
+
+        r._content = json.dumps(body).encode()
+        return r
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request('PATCH', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+
+def setUpModule():
+    """Set Up Module"""
+    pass
+
+
+def tearDownModule():
+    """Tear Down Module"""
+    pass
+
+
+class TestRestSObjectCollection(unittest.TestCase):
+    """Test the SObject Collections create, update and delete."""
+
+    def setUp(self):
+        """Prepare test set up.
+
+        Create the SObject with a fake transport.
+        """
+
+        self.transport = FakeTransport()
+        self.sobject = SObject(('token', 'https://example.my.salesforce.com'), transport=self.transport)
+
+
+    def test_create_many_order(self):
+        """Test create many keep the record order.
+
+        Create 450 Account. Should result in three request of at most
+        200 record and the result in the same order as the record.
+        """
+
+        records = [{'Name': f'Account-{i}'} for i in range(450)]
+
+        result = self.sobject.Account.create_many(records, thread=3)
+
+        self.assertEqual([r['id'] for r in result], [r['Name'] for r in records])
+        self.assertEqual(sorted(len(json.loads(data)['records']) for _, _, data, _ in self.transport.request_list),
+                         [50, 200, 200])
+
+        payload = json.loads(self.transport.request_list[0][2])
+        self.assertFalse(payload['allOrNone'])
+        self.assertEqual(payload['records'][0]['attributes'], {'type': 'Account'})
+
+
+    def test_all_or_none(self):
+        """Test all or none over one and many chunk.
+
+        Should result in a single all or none request for 200 record,
+        and a value error before any request past it, as the chunk
+        would not be rolled back together.
+        """
+
+        records = [{'Id': f'001{i:012d}', 'Name': 'Updated'} for i in range(201)]
+
+        result = self.sobject.Account.update_many(records[:200], all_or_none=True)
+
+        self.assertEqual(len(result), 200)
+        self.assertEqual(len(self.transport.request_list), 1)
+        self.assertTrue(json.loads(self.transport.request_list[0][2])['allOrNone'])
+
+        self.transport.request_list.clear()
+
+        with self.assertRaisesRegex(ValueError, 'limited to 200'):
+            self.sobject.Account.create_many([{'Name': 'A'}] * 201, all_or_none=True)
+        with self.assertRaisesRegex(ValueError, 'limited to 200'):
+            self.sobject.Account.update_many(records, all_or_none=True)
+        with self.assertRaisesRegex(ValueError, 'limited to 200'):
+            self.sobject.Account.delete_many([record['Id'] for record in records], all_or_none=True)
+
+        self.assertEqual(self.transport.request_list, [])
+
+
+    def test_update_many(self):
+        """Test update many.
+
+        Should result in a PATCH request with the result for each record.
+        """
+
+        records = [{'Id': f'001{i:012d}', 'Name': 'Updated'} for i in range(5)]
+
+        result = self.sobject.Contact.update_many(records)
+
+        self.assertEqual([r['id'] for r in result], [r['Id'] for r in records])
+        self.assertEqual(self.transport.request_list[0][0], 'PATCH')
+
+
+    def test_update_many_generator(self):
+        """Test update many from a generator.
+
+        Should result in every record sent and a result for each record.
+        """
+
+        ids = [f'001{i:012d}' for i in range(250)]
+
+        result = self.sobject.Contact.update_many({'Id': id, 'Name': 'Updated'} for id in ids)
+
+        self.assertEqual([r['id'] for r in result], ids)
+        self.assertEqual(len(self.transport.request_list), 2)
+
+
+    def test_update_many_no_id(self):
+        """Test update many with a record without Id.
+
+        Should result in a value error naming the record, before any
+        request.
+        """
+
+        records = [{'Id': '001000000000001', 'Name': 'Updated'}, {'Name': 'Updated'}]
+
+        with self.assertRaisesRegex(ValueError, 'Record 1 has no Id'):
+            self.sobject.Contact.update_many(records)
+
+        self.assertEqual(self.transport.request_list, [])
+
+
+    def test_delete_many(self):
+        """Test delete many.
+
+        Delete 201 ID. Should result in two request with the ID in the
+        query string and the result in the same order as the ID.
+        """
+
+        ids = [f'001{i:012d}' for i in range(201)]
+
+        result = self.sobject.Account.delete_many(ids)
+
+        self.assertEqual([r['id'] for r in result], ids)
+        self.assertEqual(len(self.transport.request_list), 2)
+        self.assertTrue(all(params['allOrNone'] == 'false' for _, _, _, params in self.transport.request_list))
+
+
+    def test_read_many(self):
+        """Test read many.
+
+        Read 4,500 ID with one not found. Should result in three request
+        of at most 2,000 ID and a dictionary keyed by ID without the not
+        found record.
+        """
+
+        ids = [f'001{i:012d}' for i in range(4499)] + ['001xxxxxxxxxxxx']
+
+        result = self.sobject.Account.read_many(ids, fields=['Name'])
+
+        self.assertEqual(list(result), ids[:-1])
+        self.assertEqual(result[ids[0]], {'Id': ids[0], 'Name': 'Name'})
+        self.assertEqual(sorted(len(json.loads(data)['ids']) for _, _, data, _ in self.transport.request_list),
+                         [500, 2000, 2000])
+        self.assertTrue(all(url.endswith('/composite/sobjects/Account') for _, url, _, _ in self.transport.request_list))
+
+
+    def test_create_many_failure(self):
+        """Test create many with a failed request.
+
+        Should result in a failure result for each record of the chunk.
+        """
+
+        def request(method, url, **kwargs):
+            r = requests.Response()
+            r.status_code = 400
+            r._content = json.dumps([{'errorCode': 'INVALID_FIELD', 'message': 'Bad'}]).encode()
+            return r
+
+        self.transport.request = request
+
+        result = self.sobject.Account.create_many([{'Name': 'A'}, {'Name': 'B'}])
+
+        self.assertEqual([r['success'] for r in result], [False, False])
+        self.assertEqual(result[0]['errors'][0]['errorCode'], 'INVALID_FIELD')
+
+
+def suite():
+    """Test Suite"""
+
+    # Create the Unit Test Suite
+    suite = unittest.TestSuite()
+
+    # Add the Unit Test
+    suite.addTest(TestRestSObjectCollection)
+
+    # Return the Test Suite
+    return suite
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
@@ -0,0 +1,244 @@
+"""
+SFDCFW.Test.TestRetry
+~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import asyncio
+import io
+import json
+import unittest
+
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+from zeep.exceptions import Fault
+
+from SFDCFW.Retry import Retry
+from SFDCFW.Rest.SObject import SObject
+from SFDCFW.Transport import Transport
+
+
+class FakeSession:
+    """Fake session answering with each response of a list in turn."""
+
+    def __init__(self, response_list):
+        self.response_list = list(response_list)
+        self.body_list = []
+        self.headers = {}
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def request(self, method, url, data=None, **kwargs):
+        # Read the body as the server would
+        self.body_list.append(data.read() if hasattr(data, 'read') else data)
+
+        response = self.response_list.pop(0)
+        if isinstance(response, Exception):
+            raise response
+
+        status_code, body = response
+        r = requests.Response()
+        r.status_code = status_code
+        r.raw = io.BytesIO(json.dumps(body).encode())
+        return r
+
+
+def setUpModule():
+    """Set Up Module"""
+    pass
+
+
+def tearDownModule():
+    """Tear Down Module"""
+    pass
+
+
+class TestRetry(unittest.TestCase):
+    """Test the retry policy."""
+
+    access = ('token', 'https://example.my.salesforce.com')
+
+    # Retry without waiting
+    retry = Retry(backoff=0, max_backoff=0)
+
+
+    def test_delays(self):
+        """Test the delay before each retry.
+
+        Should result in one delay less than the attempt, growing
+        exponentially, and none past the maximum elapsed time.
+        """
+
+        delay_list = list(Retry(max_attempts=4, backoff=1, jitter=0).delays())
+
+        self.assertEqual(delay_list, [1, 2, 4])
+        self.assertEqual(list(Retry(backoff=1, max_elapsed=0.5).delays()), [])
+
+
+    def test_transient_response(self):
+        """Test the transient error response is retried.
+
+        Should result in the record read after a 503 and a lock error,
+        with the retry counted.
+        """
+
+        lock_error = [{'errorCode': 'UNABLE_TO_LOCK_ROW', 'message': 'unable to obtain exclusive access'}]
+        session = FakeSession([(503, []), (400, lock_error), (200, {'Id': '001000000000001'})])
+        transport = Transport(session=session, retry=self.retry)
+
+        r = transport.get('https://example.my.salesforce.com/services/data/v54.0/sobjects/Account/001000000000001')
+
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.retry_count, 2)
+
+
+    def test_permanent_response(self):
+        """Test the permanent error response is not retried.
+
+        Should result in the SObject read returning None after a single
+        request.
+        """
+
+        session = FakeSession([(404, [{'errorCode': 'NOT_FOUND'}])])
+        sobject = SObject(self.access, transport=Transport(session=session, retry=self.retry))
+
+        self.assertIsNone(sobject.Account.read('001000000000001'))
+        self.assertEqual(len(session.body_list), 1)
+
+
+    def test_connection_error(self):
+        """Test the connection error is retried.
+
+        Should result in the file body sent again from the start, and the
+        error raised once out of attempt.
+        """
+
+        session = FakeSession([requests.ConnectionError(), (201, {})])
+        transport = Transport(session=session, retry=self.retry)
+
+        r = transport.put('https://example.my.salesforce.com/services/data/v54.0/jobs/ingest/750/batches',
+                          data=io.BytesIO(b'Id\n001000000000001\n'))
+
+        self.assertEqual(r.status_code, 201)
+        self.assertEqual(session.body_list, [b'Id\n001000000000001\n'] * 2)
+
+        session = FakeSession([requests.ConnectionError()] * 2)
+        transport = Transport(session=session, retry=Retry(max_attempts=2, backoff=0))
+
+        with self.assertRaises(requests.ConnectionError):
+            transport.get('https://example.my.salesforce.com/services/data/v54.0/limits')
+
+
+    def test_post_not_resent(self):
+        """Test a POST is not sent again once it may have been applied.
+
+        Should result in the read timeout and 503 raised or returned
+        after a single request, where a GET is retried.
+        """
+
+        url = 'https://example.my.salesforce.com/services/data/v54.0/sobjects/Account'
+
+        session = FakeSession([requests.ReadTimeout(), (201, {'id': '001000000000001'})])
+        transport = Transport(session=session, retry=self.retry)
+
+        with self.assertRaises(requests.ReadTimeout):
+            transport.post(url, data='{"Name": "Example"}')
+        self.assertEqual(len(session.body_list), 1)
+
+        session = FakeSession([(503, []), (201, {'id': '001000000000001'})])
+        transport = Transport(session=session, retry=self.retry)
+
+        self.assertEqual(transport.patch(f'{url}/001000000000001', data='{}').status_code, 503)
+        self.assertEqual(len(session.body_list), 1)
+
+        session = FakeSession([requests.ReadTimeout(), (200, {})])
+        transport = Transport(session=session, retry=self.retry)
+
+        self.assertEqual(transport.get(url).status_code, 200)
+        self.assertEqual(len(session.body_list), 2)
+
+
+    def test_post_not_applied(self):
+        """Test a POST retried when it was not applied.
+
+        Should result in the POST sent again after a connect timeout, a
+        refused connection and a lock error.
+        """
+
+        url = 'https://example.my.salesforce.com/services/data/v54.0/sobjects/Account'
+        refused = requests.ConnectionError(MaxRetryError(None, url, NewConnectionError(None, 'Connection refused')))
+        lock_error = [{'errorCode': 'UNABLE_TO_LOCK_ROW', 'message': 'unable to obtain exclusive access'}]
+
+        session = FakeSession([requests.ConnectTimeout(), refused, (400, lock_error), (201, {'id': '001000000000001'})])
+        transport = Transport(session=session, retry=self.retry)
+
+        r = transport.post(url, data='{"Name": "Example"}')
+
+        self.assertEqual(r.status_code, 201)
+        self.assertEqual(r.retry_count, 3)
+
+
+    def test_soap_fault(self):
+        """Test the SOAP fault is classified by error code.
+
+        Should result in the lock error retried and the invalid field
+        error raised at once.
+        """
+
+        attempt_list = []
+
+        def read_metadata(fault):
+            attempt_list.append(fault)
+            if len(attempt_list) < 3:
+                raise Fault(fault, code=f'sf:{fault}')
+            return ['result']
+
+        self.assertEqual(self.retry.call(read_metadata, 'UNABLE_TO_LOCK_ROW'), ['result'])
+        self.assertEqual(len(attempt_list), 3)
+
+        attempt_list.clear()
+        with self.assertRaises(Fault):
+            self.retry.call(read_metadata, 'INVALID_FIELD')
+        self.assertEqual(len(attempt_list), 1)
+
+
+    def test_call_async(self):
+        """Test the retry of a coroutine function.
+
+        Should result in the lock error retried and the invalid field
+        error raised at once, as with the synchronous call.
+        """
+
+        attempt_list = []
+
+        async def read_metadata(fault):
+            attempt_list.append(fault)
+            if len(attempt_list) < 3:
+                raise Fault(fault, code=f'sf:{fault}')
+            return ['result']
+
+        self.assertEqual(asyncio.run(self.retry.call_async(read_metadata, 'UNABLE_TO_LOCK_ROW')), ['result'])
+        self.assertEqual(len(attempt_list), 3)
+
+        attempt_list.clear()
+        with self.assertRaises(Fault):
+            asyncio.run(self.retry.call_async(read_metadata, 'INVALID_FIELD'))
+        self.assertEqual(len(attempt_list), 1)
+
+
+def suite():
+    """Test Suite"""
+
+    # Create the Unit Test Suite
+    suite = unittest.TestSuite()
+
+    # Add the Unit Test
+    suite.addTest(TestRetry)
+
+    # Return the Test Suite
+    return suite
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
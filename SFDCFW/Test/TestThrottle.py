@@ -0,0 +1,160 @@
+"""
+SFDCFW.Test.TestThrottle
+~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import threading
+import time
+import unittest
+
+import requests
+
+from SFDCFW.Throttle import ApiUsage, Throttle
+from SFDCFW.Transport import Transport
+
+
+class FakeSession:
+    """Fake session answering every request with the API usage header."""
+
+    def __init__(self, used, limit=15000):
+        self.used = used
+        self.limit = limit
+        self.headers = {}
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def request(self, method, url, **kwargs):
+        self.used += 1
+
+        r = requests.Response()
+        r.status_code = 200
+        r.headers['Sforce-Limit-Info'] = f'api-usage={self.used}/{self.limit}'
+        r._content = b'{}'
+        return r
+
+
+def setUpModule():
+    """Set Up Module"""
+    pass
+
+
+def tearDownModule():
+    """Tear Down Module"""
+    pass
+
+
+class TestThrottle(unittest.TestCase):
+    """Test the API usage gauge and the throttle policy."""
+
+    def test_usage_header(self):
+        """Test the Sforce-Limit-Info header parsing.
+
+        Should result in the organization usage, not the per app usage.
+        """
+
+        usage = ApiUsage()
+
+        self.assertTrue(usage.update('per-app-api-usage=17/250(appName=App), api-usage=300/15000'))
+        self.assertEqual((usage.used, usage.limit), (300, 15000))
+        self.assertAlmostEqual(usage.ratio, 0.02)
+        self.assertFalse(usage.update(None))
+
+
+    def test_delay_by_priority(self):
+        """Test the delay of each priority.
+
+        Should result in the low priority paused, the normal priority
+        slowed and the high priority untouched at 90% usage.
+        """
+
+        usage = ApiUsage()
+        usage.update('api-usage=9000/10000')
+        throttle = Throttle(max_delay=5)
+
+        self.assertIsNone(throttle.delay(usage, 'low'))
+        self.assertAlmostEqual(throttle.delay(usage, 'normal'), 2.5)
+        self.assertEqual(throttle.delay(usage, 'high'), 0)
+
+
+    def test_pause_resume(self):
+        """Test a paused request resume when the usage drop.
+
+        Should result in the request waiting until the usage update.
+        """
+
+        usage = ApiUsage()
+        usage.update('api-usage=9000/10000')
+        throttle = Throttle(probe=10)
+
+        timer = threading.Timer(0.2, usage.update, ['api-usage=100/10000'])
+        timer.start()
+
+        waited = throttle.wait(usage, 'low')
+        timer.join()
+
+        self.assertGreaterEqual(waited, 0.2)
+        self.assertLess(waited, 5)
+
+
+    def test_pause_probe(self):
+        """Test a paused request probe a stale usage.
+
+        Should result in the request going through once the usage is
+        older than the probe interval.
+        """
+
+        usage = ApiUsage()
+        usage.update('api-usage=9000/10000')
+        throttle = Throttle(probe=0.1)
+
+        start = time.monotonic()
+        throttle.wait(usage, 'low')
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+
+    def test_transport_usage(self):
+        """Test the transport gauge and throttle.
+
+        Should result in the usage updated from each response and the low
+        priority request slowed near the limit.
+        """
+
+        transport = Transport(session=FakeSession(used=8949, limit=10000),
+                              throttle=Throttle(policy={'low': (0.8, 0.99)}, max_delay=1.9),
+                              priority='low')
+        url = 'https://example.my.salesforce.com/services/data/v54.0/limits'
+
+        transport.get(url)
+        self.assertEqual(transport.usage.used, 8950)
+
+        # Half way between the slow and pause threshold
+        start = time.monotonic()
+        transport.get(url)
+        self.assertGreaterEqual(time.monotonic() - start, 0.9)
+
+        # The high priority is never slowed
+        start = time.monotonic()
+        transport.get(url, priority='high')
+        self.assertLess(time.monotonic() - start, 0.5)
+
+        self.assertEqual(transport.usage.used, 8952)
+
+
+def suite():
+    """Test Suite"""
+
+    # Create the Unit Test Suite
+    suite = unittest.TestSuite()
+
+    # Add the Unit Test
+    suite.addTest(TestThrottle)
+
+    # Return the Test Suite
+    return suite
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
@@ -0,0 +1,176 @@
+"""
+SFDCFW.Test.TestTokenStore
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+import requests
+
+from SFDCFW.Access import Access
+from SFDCFW.TokenStore import FileTokenStore, MemoryTokenStore, SQLiteTokenStore, TokenStore, token_key
+
+
+class FakeTransport:
+    """Fake transport answering the OAuth token resource."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.login_count = 0
+
+    def post(self, url, headers=None, data=None, **kwargs):
+        with self.lock:
+            self.login_count += 1
+
+        r = requests.Response()
+        r.status_code = 200
+        r._content = json.dumps({
+            'access_token': f'token-{self.login_count}',
+            'instance_url': 'https://example.my.salesforce.com'
+        }).encode()
+        return r
+
+
+def setUpModule():
+    """Set Up Module"""
+    pass
+
+
+def tearDownModule():
+    """Tear Down Module"""
+    pass
+
+
+class TestTokenStore(unittest.TestCase):
+    """Test every Token Store."""
+
+    access = ('token', 'https://example.my.salesforce.com')
+
+
+    def setUp(self):
+        """Prepare test set up.
+
+        Create one store of each kind in a temporary directory.
+        """
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.store_list = [
+            MemoryTokenStore(),
+            FileTokenStore(os.path.join(self.directory.name, 'token.json')),
+            SQLiteTokenStore(os.path.join(self.directory.name, 'token.db'))
+        ]
+
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+
+        self.directory.cleanup()
+
+
+    def test_set_get(self):
+        """Test a token is kept until deleted.
+
+        Should result in the token for its own key only.
+        """
+
+        key = token_key('user@example.com', 'login', 'client')
+
+        for store in self.store_list:
+            with self.subTest(store=type(store).__name__):
+                store.set(key, self.access)
+
+                self.assertEqual(store.get(key), self.access)
+                self.assertIsNone(store.get(token_key('user@example.com', 'test', 'client')))
+
+                store.delete(key)
+                self.assertIsNone(store.get(key))
+
+
+    def test_expired(self):
+        """Test an expired token.
+
+        Should result in no token.
+        """
+
+        key = token_key('user@example.com', 'login')
+
+        for store in self.store_list:
+            with self.subTest(store=type(store).__name__):
+                store.set(key, self.access, ttl=0)
+
+                self.assertIsNone(store.get(key))
+
+
+    def test_abstract(self):
+        """Test a token store without storage.
+
+        Should result in a TypeError at construction.
+        """
+
+        class PartialTokenStore(TokenStore):
+            def _read(self, key):
+                return None
+
+        with self.assertRaises(TypeError):
+            TokenStore()
+
+        with self.assertRaises(TypeError):
+            PartialTokenStore()
+
+
+    def test_file_shared(self):
+        """Test the file store is shared by every instance on the path.
+
+        Should result in the token set by one read by the other.
+        """
+
+        path = os.path.join(self.directory.name, 'shared.json')
+        key = token_key('user@example.com', 'login')
+
+        FileTokenStore(path).set(key, self.access)
+
+        self.assertEqual(FileTokenStore(path).get(key), self.access)
+
+
+    def test_login_reuse(self):
+        """Test the login check the store first.
+
+        Login twice with the same user. Should result in a single login
+        request and the same token.
+        """
+
+        transport = FakeTransport()
+        store = SQLiteTokenStore(os.path.join(self.directory.name, 'login.db'))
+
+        access_list = [Access(username='user@example.com',
+                              password='password',
+                              security_token='token',
+                              client_id='client',
+                              client_secret='secret',
+                              transport=transport,
+                              token_store=store).login() for _ in range(2)]
+
+        self.assertEqual(transport.login_count, 1)
+        self.assertEqual(access_list[0], access_list[1])
+
+
+def suite():
+    """Test Suite"""
+
+    # Create the Unit Test Suite
+    suite = unittest.TestSuite()
+
+    # Add the Unit Test
+    suite.addTest(TestTokenStore)
+
+    # Return the Test Suite
+    return suite
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
@@ -0,0 +1,212 @@
+"""
+SFDCFW.Test.TestTransport
+~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import json
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from SFDCFW.Rest.Query import Query
+from SFDCFW.Rest.SObject import SObject
+from SFDCFW.Transport import Transport
+
+
+class LocalHandler(BaseHTTPRequestHandler):
+    """Local HTTP handler answering every request with an empty record."""
+
+    # Keep the connection open between request
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        # Record the client port to count the connection used
+        self.server.port_set.add(self.client_address[1])
+
+        # Reject the expired token if the server has a valid one
+        if self.server.token is not None and self.headers['Authorization'] != f'Bearer {self.server.token}':
+            body = json.dumps([{'message': 'Session expired or invalid', 'errorCode': 'INVALID_SESSION_ID'}]).encode()
+            self.send_response(401)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        body = json.dumps({'totalSize': 0, 'done': True, 'records': []}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def setUpModule():
+    """Set Up Module"""
+    pass
+
+
+def tearDownModule():
+    """Tear Down Module"""
+    pass
+
+
+class TestTransport(unittest.TestCase):
+    """Test the pooled Transport against a local HTTP server."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Prepare test set up class.
+
+        Start the local HTTP server on a random port.
+        """
+
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), LocalHandler)
+        cls.server.port_set = set()
+        cls.server.token = None
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.access = ('token', f'http://127.0.0.1:{cls.server.server_port}/services/Soap/u/54.0')
+
+
+    def setUp(self):
+        """Reset the connection record and the valid token."""
+        self.server.port_set.clear()
+        self.server.token = None
+
+
+    def test_transport_shared_connection(self):
+        """Test the SObject and Query class share one keep-alive connection.
+
+        Make several request through two REST class sharing the same
+        transport. Should result in a single connection to the server.
+        """
+
+        with Transport() as transport:
+            sobject = SObject(self.access, transport=transport)
+            query = Query(self.access, transport=transport)
+
+            for _ in range(5):
+                self.assertIsNotNone(sobject.Account.read('001000000000001'))
+                self.assertIsNotNone(query.query('SELECT Id FROM Account'))
+
+        self.assertEqual(len(self.server.port_set), 1)
+
+
+    def test_transport_no_keep_alive(self):
+        """Test the transport without keep alive.
+
+        Make several request with keep alive disabled. Should result in
+        a new connection for each request.
+        """
+
+        with Transport(keep_alive=False) as transport:
+            sobject = SObject(self.access, transport=transport)
+
+            for _ in range(3):
+                self.assertIsNotNone(sobject.Account.read())
+
+        self.assertEqual(len(self.server.port_set), 3)
+
+
+    def test_transport_refresh_single_flight(self):
+        """Test the token refresh on an expired session.
+
+        Send eight concurrent request with an expired token. Should
+        result in a single refresh and every request replayed with the
+        new token.
+        """
+
+        self.server.token = 'new'
+        refresh_list = []
+
+        def refresh():
+            # Keep the other caller waiting on the refresh
+            time.sleep(0.1)
+            refresh_list.append(1)
+            return ('new', self.access[1])
+
+        with Transport(pool_maxsize=8, token='token', refresh=refresh) as transport:
+            sobject = SObject(self.access, transport=transport)
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                result_list = list(executor.map(lambda _: sobject.Account.read('001000000000001'), range(8)))
+
+            # The later request use the new token directly
+            self.assertIsNotNone(sobject.Account.read('001000000000001'))
+
+        self.assertEqual(len(refresh_list), 1)
+        self.assertTrue(all(result is not None for result in result_list))
+
+
+    def test_transport_refresh_stream(self):
+        """Test the token refresh of a streamed request.
+
+        Should result in the request replayed with the new token, and
+        the later request sent with it directly.
+        """
+
+        self.server.token = 'new'
+        refresh_list = []
+
+        def refresh():
+            refresh_list.append(1)
+            return ('new', self.access[1])
+
+        url = f'{self.access[1]}/services/data/v54.0/jobs/query/750/results'
+        header = {'Authorization': 'Bearer token'}
+
+        with Transport(token='token', refresh=refresh) as transport:
+            for _ in range(2):
+                r = transport.get(url, headers=header, stream=True)
+                self.assertEqual(r.status_code, 200)
+                self.assertEqual(json.loads(r.raw.read())['totalSize'], 0)
+
+        self.assertEqual(len(refresh_list), 1)
+
+
+    def test_transport_refresh_failure(self):
+        """Test a failed token refresh.
+
+        Should result in the original rejected response.
+        """
+
+        self.server.token = 'new'
+
+        with Transport(token='token', refresh=lambda: None) as transport:
+            sobject = SObject(self.access, transport=transport)
+
+            self.assertIsNone(sobject.Account.read('001000000000001'))
+
+
+    @classmethod
+    def tearDownClass(cls):
+        """Prepare test teardown class.
+
+        Stop the local HTTP server.
+        """
+
+        cls.server.shutdown()
+        cls.server.server_close()
+
+
+def suite():
+    """Test Suite"""
+
+    # Create the Unit Test Suite
+    suite = unittest.TestSuite()
+
+    # Add the Unit Test
+    suite.addTest(TestTransport)
+
+    # Return the Test Suite
+    return suite
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
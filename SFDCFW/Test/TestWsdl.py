@@ -0,0 +1,315 @@
+"""
+SFDCFW.Test.TestWsdl
+~~~~~~~~~~~~~~~~~~~~
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from lxml import etree
+
+from SFDCFW.Soap import Wsdl
+from SFDCFW.Soap.Metadata import Metadata
+
+
+# A minimal Metadata API WSDL with a single operation
+METADATA_WSDL = '''<?xml version="1.0" encoding="UTF-8"?>
+<definitions xmlns="http://schemas.xmlsoap.org/wsdl/"
+             xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/"
+             xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+             xmlns:tns="http://soap.sforce.com/2006/04/metadata"
+             targetNamespace="http://soap.sforce.com/2006/04/metadata">
+  <types>
+    <xsd:schema targetNamespace="http://soap.sforce.com/2006/04/metadata" elementFormDefault="qualified">
+      <xsd:complexType name="ListMetadataQuery">
+        <xsd:sequence>
+          <xsd:element name="folder" type="xsd:string" minOccurs="0"/>
+          <xsd:element name="type" type="xsd:string"/>
+        </xsd:sequence>
+      </xsd:complexType>
+      <xsd:element name="listMetadata">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="queries" type="tns:ListMetadataQuery" minOccurs="0" maxOccurs="unbounded"/>
+            <xsd:element name="asOfVersion" type="xsd:double" minOccurs="0"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="listMetadataResponse">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="result" type="xsd:string" minOccurs="0" maxOccurs="unbounded"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+      <xsd:element name="SessionHeader">
+        <xsd:complexType>
+          <xsd:sequence>
+            <xsd:element name="sessionId" type="xsd:string"/>
+          </xsd:sequence>
+        </xsd:complexType>
+      </xsd:element>
+    </xsd:schema>
+  </types>
+  <message name="Header">
+    <part name="SessionHeader" element="tns:SessionHeader"/>
+  </message>
+  <message name="listMetadataRequest">
+    <part name="parameters" element="tns:listMetadata"/>
+  </message>
+  <message name="listMetadataResponse">
+    <part name="parameters" element="tns:listMetadataResponse"/>
+  </message>
+  <portType name="MetadataPortType">
+    <operation name="listMetadata">
+      <input message="tns:listMetadataRequest"/>
+      <output message="tns:listMetadataResponse"/>
+    </operation>
+  </portType>
+  <binding name="MetadataBinding" type="tns:MetadataPortType">
+    <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+    <operation name="listMetadata">
+      <soap:operation soapAction=""/>
+      <input>
+        <soap:header use="literal" part="SessionHeader" message="tns:Header"/>
+        <soap:body use="literal" parts="parameters"/>
+      </input>
+      <output>
+        <soap:body use="literal"/>
+      </output>
+    </operation>
+  </binding>
+  <service name="MetadataService">
+    <port binding="tns:MetadataBinding" name="Metadata">
+      <soap:address location="https://na1-api.salesforce.com/services/Soap/m/54.0"/>
+    </port>
+  </service>
+</definitions>
+'''
+
+
+def setUpModule():
+    """Set Up Module"""
+    pass
+
+
+def tearDownModule():
+    """Tear Down Module"""
+    pass
+
+
+class TestWsdl(unittest.TestCase):
+    """Test the parsed WSDL cache."""
+
+    def setUp(self):
+        """Prepare test set up.
+
+        Write the WSDL to a temporary directory and clear the in-memory
+        cache.
+        """
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.wsdl = os.path.join(self.directory.name, 'metadata.wsdl')
+        with open(self.wsdl, 'w') as f:
+            f.write(METADATA_WSDL)
+
+        # Sign the on-disk cache with a key of the test
+        self.key_file = os.path.join(self.directory.name, 'key', 'wsdl_cache.key')
+        self.patch = mock.patch.object(Wsdl, 'KEY_FILE', self.key_file)
+        self.patch.start()
+
+        Wsdl.clear()
+
+
+    def tearDown(self):
+        """Clean up the temporary directory."""
+
+        Wsdl.clear()
+        self.patch.stop()
+        self.directory.cleanup()
+
+
+    def test_memory_cache(self):
+        """Test the WSDL is parsed once per process.
+
+        Create three Metadata client. Should result in a single parse
+        and every client sharing the parsed WSDL.
+        """
+
+        with mock.patch.object(Wsdl, '_parse', wraps=Wsdl._parse) as parse:
+            metadata_list = [Metadata(('id', 'https://example.my.salesforce.com'), self.wsdl) for _ in range(3)]
+
+        self.assertEqual(parse.call_count, 1)
+        self.assertIs(metadata_list[0].service._binding.wsdl, metadata_list[2].service._binding.wsdl)
+
+
+    def test_memory_cache_modified(self):
+        """Test a modified WSDL is parsed again.
+
+        Should result in a different parsed WSDL after the file change.
+        """
+
+        document = Wsdl.document(self.wsdl)
+
+        # Move the modification time forward
+        stat = os.stat(self.wsdl)
+        os.utime(self.wsdl, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        self.assertIsNot(Wsdl.document(self.wsdl), document)
+        self.assertIsNot(Wsdl.document(self.wsdl, version='55.0'), document)
+
+
+    def test_disk_cache(self):
+        """Test the parsed WSDL is read from the on-disk cache.
+
+        Clear the in-memory cache after the first parse. Should result in
+        no second parse and a working client from the cached WSDL.
+        """
+
+        cache_dir = os.path.join(self.directory.name, 'cache')
+
+        Wsdl.document(self.wsdl, cache_dir=cache_dir)
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+        Wsdl.clear()
+
+        with mock.patch.object(Wsdl, '_parse', wraps=Wsdl._parse) as parse:
+            metadata = Metadata(('id', 'https://example.my.salesforce.com'), self.wsdl, cache_dir=cache_dir)
+
+        self.assertEqual(parse.call_count, 0)
+
+        # Build the request without sending it
+        message = metadata.service._client.create_message(metadata.service,
+                                                          'listMetadata',
+                                                          queries=[{'type': 'WorkflowRule'}],
+                                                          asOfVersion='54.0',
+                                                          _soapheaders=metadata.soap_header)
+        self.assertIn(b'<ns0:type>WorkflowRule</ns0:type>', etree.tostring(message))
+        self.assertIn(b'<ns0:sessionId>id</ns0:sessionId>', etree.tostring(message))
+
+
+    def test_disk_cache_corrupt(self):
+        """Test a corrupt on-disk cache.
+
+        Should result in the WSDL parsed again.
+        """
+
+        cache_dir = os.path.join(self.directory.name, 'cache')
+        Wsdl.document(self.wsdl, cache_dir=cache_dir)
+
+        # Corrupt the cache file
+        for name in os.listdir(cache_dir):
+            with open(os.path.join(cache_dir, name), 'wb') as f:
+                f.write(b'corrupt')
+
+        Wsdl.clear()
+
+        with mock.patch.object(Wsdl, '_parse', wraps=Wsdl._parse) as parse:
+            with self.assertLogs(Wsdl.__name__, level='WARNING'):
+                Wsdl.document(self.wsdl, cache_dir=cache_dir)
+
+        self.assertEqual(parse.call_count, 1)
+
+
+    def test_disk_cache_untrusted(self):
+        """Test an on-disk cache not signed with the key of the user.
+
+        Replace the cache file with a pickle of the same content but no
+        valid signature, and sign with another key. Should result in
+        neither file loaded, and the WSDL parsed again.
+        """
+
+        cache_dir = os.path.join(self.directory.name, 'cache')
+        Wsdl.document(self.wsdl, cache_dir=cache_dir)
+
+        self.assertEqual(os.stat(cache_dir).st_mode & 0o777, 0o700)
+        self.assertEqual(os.stat(self.key_file).st_mode & 0o777, 0o600)
+
+        name = os.listdir(cache_dir)[0]
+        with open(os.path.join(cache_dir, name), 'rb') as f:
+            data = f.read()
+
+        for forged in (b'\0' * 32 + data[32:], pickle.dumps(None)):
+            with open(os.path.join(cache_dir, name), 'wb') as f:
+                f.write(forged)
+
+            Wsdl.clear()
+
+            with mock.patch.object(Wsdl, '_parse', wraps=Wsdl._parse) as parse:
+                with self.assertLogs(Wsdl.__name__, level='WARNING'):
+                    Wsdl.document(self.wsdl, cache_dir=cache_dir)
+
+            self.assertEqual(parse.call_count, 1)
+
+        # A cache signed with another key
+        Wsdl.clear()
+        with mock.patch.object(Wsdl, 'KEY_FILE', os.path.join(self.directory.name, 'other.key')):
+            with mock.patch.object(Wsdl, '_parse', wraps=Wsdl._parse) as parse:
+                with self.assertLogs(Wsdl.__name__, level='WARNING'):
+                    Wsdl.document(self.wsdl, cache_dir=cache_dir)
+
+        self.assertEqual(parse.call_count, 1)
+
+
+    def test_disk_cache_key_not_private(self):
+        """Test a key file other user can read.
+
+        Should result in the on-disk cache disabled, with the WSDL still
+        parsed and cached in memory.
+        """
+
+        os.makedirs(os.path.dirname(self.key_file))
+        with open(self.key_file, 'wb') as f:
+            f.write(os.urandom(32))
+        os.chmod(self.key_file, 0o644)
+
+        cache_dir = os.path.join(self.directory.name, 'cache')
+
+        with self.assertLogs(Wsdl.__name__, level='WARNING'):
+            self.assertIsNotNone(Wsdl.document(self.wsdl, cache_dir=cache_dir))
+
+        self.assertFalse(os.path.exists(cache_dir))
+
+
+    def test_disk_cache_recursion_limit(self):
+        """Test the on-disk cache written from many thread at once.
+
+        Should result in the recursion limit of the process restored.
+        """
+
+        recursion_limit = sys.getrecursionlimit()
+        document = Wsdl.document(self.wsdl)
+        cache_dir = os.path.join(self.directory.name, 'cache')
+
+        t_list = [threading.Thread(target=Wsdl._write, args=(document, os.path.join(cache_dir, f'{i}.pickle')))
+                  for i in range(8)]
+        for t in t_list:
+            t.start()
+        for t in t_list:
+            t.join()
+
+        self.assertEqual(sys.getrecursionlimit(), recursion_limit)
+        self.assertEqual(len(os.listdir(cache_dir)), 8)
+
+
+def suite():
+    """Test Suite"""
+
+    # Create the Unit Test Suite
+    suite = unittest.TestSuite()
+
+    # Add the Unit Test
+    suite.addTest(TestWsdl)
+
+    # Return the Test Suite
+    return suite
+
+
+if __name__ == '__main__':
+    runner = unittest.TextTestRunner()
+    runner.run(suite())
@@ -0,0 +1,166 @@
+"""
+SFDCFW.Throttle
+~~~~~~~~~~~~~~~
+"""
+
+import re
+import threading
+import time
+
+
+# The daily API usage in the `Sforce-Limit-Info` header, for example
+# `api-usage=18/15000` or `api-usage=18/15000, per-app-api-usage=17/250(appName=App)`
+API_USAGE_PATTERN = re.compile(r'(?<![\w-])api-usage=(\d+)/(\d+)')
+
+# The usage ratio to slow down and to pause at, for each priority
+POLICY = {
+    'low': (0.70, 0.85),
+    'normal': (0.85, 0.95),
+    'high': (None, None)
+}
+
+
+class ApiUsage:
+    """API Usage class.
+
+    A live gauge of the organization daily API usage, updated from the
+    `Sforce-Limit-Info` header of every response.
+    """
+
+    def __init__(self):
+        """Constructor"""
+
+        self.used = None
+        self.limit = None
+        self.updated = None
+        self.condition = threading.Condition()
+
+
+    @property
+    def ratio(self):
+        """The fraction of the daily API allocation used, None if unknown"""
+
+        if not self.limit:
+            return None
+
+        return self.used / self.limit
+
+
+    def update(self, header):
+        """Update the Usage
+
+        Args:
+            header (str): The `Sforce-Limit-Info` header value
+
+        Returns:
+            True if the header had the API usage
+        """
+
+        if not header:
+            return False
+
+        match = API_USAGE_PATTERN.search(header)
+        if match is None:
+            return False
+
+        with self.condition:
+            self.used = int(match.group(1))
+            self.limit = int(match.group(2))
+            self.updated = time.monotonic()
+
+            # Wake the paused caller to check the new usage
+            self.condition.notify_all()
+
+        return True
+
+
+class Throttle:
+    """Throttle class.
+
+    Slow down, then pause, the request of a priority as the daily API
+    usage approach the threshold of the policy. A paused request wait
+    for the usage to drop, and let a single request through when the
+    usage was not updated for `probe` seconds, to read it again.
+    """
+
+    def __init__(self, policy=None, max_delay=5, probe=60):
+        """Constructor
+
+        Args:
+            policy (dict): The (slow, pause) usage ratio keyed by
+                priority, None to never slow or pause that threshold,
+                merged over the default policy
+            max_delay (float): The delay in second just before the pause
+                threshold, the delay grow linearly from the slow threshold
+            probe (float): The number of second a paused request wait for
+                a new usage before going through
+        """
+
+        self.policy = dict(POLICY, **(policy or {}))
+        self.max_delay = max_delay
+        self.probe = probe
+
+
+    def delay(self, usage, priority='normal'):
+        """Get the Delay
+
+        Args:
+            usage (ApiUsage): The API usage gauge
+            priority (str): The priority of the request
+
+        Returns:
+            The number of second to wait before the request, None if the
+            request must pause
+        """
+
+        slow, pause = self.policy[priority]
+        ratio = usage.ratio
+
+        # The usage is unknown
+        if ratio is None:
+            return 0
+
+        if pause is not None and ratio >= pause:
+            return None
+
+        if slow is not None and ratio >= slow:
+            # Grow linearly up to the maximum delay at the pause threshold
+            return self.max_delay * (ratio - slow) / ((pause or 1) - slow)
+
+        return 0
+
+
+    def wait(self, usage, priority='normal'):
+        """Wait Before the Request
+
+        Args:
+            usage (ApiUsage): The API usage gauge
+            priority (str): The priority of the request
+
+        Returns:
+            The number of second waited
+        """
+
+        start = time.monotonic()
+
+        with usage.condition:
+            while True:
+                delay = self.delay(usage, priority)
+
+                if delay is not None:
+                    break
+
+                # Probe the usage again once it is stale
+                stale = usage.updated + self.probe - time.monotonic()
+                if stale <= 0:
+                    # Let the other paused caller wait for this probe
+                    usage.updated = time.monotonic()
+                    delay = 0
+                    break
+
+                usage.condition.wait(stale)
+
+        if delay:
+            time.sleep(delay)
+
+        return time.monotonic() - start
@@ -0,0 +1,323 @@
+"""
+SFDCFW.TokenStore
+~~~~~~~~~~~~~~~~~
+"""
+
+import abc
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+try:
+    # POSIX
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+
+# The lifetime in second of a token without a known expiry, the
+# Salesforce default session timeout is two hours
+TOKEN_TTL = 7200
+
+# Consider the token expired this many second early
+EXPIRY_MARGIN = 300
+
+
+def token_key(username, domain, client_id=None, metadata=False):
+    """Create Token Key
+
+    Args:
+        username (str): The Salesforce user Username
+        domain (str): The common Salesforce domain for connection (login or test)
+        client_id (str): The Salesforce Connected App Consumer Key
+        metadata (bool): Whether or not this is for metadata
+
+    Returns:
+        A string key for the token of the user
+    """
+
+    return json.dumps([username, domain, client_id, bool(metadata)])
+
+
+class TokenStore(abc.ABC):
+    """Token Store base class.
+
+    Hold the session ID / access token, the server URL / instance URL
+    and the expiry of a login, so it can be reused until it expire. A
+    subclass store the token with `_read` and `_write`.
+    """
+
+    def get(self, key):
+        """Get Token
+
+        Args:
+            key (str): The token key
+
+        Returns:
+            A tuple containing the session ID / access token and server
+            URL / instance URL, None if not found or expired
+        """
+
+        token = self._read(key)
+
+        # Not found or expired
+        if token is None or token['expiry'] <= time.time():
+            return None
+
+        return (token['access_token'], token['instance_url'])
+
+
+    def set(self, key, access, ttl=TOKEN_TTL):
+        """Set Token
+
+        Args:
+            key (str): The token key
+            access (tuple): The session ID / access token and server URL /
+                instance URL tuple
+            ttl (int): The number of second the token is valid
+        """
+
+        access_token, instance_url = access
+
+        self._write(key, {
+            'access_token': access_token,
+            'instance_url': instance_url,
+            'expiry': time.time() + ttl - EXPIRY_MARGIN
+        })
+
+
+    def delete(self, key):
+        """Delete Token
+
+        Args:
+            key (str): The token key
+        """
+
+        self._write(key, None)
+
+
+    @abc.abstractmethod
+    def _read(self, key):
+        """Read Token
+
+        Args:
+            key (str): The token key
+
+        Returns:
+            A dictionary for the stored token, None if not found
+        """
+
+
+    @abc.abstractmethod
+    def _write(self, key, token):
+        """Write Token
+
+        Args:
+            key (str): The token key
+            token (dict): The token to store, None to delete it
+        """
+
+
+class MemoryTokenStore(TokenStore):
+    """Token Store in the process memory."""
+
+    def __init__(self):
+        """Constructor"""
+
+        self.token = {}
+        self.lock = threading.Lock()
+
+
+    def _read(self, key):
+        with self.lock:
+            return self.token.get(key)
+
+
+    def _write(self, key, token):
+        with self.lock:
+            if token is None:
+                self.token.pop(key, None)
+            else:
+                self.token[key] = token
+
+
+class FileTokenStore(TokenStore):
+    """Token Store in a JSON (JavaScript Object Notation) file.
+
+    The file is locked while read or written, so it can be shared by
+    every process on the host.
+    """
+
+    def __init__(self, path):
+        """Constructor
+
+        Args:
+            path (str): The path to the token file
+        """
+
+        self.path = path
+        self.lock = threading.Lock()
+
+
+    def _read(self, key):
+        with self._lock(exclusive=False):
+            return self._load().get(key)
+
+
+    def _write(self, key, token):
+        with self._lock(exclusive=True):
+            token_dict = self._load()
+
+            if token is None:
+                token_dict.pop(key, None)
+            else:
+                token_dict[key] = token
+
+            # Write to a temporary file then rename, reader never see a partial file
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)))
+            with os.fdopen(fd, 'w') as f:
+                json.dump(token_dict, f)
+            os.replace(temp_path, self.path)
+
+
+    def _load(self):
+        """Load every token from the file
+
+        Returns:
+            A dictionary of token keyed by token key
+        """
+
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+
+    def _lock(self, exclusive):
+        """Lock the token file
+
+        Args:
+            exclusive (bool): Whether the lock is for writing
+
+        Returns:
+            A context manager holding the lock
+        """
+
+        return _FileLock(f'{self.path}.lock', exclusive, self.lock)
+
+
+class SQLiteTokenStore(TokenStore):
+    """Token Store in a SQLite database."""
+
+    def __init__(self, path):
+        """Constructor
+
+        Args:
+            path (str): The path to the SQLite database file
+        """
+
+        self.path = path
+
+        # Create the table if it does not exist
+        with self._connect() as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS token ('
+                               'key TEXT PRIMARY KEY, '
+                               'access_token TEXT NOT NULL, '
+                               'instance_url TEXT NOT NULL, '
+                               'expiry REAL NOT NULL)')
+
+
+    def _read(self, key):
+        with self._connect() as connection:
+            row = connection.execute('SELECT access_token, instance_url, expiry FROM token WHERE key = ?',
+                                     (key,)).fetchone()
+
+        if row is None:
+            return None
+
+        return {'access_token': row[0], 'instance_url': row[1], 'expiry': row[2]}
+
+
+    def _write(self, key, token):
+        with self._connect() as connection:
+            if token is None:
+                connection.execute('DELETE FROM token WHERE key = ?', (key,))
+            else:
+                connection.execute('INSERT OR REPLACE INTO token VALUES (?, ?, ?, ?)',
+                                   (key, token['access_token'], token['instance_url'], token['expiry']))
+
+
+    def _connect(self):
+        """Connect to the database
+
+        Returns:
+            A context manager for a `sqlite3.Connection`, committing the
+            transaction and closing the connection on exit
+        """
+
+        return _Connection(self.path)
+
+
+class _Connection:
+    """SQLite connection committed and closed on exit."""
+
+    def __init__(self, path):
+        # Wait for the lock of another process instead of failing
+        self.connection = sqlite3.connect(path, timeout=30)
+
+
+    def __enter__(self):
+        return self.connection
+
+
+    def __exit__(self, exc_type, *args):
+        try:
+            if exc_type is None:
+                self.connection.commit()
+            else:
+                self.connection.rollback()
+        finally:
+            self.connection.close()
+
+
+class _FileLock:
+    """Advisory lock on a file, across thread and process."""
+
+    def __init__(self, path, exclusive, lock):
+        self.path = path
+        self.exclusive = exclusive
+        self.lock = lock
+        self.f = None
+
+
+    def __enter__(self):
+        self.lock.acquire()
+        try:
+            self.f = open(self.path, 'a+')
+            if fcntl is not None:
+                fcntl.flock(self.f.fileno(), fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH)
+            else:
+                self.f.seek(0)
+                msvcrt.locking(self.f.fileno(), msvcrt.LK_LOCK, 1)
+        except Exception:
+            self.lock.release()
+            raise
+        return self
+
+
+    def __exit__(self, *args):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.f.fileno(), fcntl.LOCK_UN)
+            else:
+                self.f.seek(0)
+                msvcrt.locking(self.f.fileno(), msvcrt.LK_UNLCK, 1)
+            self.f.close()
+        finally:
+            self.lock.release()
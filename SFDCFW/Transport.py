@@ -0,0 +1,385 @@
+"""
+SFDCFW.Transport
+~~~~~~~~~~~~~~~~
+"""
+
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from SFDCFW.Instrument import operation
+from SFDCFW.Throttle import ApiUsage
+
+
+class Transport:
+    """Transport class.
+
+    A pooled, keep-alive HTTP (HyperText Transfer Protocol) session
+    shared by every REST (REpresentational State Transfer) class of an
+    organization, so repeated calls reuse the same TCP (Transmission
+    Control Protocol) and TLS (Transport Layer Security) connection.
+
+    When a `refresh` function is set, a REST request rejected with 401
+    for an expired session is replayed once with a new token. Concurrent caller wait on
+    a single refresh instead of each login again. The Metadata API
+    refresh through the same lock on an INVALID_SESSION_ID fault.
+
+    The `Sforce-Limit-Info` header of every response update the `usage`
+    gauge, and a `throttle` slow down or pause the request by priority
+    as the daily API usage approach its limit.
+
+    A transient error is retried with the `retry` policy, a POST or
+    PATCH only when it could not have been applied, and each call is
+    reported to the `instrument`. With a `cassette` the request are
+    recorded to, or replayed from, a file instead.
+    """
+
+    def __init__(self,
+                 pool_connections=10,
+                 pool_maxsize=10,
+                 pool_block=False,
+                 max_retries=0,
+                 keep_alive=True,
+                 timeout=None,
+                 session=None,
+                 token=None,
+                 refresh=None,
+                 throttle=None,
+                 priority='normal',
+                 retry=None,
+                 instrument=None,
+                 cassette=None):
+        """Constructor
+
+        Args:
+            pool_connections (int): The number of host connection pool to cache
+            pool_maxsize (int): The maximum number of connection to keep per host
+            pool_block (bool): Whether to block when there is no free connection
+                instead of opening a connection that is discarded after use
+            max_retries (int): The number of connection level retry
+            keep_alive (bool): Whether to keep the connection alive between request
+            timeout (float or tuple): The default (connect, read) timeout in seconds
+            session (requests.Session): An existing session to use instead
+                of creating a new one
+            token (str): The current session ID / access token
+            refresh (callable): The function to login again, returning the
+                session ID / access token and server URL / instance URL
+                tuple, or None if the login failed
+            throttle (Throttle): The throttle policy applied before each request
+            priority (str): The default priority of the request (low,
+                normal or high) for the throttle
+            retry (Retry): The retry policy for transient error, no retry
+                if not provided
+            instrument (Instrument): The instrument receiving an event for
+                each call
+            cassette (Cassette): The cassette to record the request to,
+                or to replay the response from
+        """
+
+        self.timeout = timeout
+        self.token = token
+        self.refresh = refresh
+        self.refresh_lock = threading.Lock()
+        self.throttle = throttle
+        self.priority = priority
+        self.retry = retry
+        self.instrument = instrument
+
+        # The live gauge of the daily API usage
+        self.usage = ApiUsage()
+
+        # Create the session if one is not provided
+        self.session = session if session is not None else requests.Session()
+
+        # Create the adapter with the connection pool setting
+        self.adapter = HTTPAdapter(pool_connections=pool_connections,
+                                   pool_maxsize=pool_maxsize,
+                                   max_retries=max_retries,
+                                   pool_block=pool_block)
+        # Record or replay through the cassette
+        if cassette is not None:
+            self.adapter = cassette.adapter(self.adapter)
+
+        # Mount the adapter for both scheme
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+
+        # Ask the server to close the connection if keep alive is not wanted
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+
+    def request(self, method, url, **kwargs):
+        """Send Request
+
+        Args:
+            method (str): The HTTP method
+            url (str): The request URL
+            **kwargs: Any keyword argument accepted by `requests.Session.request`,
+                `priority` to override the default priority, and `operation`
+                and `label` to override the one reported to the instrument
+
+        Returns:
+            A `requests.Response` object
+        """
+
+        call_operation = kwargs.pop('operation', None)
+        call_label = kwargs.pop('label', None)
+
+        # Send without measuring
+        if self.instrument is None:
+            return self._request(method, url, **kwargs)
+
+        # Get the operation and label from the URL if not provided
+        if call_operation is None:
+            call_operation, url_label = operation(method, url)
+            call_label = call_label if call_label is not None else url_label
+
+        bytes_sent = _size(kwargs.get('data'))
+        start = time.perf_counter()
+
+        try:
+            r = self._request(method, url, **kwargs)
+        except Exception as e:
+            self.instrument.emit(call_operation,
+                                 label=call_label,
+                                 method=method,
+                                 bytes_sent=bytes_sent,
+                                 latency=time.perf_counter() - start,
+                                 error=type(e).__name__)
+            raise
+
+        # Do not read a streamed body to measure it
+        if kwargs.get('stream'):
+            bytes_received = int(r.headers['Content-Length']) if 'Content-Length' in r.headers else None
+        else:
+            bytes_received = len(r.content)
+
+        self.instrument.emit(call_operation,
+                             label=call_label,
+                             method=method,
+                             status=r.status_code,
+                             bytes_sent=bytes_sent,
+                             bytes_received=bytes_received,
+                             retry_count=getattr(r, 'retry_count', 0),
+                             latency=time.perf_counter() - start)
+
+        return r
+
+
+    def _request(self, method, url, **kwargs):
+        """Send the request, refreshing the token if the session expired
+
+        Args:
+            method (str): The HTTP method
+            url (str): The request URL
+            **kwargs: Any keyword argument accepted by `requests.Session.request`,
+                and `priority` to override the default priority
+
+        Returns:
+            A `requests.Response` object
+        """
+
+        # Use the default timeout if one is not provided
+        kwargs.setdefault('timeout', self.timeout)
+
+        # Slow down or pause as the API usage approach its limit
+        priority = kwargs.pop('priority', self.priority)
+        if self.throttle is not None:
+            self.throttle.wait(self.usage, priority)
+
+        # Use the current token, the header may be from before a refresh
+        headers = kwargs.get('headers')
+        authorized = headers is not None and 'Authorization' in headers
+        if authorized and self.token is not None:
+            kwargs['headers'] = dict(headers, Authorization=f'Bearer {self.token}')
+
+        # Remember where a file body start, to replay it
+        data = kwargs.get('data')
+        position = data.tell() if hasattr(data, 'seek') else None
+
+        # Send the request through the pooled session
+        r = self._send(method, url, **kwargs)
+
+        # Refresh the token and replay the request if the session expired
+        if authorized and self.refresh is not None and _session_expired(r):
+            token = kwargs['headers']['Authorization'].split(' ', 1)[-1]
+
+            if self._refresh(token):
+                r.close()
+
+                if position is not None:
+                    data.seek(position)
+
+                kwargs['headers'] = dict(kwargs['headers'], Authorization=f'Bearer {self.token}')
+                r = self._send(method, url, **kwargs)
+
+        return r
+
+
+    def _send(self, method, url, **kwargs):
+        """Send the request, retrying transient error, and read the API
+        usage of the response
+
+        Args:
+            method (str): The HTTP method
+            url (str): The request URL
+            **kwargs: Any keyword argument accepted by `requests.Session.request`
+
+        Returns:
+            A `requests.Response` object, with the number of retry in
+            `retry_count`
+        """
+
+        # Remember where a file body start, to replay it
+        data = kwargs.get('data')
+        position = data.tell() if hasattr(data, 'seek') else None
+
+        delay = self.retry.delays() if self.retry is not None else iter(())
+        retry_count = 0
+
+        while True:
+            try:
+                r = self.session.request(method, url, **kwargs)
+            except Exception as e:
+                # A permanent error, or out of attempt
+                wait = next(delay, None) if self.retry is not None and self.retry.retry_exception(e, method) else None
+                if wait is None:
+                    raise
+            else:
+                # Update the live API usage gauge
+                self.usage.update(r.headers.get('Sforce-Limit-Info'))
+
+                # A success or permanent error, or out of attempt
+                wait = next(delay, None) if self.retry is not None and self.retry.retry_response(r, method) else None
+                if wait is None:
+                    r.retry_count = retry_count
+                    return r
+
+                # Wait as long as the server ask
+                retry_after = r.headers.get('Retry-After', '')
+                if retry_after.isdigit():
+                    wait = max(wait, int(retry_after))
+
+                r.close()
+
+            retry_count += 1
+            time.sleep(wait)
+
+            if position is not None:
+                data.seek(position)
+
+
+    def _refresh(self, token):
+        """Refresh the token once for every caller of an expired token
+
+        Args:
+            token (str): The expired session ID / access token
+
+        Returns:
+            True if there is a new token to replay the request with
+        """
+
+        with self.refresh_lock:
+            # Another caller already refreshed while this one waited
+            if self.token is not None and self.token != token:
+                return True
+
+            access = self.refresh()
+
+            # The login failed, give the caller the original response
+            if access is None:
+                return False
+
+            self.token = access[0]
+
+            return True
+
+
+    def get(self, url, **kwargs):
+        """Send GET Request"""
+        return self.request('GET', url, **kwargs)
+
+
+    def post(self, url, **kwargs):
+        """Send POST Request"""
+        return self.request('POST', url, **kwargs)
+
+
+    def put(self, url, **kwargs):
+        """Send PUT Request"""
+        return self.request('PUT', url, **kwargs)
+
+
+    def patch(self, url, **kwargs):
+        """Send PATCH Request"""
+        return self.request('PATCH', url, **kwargs)
+
+
+    def delete(self, url, **kwargs):
+        """Send DELETE Request"""
+        return self.request('DELETE', url, **kwargs)
+
+
+    def close(self):
+        """Close the session and all pooled connection."""
+        self.session.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _session_expired(r):
+    """Check if the request was rejected for an expired session
+
+    Only the REST request carry the token in the `Authorization` header,
+    the SOAP request carry it in the envelope and are refreshed by the
+    Metadata API on its fault.
+
+    Args:
+        r (requests.Response): The response of the request
+
+    Returns:
+        True if the session ID / access token is no longer valid
+    """
+
+    # The REST API answer 401 Unauthorized
+    return r.status_code == 401
+
+
+def _size(data):
+    """Get the size of a request body
+
+    Args:
+        data (str or bytes or file): The request body
+
+    Returns:
+        The number of byte of the body, None if unknown
+    """
+
+    if data is None:
+        return 0
+
+    if isinstance(data, str):
+        return len(data.encode())
+
+    if isinstance(data, bytes):
+        return len(data)
+
+    # The rest of a file from the current position
+    if hasattr(data, 'seek') and hasattr(data, 'tell'):
+        position = data.tell()
+        data.seek(0, os.SEEK_END)
+        size = data.tell() - position
+        data.seek(position)
+        return size
+
+    return None
@@ -12,10 +12,14 @@ setup(
 
     # Dependency
     install_requires = [
-        'pandas',
         'requests',
         'zeep',
     ],
+    extras_require = {
+        'async': [
+            'httpx',
+        ],
+    },
 
     # Metadata
     author = 'Yan Kuang',